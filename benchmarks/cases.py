@@ -0,0 +1,347 @@
+"""The cardkit benchmarks.
+
+Each benchmark is a function that does any setup it needs and returns
+the operation to be timed, a callable taking no arguments. Register
+new benchmarks with the @benchmark decorator.
+"""
+import random
+
+import pygame
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import card_game
+from cardkit import card_sprite
+from cardkit import combinations
+from cardkit import deck
+from cardkit import flash
+from cardkit import hand_eval
+from cardkit import pile
+from cardkit import rules
+from cardkit import simple_game
+from cardkit import sprite
+
+
+# Maps benchmark names to functions returning the operation to time.
+BENCHMARKS = {}
+
+# The surface that drawing benchmarks draw on. Created by set_up().
+SCREEN = None
+
+
+def benchmark(name):
+    """Registers a benchmark under the given name."""
+    def register(make_operation):
+        BENCHMARKS[name] = make_operation
+        return make_operation
+    return register
+
+
+def set_up():
+    """Initializes pygame and the card spritesheet for the drawing benchmarks."""
+    global SCREEN
+    pygame.init()
+    SCREEN = pygame.display.set_mode(simple_game.DEFAULT_WINDOW_SIZE)
+    card_sprite.load_spritesheet()
+
+
+def tear_down():
+    pygame.quit()
+
+
+@benchmark('card.construct')
+def card_construct():
+    return lambda: card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP)
+
+
+@benchmark('card.construct_unnormalized')
+def card_construct_unnormalized():
+    return lambda: card.Card('Queen', 'HEARTS', 'UP')
+
+
+@benchmark('card.with_face')
+def card_with_face():
+    c = card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP)
+    return lambda: c.with_face(ck.FACE_DOWN)
+
+
+@benchmark('card.hash')
+def card_hash():
+    c = card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP)
+    return lambda: hash(c)
+
+
+@benchmark('card.dict_lookup')
+def card_dict_lookup():
+    cards = dict((card.Card(rank, suit), None) for rank, suit in ck.DECK_OF_52)
+    c = card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP)
+    return lambda: c in cards
+
+
+@benchmark('deck.init')
+def deck_init():
+    return deck.Deck
+
+
+@benchmark('deck.reset_after_deal_13')
+def deck_reset_after_deal():
+    d = deck.Deck()
+    def operation():
+        d.deal_several(13)
+        d.reset()
+    return operation
+
+
+@benchmark('deck.reset_after_shuffle')
+def deck_reset_after_shuffle():
+    d = deck.Deck(rng=random.Random(1))
+    def operation():
+        d.shuffle()
+        d.reset()
+    return operation
+
+
+@benchmark('deck.shuffle')
+def deck_shuffle():
+    d = deck.Deck(rng=random.Random(1))
+    return d.shuffle
+
+
+@benchmark('deck.deal')
+def deck_deal():
+    d = deck.Deck()
+    def operation():
+        d.add(d.deal())
+    return operation
+
+
+@benchmark('deck.deal_several_13')
+def deck_deal_several():
+    d = deck.Deck()
+    def operation():
+        d.deal_several(13)
+        d.reset()
+    return operation
+
+
+@benchmark('deck.deal_several_13_face_up')
+def deck_deal_several_face_up():
+    d = deck.Deck()
+    def operation():
+        d.deal_several(13, ck.FACE_UP)
+        d.reset()
+    return operation
+
+
+@benchmark('deck.shuffle_deal_5_reset')
+def deck_shuffle_deal_reset():
+    d = deck.Deck(rng=random.Random(1))
+    def operation():
+        d.shuffle()
+        d.deal_several(5)
+        d.reset()
+    return operation
+
+
+@benchmark('hand_eval.evaluate_7')
+def hand_eval_evaluate():
+    cards = deck.Deck(rng=random.Random(1))
+    cards.shuffle()
+    hand = cards.deal_several(7)
+    hand_eval.evaluate(hand)
+    return lambda: hand_eval.evaluate(hand)
+
+
+def _showdown(dealt, known_cards):
+    """Who wins once the turn and river are dealt: hero holds the first
+    two known cards, villain the next two, and the flop is the rest."""
+    board = list(known_cards[4:]) + dealt
+    hero = hand_eval.evaluate(list(known_cards[:2]) + board)
+    villain = hand_eval.evaluate(list(known_cards[2:4]) + board)
+    return (hero > villain) - (hero < villain)
+
+
+@benchmark('combinations.count_outcomes_flop')
+def combinations_count_outcomes():
+    known = [card.card_for_id(card_id) for card_id in (0, 48, 45, 46, 8, 29, 34)]
+    combinations.count_outcomes(_showdown, 2, known_cards=known, processes=1)
+    return lambda: combinations.count_outcomes(_showdown, 2, known_cards=known, processes=1)
+
+
+@benchmark('pile.remove_and_add_52')
+def pile_remove_and_add():
+    p = pile.Pile(deck.DEFAULT_CARD_SET)
+    middle = deck.DEFAULT_CARD_SET[20]
+    def operation():
+        p.remove(middle)
+        p.add(middle)
+    return operation
+
+
+@benchmark('rules.play_game')
+def rules_play_game():
+    game = rules.DrawAndDiscard(rng=random.Random(1))
+    def operation():
+        game.apply(rules.RESET)
+        while not game.is_finished():
+            game.apply(rules.DRAW)
+    return operation
+
+
+@benchmark('card_sprite.sprite_for_hit')
+def sprite_for_hit():
+    card_sprite.load_spritesheet()
+    c = card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP)
+    card_sprite.sprite_for(c)
+    return lambda: card_sprite.sprite_for(c)
+
+
+@benchmark('card_sprite.sprite_for_miss')
+def sprite_for_miss():
+    card_sprite.load_spritesheet()
+    c = card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP)
+    def operation():
+        card_sprite.CARD_SPRITE_CACHE.clear()
+        card_sprite.sprite_for(c)
+    return operation
+
+
+@benchmark('card_sprite.sprite_for_presliced')
+def sprite_for_presliced():
+    card_sprite.load_spritesheet(presliced=True)
+    c = card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP)
+    return lambda: card_sprite.sprite_for(c)
+
+
+@benchmark('sprite.draw')
+def sprite_draw():
+    card_sprite.load_spritesheet()
+    s = card_sprite.sprite_for(card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP))
+    return lambda: s.draw(SCREEN, (10, 10))
+
+
+@benchmark('sprite.draw_presliced')
+def sprite_draw_presliced():
+    card_sprite.load_spritesheet(presliced=True)
+    s = card_sprite.sprite_for(card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP))
+    return lambda: s.draw(SCREEN, (10, 10))
+
+
+def _fanned_hand():
+    """Returns 13 cards and where to draw them, fanned out across the screen."""
+    cards = [card.Card(rank, ck.SPADES, ck.FACE_UP) for rank in ck.RANKS]
+    return [(c, (20 + 20 * i, 300)) for i, c in enumerate(cards)]
+
+
+@benchmark('sprite.draw_hand_13')
+def sprite_draw_hand():
+    card_sprite.load_spritesheet(presliced=True)
+    hand = _fanned_hand()
+    def operation():
+        for c, location in hand:
+            c.draw(SCREEN, location)
+    return operation
+
+
+@benchmark('sprite.draw_hand_13_batched')
+def sprite_draw_hand_batched():
+    card_sprite.load_spritesheet(presliced=True)
+    hand = _fanned_hand()
+    batch = sprite.SpriteBatch(SCREEN)
+    def operation():
+        for c, location in hand:
+            c.draw(batch, location)
+        batch.flush()
+    return operation
+
+
+def _small_sprites():
+    """Returns 500 small sprites and where to draw them: the kind of
+    scene (chips, pips, particles) where batching pays off."""
+    source = pygame.Surface((8, 8)).convert()
+    s = sprite.Sprite(source, (0, 0), (8, 8))
+    return [(s, (i * 13 % 780, i * 7 % 580)) for i in range(500)]
+
+
+@benchmark('sprite.draw_small_500')
+def sprite_draw_small():
+    sprites = _small_sprites()
+    def operation():
+        for s, location in sprites:
+            s.draw(SCREEN, location)
+    return operation
+
+
+@benchmark('sprite.draw_small_500_batched')
+def sprite_draw_small_batched():
+    sprites = _small_sprites()
+    batch = sprite.SpriteBatch(SCREEN)
+    def operation():
+        for s, location in sprites:
+            s.draw(batch, location)
+        batch.flush()
+    return operation
+
+
+@benchmark('flash.draw_fading')
+def flash_draw_fading():
+    message = flash.FlashMessage(
+        message="Draw some cards!\nPress 'n' to reset.", duration=0, fade_duration=2000)
+    message.show()
+    def operation():
+        # Pin the message halfway through its fade.
+        now = pygame.time.get_ticks()
+        message.show_start_time = now - 1000
+        message.show_fade_time = now - 1000
+        message.show_end_time = now + 1000
+        message.should_show = True
+        message.draw(SCREEN, (100, 50))
+    return operation
+
+
+@benchmark('card_game.frame')
+def card_game_frame():
+    game = card_game.CardGame()
+    game.screen = SCREEN
+    game.ready_to_run()
+    game.draw_and_discard()
+    def operation():
+        game.draw()
+        game.present()
+    return operation
+
+
+@benchmark('card_game.frame_pair_dirty_rects')
+def card_game_frame_pair_dirty_rects():
+    game = card_game.CardGame()
+    game.screen = SCREEN
+    game.enable_dirty_rects()
+    game.ready_to_run()
+    game.flash.should_show = False
+    def operation():
+        # Draw a card every other frame, like a busy table.
+        if game.deck.is_empty():
+            game.reset()
+        game.draw_and_discard()
+        game.draw()
+        game.present()
+        game.draw()
+        game.present()
+    return operation
+
+
+@benchmark('card_game.frame_pair_full_redraw')
+def card_game_frame_pair_full_redraw():
+    game = card_game.CardGame()
+    game.screen = SCREEN
+    game.ready_to_run()
+    game.flash.should_show = False
+    def operation():
+        if game.deck.is_empty():
+            game.reset()
+        game.draw_and_discard()
+        game.draw()
+        game.present()
+        game.draw()
+        game.present()
+    return operation
@@ -0,0 +1,179 @@
+"""Runs the cardkit benchmarks.
+
+Usage:
+
+    python -m benchmarks.run [--output results.json] [--compare old.json]
+                             [--budgets budgets.json] [--filter TEXT]
+
+Benchmarks run headless (using SDL's dummy video driver), so they work
+on machines without a display. Each benchmark is timed in batches big
+enough to get a stable reading, several times over; we report the
+median and minimum time per operation.
+
+Save the results of one commit with --output, then compare another
+commit against them with --compare to spot regressions. Pass
+--budgets with a JSON file mapping benchmark names to the maximum
+allowed median time (in seconds) to enforce performance budgets.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+# This must happen before pygame is imported anywhere.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from benchmarks import cases
+
+
+# Each timing batch should take at least this long, in seconds.
+MIN_BATCH_TIME = 0.05
+
+
+def time_benchmark(operation, repeat):
+    """Times a benchmark operation.
+
+    Arguments:
+      operation (callable): The operation to time; called with no
+        arguments.
+      repeat (int): How many batches to time.
+    Returns (dict): the median and minimum time per call, in seconds,
+      along with the number of calls per batch and number of batches.
+    """
+    timer = timeit.default_timer
+    number = 1
+    while True:
+        start = timer()
+        for i in range(number):
+            operation()
+        elapsed = timer() - start
+        if elapsed >= MIN_BATCH_TIME:
+            break
+        number *= 10 if elapsed < MIN_BATCH_TIME / 10 else 2
+
+    times = []
+    for i in range(repeat):
+        start = timer()
+        for j in range(number):
+            operation()
+        times.append((timer() - start) / number)
+    times.sort()
+    return {
+        'median': times[len(times) // 2],
+        'min': times[0],
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run_benchmarks(name_filter=None, repeat=5, stream=sys.stdout):
+    """Runs the benchmarks, printing results as it goes.
+
+    Returns (dict): the results, keyed by benchmark name.
+    """
+    results = {}
+    cases.set_up()
+    try:
+        for name, make_operation in sorted(cases.BENCHMARKS.items()):
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = time_benchmark(make_operation(), repeat)
+            stream.write('%-40s %12s\n' % (name, format_time(results[name]['median'])))
+            stream.flush()
+    finally:
+        cases.tear_down()
+    return results
+
+
+def format_time(seconds):
+    """Formats a duration for display, in whatever units suit it best."""
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '%.3f %s' % (seconds / scale, unit)
+    return '%.1f ns' % (seconds / 1e-9)
+
+
+def environment():
+    """Returns a description of the environment the benchmarks ran in."""
+    import pygame
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(results, baseline, threshold, stream=sys.stdout):
+    """Prints how results compare with a baseline.
+
+    Returns (list): the names of benchmarks that got slower by more
+      than the threshold (a fraction, e.g. 0.1 for 10%).
+    """
+    regressions = []
+    stream.write('\n%-40s %12s %12s %8s\n' % ('benchmark', 'baseline', 'current', 'ratio'))
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        old = baseline[name]['median']
+        new = results[name]['median']
+        ratio = new / old if old else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = '  SLOWER'
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        stream.write('%-40s %12s %12s %7.2fx%s\n' % (
+            name, format_time(old), format_time(new), ratio, flag))
+    return regressions
+
+
+def check_budgets(results, budgets, stream=sys.stdout):
+    """Returns the names of benchmarks whose median time is over budget."""
+    over_budget = []
+    for name, budget in sorted(budgets.items()):
+        if name in results and results[name]['median'] > budget:
+            over_budget.append(name)
+            stream.write('%s is over budget: %s > %s\n' % (
+                name, format_time(results[name]['median']), format_time(budget)))
+    return over_budget
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the cardkit benchmarks.')
+    parser.add_argument('--output', help='save the results to this JSON file')
+    parser.add_argument('--compare', help='compare against results saved in this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='fractional slowdown that counts as a regression (default 0.1)')
+    parser.add_argument('--budgets', help='JSON file mapping benchmark names to maximum seconds')
+    parser.add_argument('--filter', help='only run benchmarks whose names contain this text')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timing batches')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.filter, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'results': results},
+                      f, indent=2, sort_keys=True)
+
+    failed = False
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        failed = bool(compare(results, baseline, args.threshold)) or failed
+    if args.budgets:
+        with open(args.budgets) as f:
+            budgets = json.load(f)
+        failed = bool(check_budgets(results, budgets)) or failed
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,22 @@
-import pygame
-
 from cardkit import card_constants as ck
-from cardkit import card_sprite
+
+# Note: pygame (and card_sprite, which needs it) are only imported
+# inside the drawing code, so that programs that just deal cards
+# around don't pay for loading pygame.
+
+
+# Cards are flyweights: each distinct (rank, suit, face) combination
+# is represented by exactly one Card object, which lives here. Keys are
+# (class, rank, suit, face) tuples of normalized values.
+_INTERNED_CARDS = {}
+
+# Maps the raw arguments passed to Card(...) to the interned card they
+# produce, so that constructing a card we've already seen skips
+# validation altogether. The rank's type is part of the key so that,
+# say, True is not mistaken for 1. Only arguments that are already in
+# normalized form (or have an integer rank) are cached, so the cache
+# can't grow without bound from, say, every capitalization of 'Ace'.
+_CONSTRUCTOR_CACHE = {}
 
 
 class Card(object):
@@ -12,8 +27,12 @@ class Card(object):
     not defined because the defined order of cards may vary from game
     to game (suit order, trump, and aces high/low, for example).
 
-    Generally speaking, cards should be treated as immutable, and must
-    not be modified after they are created.
+    Cards are immutable. In fact, there is only ever one Card object
+    for any given rank, suit, and face: calling Card(...) returns that
+    shared (interned) object rather than creating a new one. This
+    makes cards cheap to create, hash, and compare, which matters when
+    you are dealing with millions of them. Trying to modify a card
+    raises an AttributeError.
 
     Jokers are supported.
 
@@ -24,12 +43,17 @@ class Card(object):
         hearts, or spades.  Jokers have a suit of None.
       face (string): Whether the card is facing 'up' or 'down'. This
         matters when the card is drawn.
+      card_id (int): The card's compact integer id, from 0 to 53
+        (see card_constants.CARD_IDS). The id does not depend on the
+        card's face.
 
     See card_constants for safer (compiler-checked) ways of expressing
     the different ranks, suits, and face possibilities.
     """
-    def __init__(self, rank, suit, face='up'):
-        """Create a card.
+    __slots__ = ('rank', 'suit', 'face', 'card_id', '_hash', '_siblings')
+
+    def __new__(cls, rank, suit, face='up'):
+        """Create (or rather, look up) a card.
 
         Arguments:
 
@@ -41,18 +65,79 @@ class Card(object):
           face (string): Whether the card is face 'up' or 'down'
             for drawing. By default, cards are 'up'.
         """
-        self.rank, self.suit = self.validate_rank_and_suit(
-            rank, suit)
-        self.face = self.validate_face(face)
+        key = (cls, rank.__class__, rank, suit, face)
+        try:
+            return _CONSTRUCTOR_CACHE[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable arguments can't be cached (and will almost
+            # certainly fail validation below).
+            key = None
+
+        raw_rank, raw_suit, raw_face = rank, suit, face
+        rank, suit = cls.validate_rank_and_suit(rank, suit)
+        face = cls.validate_face(face)
+        instance = cls._intern(rank, suit, face)
+        if (key is not None
+            and (raw_rank == rank or raw_rank.__class__ is int)
+            and raw_suit == suit and raw_face == face):
+            _CONSTRUCTOR_CACHE[key] = instance
+        return instance
+
+    @classmethod
+    def _intern(cls, rank, suit, face):
+        """Returns the one card with the given normalized values, creating it if needed."""
+        key = (cls, rank, suit, face)
+        instance = _INTERNED_CARDS.get(key)
+        if instance is None:
+            instance = object.__new__(cls)
+            init = object.__setattr__
+            init(instance, 'rank', rank)
+            init(instance, 'suit', suit)
+            init(instance, 'face', face)
+            init(instance, 'card_id', ck.CARD_IDS[(rank, suit)])
+            init(instance, '_hash', hash((face, rank, suit)))
+            # Same card, other faces; filled in lazily by with_face().
+            init(instance, '_siblings', {face: instance})
+            _INTERNED_CARDS[key] = instance
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Cards are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Cards are immutable')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (self.rank, self.suit, self.face))
 
     def __hash__(self):
-        return hash((self.face, self.rank, self.suit))
+        return self._hash
 
     def __eq__(self, rhs):
+        # Since cards are interned, equal cards are normally the very
+        # same object.
+        if self is rhs:
+            return True
+        if not isinstance(rhs, Card):
+            return NotImplemented
         return (
             (self.face, self.rank, self.suit)
             == (rhs.face, rhs.rank, rhs.suit))
 
+    def __ne__(self, rhs):
+        equal = self.__eq__(rhs)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
     def __str__(self):
         if self.is_joker():
             return "%s (face %s)" % (self.rank, self.face)
@@ -61,17 +146,23 @@ class Card(object):
                 self.rank, self.suit, self.face)
 
     def with_face(self, face):
-        """Returns a new, similar Card, but with the given face.
+        """Returns a similar Card, but with the given face.
 
         Raises: ValueError if the new face is invalid.
         """
-        return Card(self.rank, self.suit, face)
+        try:
+            return self._siblings[face]
+        except KeyError:
+            sibling = self.__class__(self.rank, self.suit, face)
+            self._siblings[face] = sibling
+            return sibling
 
     def is_joker(self):
         """Returns true iff the card is a joker."""
         return (self.rank == ck.JOKER)
 
-    def validate_rank_and_suit(self, rank, suit):
+    @staticmethod
+    def validate_rank_and_suit(rank, suit):
         """Ensure that the rank and suit passed in are valid.
 
         This method also normalizes the rank and suit values.
@@ -98,7 +189,8 @@ class Card(object):
 
         return (rank, suit)
 
-    def validate_face(self, face):
+    @staticmethod
+    def validate_face(face):
         """Ensures that the face value passed in is valid.
 
         This method also normalizes the face value.
@@ -115,14 +207,45 @@ class Card(object):
 
         The top-left corner of the rect is (0,0).
         """
+        import pygame
+        from cardkit import card_sprite
         return pygame.Rect(
             (0, 0), card_sprite.sprite_for(self).size)
 
     def draw(self, surface, location):
-        """Draws the card on the surface at the given location."""
+        """Draws the card on the surface at the given location.
+
+        The surface may also be a sprite.SpriteBatch.
+        """
+        from cardkit import card_sprite
         card_sprite.sprite_for(self).draw(surface, location)
 
 
+# Intern every standard card up front, so that creating cards while a
+# game is running never has to allocate anything.
+for _rank, _suit in ck.DECK_OF_54:
+    _card = Card(_rank, _suit, ck.FACE_UP)
+    _card.with_face(ck.FACE_DOWN).with_face(ck.FACE_UP)
+del _rank, _suit, _card
+
+# Face-up cards, indexed by card id.
+_CARDS_BY_ID = [Card(rank, suit) for rank, suit in ck.DECK_OF_54]
+
+
+def card_for_id(card_id, face=ck.FACE_UP):
+    """Returns the card with the given card id.
+
+    Arguments:
+      card_id (int): A card id, from 0 to 53.
+      face (string): Whether the card should be face 'up' or 'down'.
+    Raises: IndexError if the card id is out of range, or ValueError
+      if the face is invalid.
+    """
+    if card_id < 0:
+        raise IndexError('Card id out of range: %d' % card_id)
+    return _CARDS_BY_ID[card_id].with_face(face)
+
+
 def default_card_drawing_rect():
     """Returns the approximate size of a card as a pygame.Rect.
 
@@ -130,5 +253,7 @@ def default_card_drawing_rect():
     slightly different from others. We expect that this will be close
     to the actual size of each card.
     """
+    import pygame
+    from cardkit import card_sprite
     return pygame.Rect(
         (0, 0), card_sprite.sprite_for(Card(ck.TWO, ck.CLUBS)).size)
@@ -30,6 +30,16 @@ JOKER = 'joker'
 DECK_OF_52 = [(rank, suit) for rank in RANKS for suit in SUITS]
 DECK_OF_54 = DECK_OF_52 + [(JOKER, None), (JOKER, None)]
 
+# Every card has a compact integer id: its index in DECK_OF_54. The
+# standard cards are numbered 0 through 51 in rank-major order (so a
+# card's id is its rank's index in RANKS times 4, plus its suit's
+# index in SUITS), and the two jokers are 52 and 53. CARD_IDS maps
+# (rank, suit) pairs to ids; since the jokers can't be told apart, a
+# joker maps to the first joker id.
+JOKER_IDS = (52, 53)
+CARD_IDS = dict((rank_and_suit, card_id) for card_id, rank_and_suit in enumerate(DECK_OF_52))
+CARD_IDS[(JOKER, None)] = JOKER_IDS[0]
+
 FACE_UP = 'up'
 FACE_DOWN = 'down'
 FACES = (FACE_UP, FACE_DOWN)
@@ -2,14 +2,16 @@
 
 All this game does is allow the player to draw cards from a deck and add them to a discard pile.
 Pressing 'n', or clicking on the discard pile after the deck is exhausted, starts a new game.
+
+The rules of the game live in cardkit.rules; this module just draws
+the game and turns input into actions.
 """
 import pygame
 
 from cardkit import card
-from cardkit import card_constants as ck
 from cardkit import card_sprite
-from cardkit import deck
 from cardkit import flash
+from cardkit import rules
 from cardkit import simple_game
 
 
@@ -23,33 +25,42 @@ class CardGame(simple_game.SimpleGame):
 
         This happens before the run looop starts.
         """
-        card_sprite.load_spritesheet()
-
-        self.deck = deck.Deck()
-        self.deck.shuffle()
+        # Make every card's sprite now, so that looking them up while
+        # drawing is quick and the first frames don't have to.
+        card_sprite.load_spritesheet(presliced=True)
+
+        self.rules = rules.DrawAndDiscard()
+        # The rules never replace these, so we can keep them handy
+        # for drawing.
+        self.deck = self.rules.deck
         self.deck_location = (150, 150)
-
-        self.discard_pile = deck.Deck(initial_cards=[])
+        self.discard_pile = self.rules.discard_pile
         self.discard_pile_location = (300, 150)
 
-        self.flash = flash.FlashMessage(message="Draw some cards!\nPress 'n' to reset.", duration=3000, fade_duration=2000)
+        self.flash = flash.FlashMessage(message="Draw some cards!\nPress 'n' to reset.", duration=3000, fade_duration=2000,
+                                         clock=self.game_time)
         self.flash.show()
         self.flash_location = (100, 50)
 
         deck_rect = self.deck.drawing_rect()
         self.deck_bounding_rect = deck_rect.move(self.deck_location)
         self.discard_pile_bounding_rect = deck_rect.move(self.discard_pile_location)
+        self.flash_bounding_rect = self.flash.drawing_rect().move(self.flash_location)
+
+        # What the deck and discard pile looked like when last drawn,
+        # for working out what needs redrawing in dirty-rect mode.
+        self._drawn_tops = None
 
     def draw_and_discard(self):
         """Draws a card from the deck and places it on the discard pile."""
-        c = self.deck.deal(face=ck.FACE_UP)
-        self.discard_pile.add(c)
+        self.rules.apply(rules.DRAW)
 
     def reset(self):
         """Restarts the game."""
-        self.deck.reset()
-        self.discard_pile.reset()
-        self.deck.shuffle()
+        self.rules.apply(rules.RESET)
+
+    def next_frame_delay(self):
+        return self.flash.next_frame_delay()
 
     def handle_event(self, event):
         """Handles input events from the mouse, keyboard, joystick, etc."""
@@ -62,26 +73,55 @@ class CardGame(simple_game.SimpleGame):
                 # arrow keys and Escape, which may not have character
                 # equivalents.
                 self.reset()
+                self.request_redraw()
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == LEFT_BUTTON:
             click_pos = event.pos
             if self.deck_bounding_rect.collidepoint(click_pos):
                 # We clicked on the deck!
-                if not self.deck.is_empty():
+                if self.rules.is_legal(rules.DRAW):
                     self.draw_and_discard()
+                    self.request_redraw()
 
             if self.discard_pile_bounding_rect.collidepoint(click_pos):
                 # We clicked on the discard pile. Let's have this only
                 # take effect if the deck is exhausted.
-                if self.deck.is_empty():
+                if self.rules.is_finished():
                     self.reset()
+                    self.request_redraw()
 
     def draw(self):
         """Draws the entire game."""
-        self.screen.fill(BACKGROUND_COLOR)
-        self.deck.draw(self.screen, self.deck_location)
-        self.discard_pile.draw(self.screen, self.discard_pile_location)
-        self.flash.draw(self.screen, self.flash_location)
-        pygame.display.flip()
+        if self.uses_dirty_rects():
+            self.mark_changes()
+            self.repaint_dirty(self.draw_scene)
+        else:
+            self.draw_background(self.screen)
+            self.draw_scene(self.screen)
+
+    def draw_background(self, surface):
+        surface.fill(BACKGROUND_COLOR)
+
+    def draw_scene(self, surface):
+        """Draws everything in front of the background."""
+        self.deck.draw(surface, self.deck_location)
+        self.discard_pile.draw(surface, self.discard_pile_location)
+        self.flash.draw(surface, self.flash_location)
+
+    def mark_changes(self):
+        """Marks the parts of the screen that changed since the last frame as dirty."""
+        tops = (self._top_card(self.deck), self._top_card(self.discard_pile))
+        if self._drawn_tops is None or tops[0] != self._drawn_tops[0]:
+            self.mark_dirty(self.deck_bounding_rect)
+        if self._drawn_tops is None or tops[1] != self._drawn_tops[1]:
+            self.mark_dirty(self.discard_pile_bounding_rect)
+        self._drawn_tops = tops
+        if self.flash.should_show:
+            # It's fading, or about to.
+            self.mark_dirty(self.flash_bounding_rect)
+
+    @staticmethod
+    def _top_card(d):
+        return None if d.is_empty() else d.peek()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,251 @@
+"""A compact set of cards, for fast membership and set arithmetic.
+
+A CardSet stores each card as a single bit of an integer, using the
+card's id (see card_constants.CARD_IDS) as the bit position. That
+makes questions like "is this card still live?" or "which suits does
+this hand hold?" a handful of integer operations, rather than a scan
+over a list of Card objects.
+"""
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import deck
+
+
+# Bit masks selecting all the cards of a given suit or rank.
+SUIT_MASKS = dict(
+    (suit, sum(1 << ck.CARD_IDS[(rank, suit)] for rank in ck.RANKS))
+    for suit in ck.SUITS)
+RANK_MASKS = dict(
+    (rank, sum(1 << ck.CARD_IDS[(rank, suit)] for suit in ck.SUITS))
+    for rank in ck.RANKS)
+JOKER_MASK = (1 << ck.JOKER_IDS[0]) | (1 << ck.JOKER_IDS[1])
+FULL_MASK = (1 << len(ck.DECK_OF_54)) - 1
+
+# The mask to test when asking whether a card id is in a set. The two
+# jokers are interchangeable, so asking about either one of them asks
+# whether the set holds any joker at all.
+_MEMBERSHIP_MASKS = [1 << card_id for card_id in range(len(ck.DECK_OF_52))] + [JOKER_MASK, JOKER_MASK]
+
+try:
+    _popcount = int.bit_count
+except AttributeError:
+    def _popcount(mask):
+        return bin(mask).count('1')
+
+
+def _card_id(c):
+    """Returns the id of a card, which may be given as a Card or an id."""
+    if isinstance(c, card.Card):
+        return c.card_id
+    if not 0 <= c < len(ck.DECK_OF_54):
+        raise ValueError('Card id out of range: %s' % c)
+    return c
+
+
+class CardSet(object):
+    """An unordered collection of cards, stored as a bit mask.
+
+    Each of the 52 standard cards is either in the set or not, and a
+    set may hold up to two jokers. The face of a card is ignored: a
+    set contains the ace of spades whether you ask about it face up or
+    face down.
+
+    CardSets support the usual set operations: `in`, len(), iteration,
+    and the |, &, -, and ^ operators, along with add(), remove(), and
+    discard(). Wherever a card is expected, you may pass either a Card
+    or its card id. Iterating over a set yields face-up Cards in card
+    id order; use ids() to get the ids instead.
+
+    Attributes:
+      mask (int): The bits representing the cards in the set. Bit n is
+        set iff the card with id n is in the set.
+    """
+    __slots__ = ('mask',)
+
+    def __init__(self, cards=None):
+        """Creates a CardSet.
+
+        Arguments:
+          cards (iterable or None): The cards (or card ids) to put in
+            the set. If None, the set will be empty.
+        """
+        self.mask = 0
+        if cards is not None:
+            for c in cards:
+                self.add(c)
+
+    @classmethod
+    def from_mask(cls, mask):
+        """Creates a CardSet directly from a bit mask."""
+        if mask & ~FULL_MASK:
+            raise ValueError('Mask has bits that do not represent cards: %x' % mask)
+        card_set = cls()
+        card_set.mask = mask
+        return card_set
+
+    @classmethod
+    def from_deck(cls, source_deck):
+        """Creates a CardSet holding the cards currently in a Deck."""
+        return cls(source_deck.cards)
+
+    @classmethod
+    def full(cls, jokers=False):
+        """Creates a CardSet holding a whole deck of cards.
+
+        Arguments:
+          jokers (bool): Whether to include the two jokers.
+        """
+        return cls.from_mask(FULL_MASK if jokers else FULL_MASK & ~JOKER_MASK)
+
+    def __len__(self):
+        return _popcount(self.mask)
+
+    def __bool__(self):
+        return self.mask != 0
+    __nonzero__ = __bool__
+
+    def __contains__(self, c):
+        if isinstance(c, card.Card):
+            return (self.mask & _MEMBERSHIP_MASKS[c.card_id]) != 0
+        if not 0 <= c < len(ck.DECK_OF_54):
+            return False
+        return (self.mask & _MEMBERSHIP_MASKS[c]) != 0
+
+    def __iter__(self):
+        for card_id in self.ids():
+            yield card.card_for_id(card_id)
+
+    def __eq__(self, rhs):
+        if not isinstance(rhs, CardSet):
+            return NotImplemented
+        return self.mask == rhs.mask
+
+    def __ne__(self, rhs):
+        equal = self.__eq__(rhs)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    # CardSets are mutable, so they can't be dictionary keys. Use
+    # their masks instead.
+    __hash__ = None
+
+    def __or__(self, rhs):
+        return CardSet.from_mask(self.mask | rhs.mask)
+
+    def __and__(self, rhs):
+        return CardSet.from_mask(self.mask & rhs.mask)
+
+    def __sub__(self, rhs):
+        return CardSet.from_mask(self.mask & ~rhs.mask)
+
+    def __xor__(self, rhs):
+        return CardSet.from_mask(self.mask ^ rhs.mask)
+
+    def __repr__(self):
+        return 'CardSet.from_mask(0x%x)' % self.mask
+
+    def copy(self):
+        """Returns a new CardSet with the same cards."""
+        return CardSet.from_mask(self.mask)
+
+    def union(self, rhs):
+        return self | rhs
+
+    def intersection(self, rhs):
+        return self & rhs
+
+    def difference(self, rhs):
+        return self - rhs
+
+    def isdisjoint(self, rhs):
+        """Returns True iff the two sets have no cards in common."""
+        return (self.mask & rhs.mask) == 0
+
+    def issubset(self, rhs):
+        """Returns True iff every card in this set is also in rhs."""
+        return (self.mask & ~rhs.mask) == 0
+
+    def add(self, c):
+        """Adds a card (or card id) to the set.
+
+        Adding a joker fills the first joker slot, then the second.
+        Adding a card that is already in the set has no effect.
+        """
+        card_id = _card_id(c)
+        if card_id == ck.JOKER_IDS[0] and self.mask & (1 << card_id):
+            card_id = ck.JOKER_IDS[1]
+        self.mask |= 1 << card_id
+
+    def discard(self, c):
+        """Removes a card (or card id) from the set, if it is present.
+
+        Removing a joker empties the second joker slot before the first.
+        """
+        card_id = _card_id(c)
+        if card_id in ck.JOKER_IDS:
+            if self.mask & (1 << ck.JOKER_IDS[1]):
+                card_id = ck.JOKER_IDS[1]
+            else:
+                card_id = ck.JOKER_IDS[0]
+        self.mask &= ~(1 << card_id)
+
+    def remove(self, c):
+        """Removes a card (or card id) from the set.
+
+        Raises: KeyError if the card is not in the set.
+        """
+        if c not in self:
+            raise KeyError(c)
+        self.discard(c)
+
+    def clear(self):
+        """Removes all cards from the set."""
+        self.mask = 0
+
+    def ids(self):
+        """Yields the ids of the cards in the set, in ascending order."""
+        mask = self.mask
+        while mask:
+            lowest_bit = mask & -mask
+            yield lowest_bit.bit_length() - 1
+            mask ^= lowest_bit
+
+    def cards(self, face=ck.FACE_UP):
+        """Returns a list of the Cards in the set, in card id order.
+
+        Arguments:
+          face (string): Whether the returned cards should be face
+            'up' or 'down'.
+        """
+        return [card.card_for_id(card_id, face) for card_id in self.ids()]
+
+    def to_deck(self, face=ck.FACE_DOWN):
+        """Returns a new Deck holding the cards in the set.
+
+        The lowest card id will be on top of the deck. By default, the
+        cards will be face down, as they are in a standard Deck.
+        """
+        return deck.Deck(self.cards(face))
+
+    def count_suit(self, suit):
+        """Returns the number of cards of the given suit in the set."""
+        return _popcount(self.mask & SUIT_MASKS[suit])
+
+    def count_rank(self, rank):
+        """Returns the number of cards of the given rank in the set."""
+        return _popcount(self.mask & RANK_MASKS[rank])
+
+    def suits(self):
+        """Returns a tuple of the suits held by the set, in SUITS order."""
+        mask = self.mask
+        return tuple(suit for suit in ck.SUITS if mask & SUIT_MASKS[suit])
+
+    def ranks(self):
+        """Returns a tuple of the ranks held by the set, in RANKS order."""
+        mask = self.mask
+        return tuple(rank for rank in ck.RANKS if mask & RANK_MASKS[rank])
+
+    def joker_count(self):
+        """Returns the number of jokers in the set (0, 1, or 2)."""
+        return _popcount(self.mask & JOKER_MASK)
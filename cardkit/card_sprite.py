@@ -7,6 +7,16 @@ in games.)
 These functions help navigate that spritesheet, returning sprite
 objects that can draw a portion of that spritesheet (a signle card) to
 the screen.
+
+Alternatively, the spritesheet can be "presliced" when it is loaded:
+each card's image is copied out of the sheet into a small surface of
+its own, and a sprite is made for every card up front. That costs a
+little memory and load time, but spares the game the work of making
+each card's sprite the first time it's drawn, and makes looking up
+sprites (sprite_for()) as cheap as indexing a list. Drawing a sprite
+isn't any faster, though: the benchmarks show no consistent
+difference between blitting from a small surface and from a part of
+the sheet.
 """
 import os
 
@@ -67,18 +77,45 @@ SPRITE_SHEET_DATA = {
 # once. This assumes that the cards are immutable!
 CARD_SPRITE_CACHE = {}
 
+# If the spritesheet was presliced, this holds a sprite for every
+# face-up card, indexed by card id (see card_constants.CARD_IDS),
+# followed by the face-down sprite at FACE_DOWN_SPRITE_INDEX.
+CARD_SPRITES = None
+FACE_DOWN_SPRITE_INDEX = len(ck.DECK_OF_54)
+
 
-def load_spritesheet():
+def load_spritesheet(presliced=False):
     """Load the spritesheet for a set of playing cards.
 
     Currently, only one spritesheet ("the" spritesheet) is supported.
+
+    Arguments:
+      presliced (bool): If True, make a sprite for every card right
+        away, so that sprite_for() never has to. Each sprite draws
+        from its own copy of the card's image.
     """
-    global CARD_SHEET
+    global CARD_SHEET, CARD_SPRITES
     project_dir = os.path.dirname(os.path.abspath(__file__))
     CARD_SHEET = pygame.image.load(
         os.path.join(project_dir, "img", CARD_SPRITE_SHEET_FILENAME)
     ).convert_alpha()
 
+    # Any sprites we made before refer to the old spritesheet.
+    CARD_SPRITE_CACHE.clear()
+    CARD_SPRITES = None
+    if presliced:
+        sprites = [
+            _make_presliced_sprite(*_sprite_data_for(rank, suit, ck.FACE_UP))
+            for rank, suit in ck.DECK_OF_54]
+        sprites.append(_make_presliced_sprite(*_sprite_data_for(None, None, ck.FACE_DOWN)))
+        CARD_SPRITES = sprites
+
+
+def _make_presliced_sprite(source_pos, size, origin):
+    """Makes a sprite that draws from its own copy of part of the spritesheet."""
+    image = CARD_SHEET.subsurface(pygame.Rect(source_pos, size)).copy()
+    return sprite.Sprite(image, (0, 0), size, origin)
+
 
 def get_sprite_data(card):
     """Returns the data needed to construct a sprite for a given card.
@@ -92,13 +129,18 @@ def get_sprite_data(card):
       - The origin of the card's sprite as (x, y) relative to the
         top-left corner of the sprite region
     """
+    return _sprite_data_for(card.rank, card.suit, card.face)
+
+
+def _sprite_data_for(rank, suit, face):
+    """Like get_sprite_data(), but for a card's rank, suit, and face."""
     data = SPRITE_SHEET_DATA[CARD_SPRITE_SHEET_FILENAME]
-    if card.face == ck.FACE_DOWN:
+    if face == ck.FACE_DOWN:
         source_pos = data['face-down-source-position']
-    elif card.is_joker():
+    elif rank == ck.JOKER:
         source_pos = data['joker-source-position']
     else:
-        source_pos = (data['rank-x-offsets'][card.rank], data['suit-y-offsets'][card.suit])
+        source_pos = (data['rank-x-offsets'][rank], data['suit-y-offsets'][suit])
 
     size = data['card-size']
     origin = (0, 0) # same for all cards - top left corner
@@ -113,6 +155,12 @@ def sprite_for(card):
     The spritesheet must be loaded via load_spritesheet() before
     calling this function. Otherwise, a RuntimeError will be raised.
     """
+    sprites = CARD_SPRITES
+    if sprites is not None:
+        if card.face == ck.FACE_DOWN:
+            return sprites[FACE_DOWN_SPRITE_INDEX]
+        return sprites[card.card_id]
+
     if card in CARD_SPRITE_CACHE:
         return CARD_SPRITE_CACHE[card]
 
@@ -0,0 +1,29 @@
+"""Clocks for timing game logic.
+
+Anything in cardkit that needs to know the time takes an optional
+`clock` argument: a function taking no arguments that returns the
+current time in milliseconds, like pygame.time.get_ticks (the usual
+default). Passing something else makes timing-dependent code easy to
+test, and lets a game run on simulated time rather than wall-clock
+time (see SimpleGame.game_time()).
+"""
+
+
+class ManualClock(object):
+    """A clock that only moves when it is told to.
+
+    Attributes:
+      now (int or float): The current time, in milliseconds.
+    """
+    def __init__(self, start=0):
+        self.now = start
+
+    def __call__(self):
+        """Returns the current time, in milliseconds."""
+        return self.now
+
+    def advance(self, milliseconds):
+        """Moves the clock forward."""
+        if milliseconds < 0:
+            raise ValueError('Clocks cannot go backwards: %s' % milliseconds)
+        self.now += milliseconds
@@ -0,0 +1,328 @@
+"""Exact odds, by going through every way the remaining cards can fall.
+
+Where cardkit.simulation estimates odds by dealing at random, this
+module works them out exactly, by enumerating every combination of k
+cards that could still be dealt from a deck. That's only practical
+when there aren't too many combinations, but it's often less work
+than you'd think:
+
+- Combinations are generated one at a time, so memory use stays flat
+  however many there are.
+- Many combinations are the same as each other apart from their suits.
+  Say nobody holds any diamonds or hearts yet: then any combination
+  gives exactly the same result as the one with its diamonds and
+  hearts swapped. iter_canonical() yields just one combination of
+  each such family, with a weight saying how many combinations it
+  stands for. Dealing two cards from a full deck, for example, has
+  1326 combinations but only 169 families.
+- Combinations are numbered in lexicographic order, and unrank() goes
+  straight from a number to its combination, so the work can be split
+  into ranges of numbers and spread across processes.
+
+count_outcomes() puts all this together:
+
+    def outcome(dealt, known_cards):
+        # Work out how things turn out if the dealt cards come next.
+        return 'win'
+
+    counts = combinations.count_outcomes(outcome, 2, deck=my_deck, known_cards=my_hand)
+
+The generators work with card ids (see card_constants.CARD_IDS) rather
+than Cards, since they're cheaper to make and compare. Only standard
+cards are supported, not jokers.
+"""
+import itertools
+import multiprocessing
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import parallel
+
+
+_SUIT_COUNT = len(ck.SUITS)
+_RANK_COUNT = len(ck.RANKS)
+_STANDARD_CARD_COUNT = len(ck.DECK_OF_52)
+
+
+def combination_count(n, k):
+    """Returns the number of ways of choosing k things from n."""
+    if not 0 <= k <= n:
+        return 0
+    k = min(k, n - k)
+    count = 1
+    for i in range(k):
+        count = count * (n - i) // (i + 1)
+    return count
+
+
+def pool_ids(deck=None, known_cards=()):
+    """Returns the ids of the cards that could still be dealt, in order.
+
+    Arguments:
+      deck (Deck or None): The deck to be dealt from. If None, a full
+        52-card deck.
+      known_cards (sequence): Cards that are known not to be in the deck.
+    Raises: ValueError if there are jokers in the deck.
+    """
+    if deck is None:
+        ids = set(range(_STANDARD_CARD_COUNT))
+    else:
+        ids = set(c.card_id for c in deck.cards)
+    ids.difference_update(c.card_id for c in known_cards)
+    if any(card_id >= _STANDARD_CARD_COUNT for card_id in ids):
+        raise ValueError('Combinations of jokers are not supported')
+    return sorted(ids)
+
+
+def unrank(index, n, k):
+    """Returns the combination with a given number.
+
+    Combinations of k of the numbers 0 to n - 1 are numbered from 0 in
+    lexicographic order, so that combination 0 is (0, 1, ..., k - 1).
+
+    Returns (tuple): the combination, in increasing order.
+    Raises: IndexError if there is no combination with that number.
+    """
+    if not 0 <= index < combination_count(n, k):
+        raise IndexError('Combination number out of range: %d' % index)
+    combination = []
+    x = 0
+    for i in range(k):
+        # Skip past all the combinations whose next number is x, until
+        # we reach the one we want.
+        while True:
+            count = combination_count(n - x - 1, k - i - 1)
+            if index < count:
+                break
+            index -= count
+            x += 1
+        combination.append(x)
+        x += 1
+    return tuple(combination)
+
+
+def iter_combinations(pool, k, start=0, stop=None):
+    """Yields combinations of k items from a pool, in lexicographic order.
+
+    Arguments:
+      pool (sequence): The items to choose from.
+      k (int): The number of items in each combination.
+      start (int): The number of the first combination to yield.
+      stop (int or None): The number of the combination to stop
+        before. If None, go on to the last combination.
+    """
+    n = len(pool)
+    total = combination_count(n, k)
+    stop = total if stop is None else min(stop, total)
+    if start >= stop:
+        return
+    if start == 0 and stop == total:
+        for combination in itertools.combinations(pool, k):
+            yield combination
+        return
+    positions = list(unrank(start, n, k))
+    for i in range(stop - start):
+        yield tuple(pool[p] for p in positions)
+        # Move on to the next combination: bump the rightmost
+        # position that can go up, and pack the ones after it in
+        # right behind it.
+        j = k - 1
+        while j >= 0 and positions[j] == n - k + j:
+            j -= 1
+        if j < 0:
+            return
+        positions[j] += 1
+        for m in range(j + 1, k):
+            positions[m] = positions[m - 1] + 1
+
+
+def iter_canonical(pool, k, known_cards=()):
+    """Yields one combination of each family that differs only by suit.
+
+    Two suits are interchangeable if none of the known cards are of
+    either suit, and the pool holds the same ranks of both. Swapping
+    interchangeable suits can't change the result of dealing a
+    combination, so we only yield the combination from each family
+    that lists the ranks of interchangeable suits in a standard order,
+    along with the number of combinations in the family.
+
+    Arguments:
+      pool (sequence): The ids of the cards to choose from.
+      k (int): The number of cards in each combination.
+      known_cards (sequence): Cards whose suits must not be swapped,
+        usually the ones that have already been dealt.
+    Yields: (ids, weight) pairs, where ids is a tuple of card ids in
+      increasing order. The weights add up to the number of
+      combinations of k cards from the pool.
+    """
+    # The ranks of each suit in the pool, as a 13-bit mask, bit i
+    # standing for ck.RANKS[i] (so the card with id i * 4 + suit).
+    available = [0] * _SUIT_COUNT
+    for card_id in pool:
+        if card_id >= _STANDARD_CARD_COUNT:
+            raise ValueError('Combinations of jokers are not supported')
+        available[card_id & 3] |= 1 << (card_id >> 2)
+    known_suits = set(c.card_id & 3 for c in known_cards)
+
+    # Group interchangeable suits into classes, and list the suits of
+    # each class next to each other.
+    classes = {}
+    for suit in range(_SUIT_COUNT):
+        key = ('known', suit) if suit in known_suits else ('free', available[suit])
+        classes.setdefault(key, []).append(suit)
+    classes = sorted(classes.values())
+    if len(classes) == _SUIT_COUNT:
+        # No suits are interchangeable, so every combination is its
+        # own family.
+        return ((ids, 1) for ids in itertools.combinations(sorted(pool), k))
+    suit_order = [suit for suits in classes for suit in suits]
+    class_index = dict((suit, i) for i, suits in enumerate(classes) for suit in suits)
+    same_class_as_previous = [False] + [
+        class_index[suit_order[i]] == class_index[suit_order[i - 1]]
+        for i in range(1, _SUIT_COUNT)]
+    class_start = [suit_order.index(classes[class_index[suit]][0]) for suit in suit_order]
+    # For each suit, and each number of cards up to k that could be
+    # chosen from it, every choice as a (mask, ids) pair, in
+    # increasing mask order.
+    options = []
+    for suit in suit_order:
+        suit_ids = [r * 4 + suit for r in range(_RANK_COUNT) if available[suit] & (1 << r)]
+        options.append([
+            sorted((sum(1 << (card_id >> 2) for card_id in chosen), chosen)
+                   for chosen in itertools.combinations(suit_ids, size))
+            for size in range(min(k, len(suit_ids)) + 1)])
+    # The most cards that can be chosen from the i'th suit onward.
+    capacity = [sum(len(o) - 1 for o in options[i:]) for i in range(_SUIT_COUNT + 1)]
+    masks = [0] * _SUIT_COUNT
+
+    def choose(i, remaining, ids, weight, run):
+        """Yields the canonical choices from the i'th suit in suit_order onward.
+
+        Arguments:
+          i (int): The index in suit_order of the suit to choose from.
+          remaining (int): The number of cards still to choose.
+          ids (tuple): The cards chosen from the suits before the i'th.
+          weight (int): The size of the family so far.
+          run (int): The number of suits in a row so far, in the
+            current class, that have the same mask.
+        """
+        if i == _SUIT_COUNT:
+            yield tuple(sorted(ids)), weight
+            return
+        low = max(0, remaining - capacity[i + 1])
+        high = min(remaining, len(options[i]) - 1)
+        same_class = same_class_as_previous[i]
+        for size in range(low, high + 1):
+            for mask, chosen in options[i][size]:
+                if same_class:
+                    # Within a class, each suit's mask must be no bigger
+                    # than the one before, so each family turns up once.
+                    if mask > masks[i - 1]:
+                        break
+                    # A class of m suits makes a family of
+                    # m! / (r1! r2! ...) combinations, where the r's are
+                    # the lengths of the runs of equal masks; build
+                    # that up a suit at a time.
+                    new_run = run + 1 if mask == masks[i - 1] else 1
+                    new_weight = weight * (i - class_start[i] + 1) // new_run
+                else:
+                    new_run = 1
+                    new_weight = weight
+                masks[i] = mask
+                for result in choose(i + 1, remaining - size, ids + chosen, new_weight, new_run):
+                    yield result
+
+    return choose(0, k, (), 1, 1)
+
+
+def count_outcomes(outcome, k, deck=None, known_cards=(), use_suit_symmetry=True,
+                   processes=None, chunk_size=20000, pool=None):
+    """Counts the outcomes of every way k more cards can be dealt.
+
+    Arguments:
+      outcome (callable): A function taking a list of k dealt Cards
+        and the known cards, and returning a hashable label for the
+        outcome. If using more than one process, it must be picklable
+        (see cardkit.simulation).
+      k (int): The number of cards still to be dealt.
+      deck (Deck or None): The deck the cards are dealt from. If None,
+        a full 52-card deck.
+      known_cards (sequence): Cards that are known, and so can't be
+        dealt: a player's hand, say. They are passed on to outcome().
+      use_suit_symmetry (bool): Whether to skip combinations that only
+        differ from others by swapping suits; see iter_canonical().
+        The outcome must not depend on which suit is which, other
+        than through the known cards.
+      processes (int or None): The number of worker processes to use.
+        If None, one per CPU is used. If 1, everything runs in this
+        process. If a pool is given, this only decides how many chunks
+        are handed to it at once (twice this many).
+      chunk_size (int): The number of combinations in each piece of
+        work handed to a worker. Without suit symmetry, each piece is
+        a range of combination numbers, which the worker generates
+        itself; with it, this process generates the canonical
+        combinations and hands them out in lists.
+      pool (multiprocessing.Pool or None): A pool of worker processes
+        to use, as for simulation.estimate(). The pool is left running.
+    Returns (dict): the number of combinations with each outcome. The
+      counts add up to combination_count(len(pool_ids(...)), k).
+    """
+    known_cards = list(known_cards)
+    remaining_ids = pool_ids(deck, known_cards)
+    if use_suit_symmetry:
+        tasks = (
+            (outcome, known_cards, chunk, None)
+            for chunk in _chunks(iter_canonical(remaining_ids, k, known_cards), chunk_size))
+    else:
+        total = combination_count(len(remaining_ids), k)
+        tasks = (
+            (outcome, known_cards, None, (remaining_ids, k, start, start + chunk_size))
+            for start in range(0, total, chunk_size))
+
+    counts = {}
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if pool is not None:
+        _add_counts(counts, parallel.imap_bounded(pool, _count_chunk, tasks, 2 * processes))
+    elif processes == 1:
+        results = (_count_chunk(task) for task in tasks)
+        _add_counts(counts, results)
+    else:
+        worker_pool = multiprocessing.Pool(processes)
+        try:
+            _add_counts(counts, parallel.imap_bounded(
+                worker_pool, _count_chunk, tasks, 2 * processes))
+        finally:
+            worker_pool.terminate()
+            worker_pool.join()
+    return counts
+
+
+def _add_counts(counts, results):
+    """Adds the outcome counts of each chunk into counts."""
+    for chunk_counts in results:
+        for key, count in chunk_counts.items():
+            counts[key] = counts.get(key, 0) + count
+
+
+def _chunks(iterable, size):
+    """Yields lists of up to size items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _count_chunk(task):
+    """Counts the outcomes of one chunk of combinations."""
+    outcome, known_cards, weighted, index_range = task
+    if weighted is None:
+        weighted = ((ids, 1) for ids in iter_combinations(*index_range))
+    counts = {}
+    cards_by_id = [card.card_for_id(card_id) for card_id in range(_STANDARD_CARD_COUNT)]
+    for ids, weight in weighted:
+        key = outcome([cards_by_id[card_id] for card_id in ids], known_cards)
+        counts[key] = counts.get(key, 0) + weight
+    return counts
@@ -1,20 +1,78 @@
-import copy
+import collections
 import random
 
-import pygame
-
 from cardkit import card
 from cardkit import card_constants as ck
 
 
 DEFAULT_CARD_SET = [card.Card(rank, suit, ck.FACE_DOWN) for rank, suit in ck.DECK_OF_52]
 
+# Kinds of entries in a Deck's journal (see Deck.snapshot()). Each
+# entry records how to undo one change to the deck.
+_UNDO_DEAL = 0 # Put the dealt card back on top.
+_UNDO_ADD = 1 # Take the added card back off the top.
+_UNDO_ADD_TO_BOTTOM = 2 # Take the added card back off the bottom.
+_UNDO_REPLACE = 3 # Put back the entire previous sequence of cards.
+_UNDO_DEAL_FROM_BOTTOM = 4 # Put the dealt card back on the bottom.
+_UNDO_CUT = 5 # Move the cut cards back from the bottom to the top.
+_UNDO_DEAL_SEVERAL = 6 # Put the dealt cards back on top.
+_UNDO_LAZY_SHUFFLE = 7 # Go back to the previous lazy shuffle state.
+_UNDO_LAZY_STEP = 8 # Swap back two cards swapped during a lazy shuffle.
+
+
+def _riffle(cards, rng):
+    """Returns the given list of cards after one Gilbert-Shannon-Reeds riffle."""
+    # The cut point follows a binomial distribution, which we get by
+    # flipping one coin per card.
+    cut = bin(rng.getrandbits(len(cards))).count('1') if cards else 0
+    left, right = cards[:cut], cards[cut:]
+    left_count, right_count = len(left), len(right)
+    riffled = []
+    i = j = 0
+    while i < left_count and j < right_count:
+        remaining_left = left_count - i
+        if rng.random() * (remaining_left + right_count - j) < remaining_left:
+            riffled.append(left[i])
+            i += 1
+        else:
+            riffled.append(right[j])
+            j += 1
+    riffled.extend(left[i:])
+    riffled.extend(right[j:])
+    return riffled
+
 
 class DeckError(Exception):
     """A runtime error encountered while doing Deck operations."""
     pass
 
 
+class DeckListener(object):
+    """Something that wants to know when cards go into or out of a deck.
+
+    Subclass this and override the methods you need, then pass an
+    instance to Deck.add_listener() (or Shoe.add_listener()). Listeners
+    are told about changes to which cards are in the deck, not about
+    changes to their order, so shuffling, riffling and cutting aren't
+    reported. The source is the Deck or Shoe that changed.
+    """
+    def cards_removed(self, source, cards):
+        """Called after cards are dealt from the source."""
+        pass
+
+    def cards_added(self, source, cards):
+        """Called after cards are added to the source."""
+        pass
+
+    def cards_reset(self, source):
+        """Called after the source is reset to its initial cards."""
+        pass
+
+    def cards_restored(self, source):
+        """Called after the source is rolled back to a snapshot."""
+        pass
+
+
 class Deck(object):
     """An ordered, mutable collection of Cards.
 
@@ -29,10 +87,16 @@ class Deck(object):
         state.
       cards (list): The current sequence of cards in the deck. For
         performance reasons, the topmost card is the _last_ element in
-        the sequence.
+        the sequence. Use the deck's methods to change it: reset() and
+        restore() only undo changes that the deck knows about, so
+        editing the list directly may leave them with the wrong cards.
+      rng (random.Random or module): The random number generator
+        used to shuffle the deck. See cardkit.rng.
 
+    Cards are immutable, so the deck never needs to copy them; the
+    deck only ever copies the sequence holding them.
     """
-    def __init__(self, initial_cards=None):
+    def __init__(self, initial_cards=None, rng=None):
         """Creates a Deck.
 
         Arguments:
@@ -41,6 +105,9 @@ class Deck(object):
             52 cards (no jokers) will be used. Note that the face of
             cards specified in the initial sequence will generally be
             preserved.
+          rng (random.Random or None): The random number generator
+            to shuffle with. If None, the global generator in the
+            random module will be used.
         """
         # Note: since we draw off the back of the list, we need to reverse
         # the order of the cards when we initially import them.
@@ -48,29 +115,138 @@ class Deck(object):
             self.initial_cards = DEFAULT_CARD_SET[::-1]
         else:
             self.initial_cards = initial_cards[::-1]
-        self.cards = copy.deepcopy(self.initial_cards)
+        self.cards = list(self.initial_cards)
+        self.rng = random if rng is None else rng
+
+        # The undo log for snapshot() and restore(). This is None
+        # until the first snapshot is taken; until then, we don't pay
+        # for keeping track of changes.
+        self._journal = None
+        self._journal_generation = 0
+
+        # For a lazily shuffled deck, the number of cards at the
+        # bottom of self.cards that have yet to be put in random
+        # order; the cards above them are in their final order. This
+        # is 0 if the deck isn't lazily shuffled.
+        self._unshuffled = 0
+
+        # The positions in self.cards whose cards may differ from
+        # those in self.initial_cards, apart from cards that have been
+        # dealt off the top. This lets us reset the deck in time
+        # proportional to the number of cards that have been dealt.
+        # If we can no longer keep track, this is None.
+        self._touched = []
+
+        # The DeckListeners to tell about changes.
+        self._listeners = []
 
     def __len__(self):
         return len(self.cards)
 
     def reset(self):
-        """Reset the deck to the sequence of cards that it was created with."""
-        # Make sure not to copy just the list but the cards
-        # themselves.  That way, the original face up/down state will
-        # be restored.
-        self.cards = copy.deepcopy(self.initial_cards)
+        """Reset the deck to the sequence of cards that it was created with.
 
-    def shuffle(self):
+        If the deck has only had cards dealt from it since it was
+        created or last reset (even if it was lazily shuffled), this
+        takes time proportional to the number of cards dealt.
+        """
+        self._log_replace()
+        # Since cards are immutable, their original face up/down state
+        # comes back along with them.
+        touched = self._touched
+        if touched is None or len(self.cards) > len(self.initial_cards):
+            # Adding cards stops us keeping track, so a deck with more
+            # cards than it started with must have been changed behind
+            # our back.
+            self._replace_cards(self.initial_cards)
+        else:
+            cards = self.cards
+            initial_cards = self.initial_cards
+            size = len(cards)
+            for index in touched:
+                if index < size:
+                    cards[index] = initial_cards[index]
+            cards.extend(initial_cards[size:])
+        self._unshuffled = 0
+        self._touched = []
+        for listener in self._listeners:
+            listener.cards_reset(self)
+
+    def add_listener(self, listener):
+        """Starts telling a DeckListener about cards going in and out of the deck."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stops telling a DeckListener about changes to the deck."""
+        self._listeners.remove(listener)
+
+    def shuffle(self, lazy=False):
         """Shuffles the current contents of the deck.
 
         Note that this does _not_ affect the initial sequence of cards.
+
+        Arguments:
+          lazy (bool): If True, the deck isn't actually shuffled right
+            away. Instead, each card is chosen at random from the
+            remaining cards as it is dealt or peeked at (one step of a
+            Fisher-Yates shuffle at a time). The cards come out in
+            exactly as random an order, but you only pay for the cards
+            you deal, which is much cheaper when you deal just a few
+            cards from a large deck.
+
+            While a deck is lazily shuffled, the order of the cards in
+            `cards` that have not yet been dealt or peeked at is
+            meaningless. Adding cards to the top of the deck is fine,
+            but operations that rearrange the rest of the deck (adding
+            to or dealing from the bottom, cutting, and riffling)
+            finish shuffling the deck first.
+        """
+        if lazy:
+            if self._journal is not None:
+                self._journal.append((_UNDO_LAZY_SHUFFLE, self._unshuffled))
+            self._unshuffled = len(self.cards)
+            return
+        self._log_replace()
+        self.rng.shuffle(self.cards)
+        self._unshuffled = 0
+        self._touched = None
+
+    def riffle(self):
+        """Riffle-shuffles the current contents of the deck once.
+
+        This models a real riffle shuffle (the Gilbert-Shannon-Reeds
+        model): the deck is cut roughly in half, and the two halves are
+        interleaved, dropping a card from each half with probability
+        proportional to the number of cards left in it. A single riffle
+        does not randomize a deck; about seven of them will.
+        """
+        self._finish_shuffle()
+        self._log_replace()
+        self._replace_cards(_riffle(list(self.cards), self.rng))
+        self._touched = None
+
+    def cut(self, count):
+        """Cuts the deck, moving the top count cards to the bottom.
+
+        Arguments:
+          count (integer): The number of cards to move.
+        Raises: DeckError if the deck doesn't have that many cards.
         """
-        random.shuffle(self.cards)
+        if not 0 <= count <= len(self.cards):
+            raise DeckError(
+                'Cannot cut %d cards from a deck of %d' % (count, len(self.cards)))
+        self._finish_shuffle()
+        self._rotate(count)
+        self._touched = None
+        if self._journal is not None:
+            self._journal.append((_UNDO_CUT, count))
 
     def peek(self):
         """Returns the top card from the deck, without removing it from the deck."""
         if self.is_empty():
             raise DeckError('Deck is empty')
+        if self._unshuffled:
+            self._settle(1)
         return self.cards[-1]
 
     def deal(self, face=None):
@@ -86,7 +262,13 @@ class Deck(object):
         """
         if self.is_empty():
             raise DeckError('Deck is empty')
+        if self._unshuffled:
+            self._settle(1)
         dealt_card = self.cards.pop()
+        if self._journal is not None:
+            self._journal.append((_UNDO_DEAL, dealt_card))
+        for listener in self._listeners:
+            listener.cards_removed(self, [dealt_card])
         if face is not None:
            dealt_card = dealt_card.with_face(face)
         return dealt_card
@@ -100,9 +282,62 @@ class Deck(object):
             face 'up' or 'down'.
         Returns (list): the sequence of Cards dealt, in the order they
           were dealt.
-        Raises: DeckError if the deck runs out of cards.
+        Raises: DeckError if the deck doesn't have enough cards. In
+          that case, no cards are dealt.
         """
-        return [self.deal(face) for i in xrange(count)]
+        if count > len(self.cards):
+            raise DeckError(
+                'Cannot deal %d cards; only %d left' % (count, len(self.cards)))
+        if count <= 0:
+            return []
+        if self._unshuffled:
+            self._settle(count)
+        dealt_cards = self._pop_top_several(count)
+        if self._journal is not None:
+            self._journal.append((_UNDO_DEAL_SEVERAL, dealt_cards))
+        for listener in self._listeners:
+            listener.cards_removed(self, dealt_cards)
+        if face is not None:
+            face = card.Card.validate_face(face)
+            dealt_cards = [c.with_face(face) for c in dealt_cards]
+        return dealt_cards
+
+    def deal_hands(self, hand_count, cards_per_hand, face=None):
+        """Deals several hands of cards, one card at a time to each hand in turn.
+
+        Arguments:
+          hand_count (integer): The number of hands to deal.
+          cards_per_hand (integer): The number of cards in each hand.
+          face (string or None): if non-None, forces cards to be dealt
+            face 'up' or 'down'.
+        Returns (list): a list of hand_count hands, each of which is a
+          list of cards in the order they were dealt.
+        Raises: DeckError if the deck doesn't have enough cards. In
+          that case, no cards are dealt.
+        """
+        dealt_cards = self.deal_several(hand_count * cards_per_hand, face)
+        return [dealt_cards[i::hand_count] for i in range(hand_count)]
+
+    def deal_from_bottom(self, face=None):
+        """Deals the bottom card from the deck, removing it.
+
+        Arguments:
+          face (string or None): See deal().
+        Returns (Card): the dealt card, with face modified if necessary.
+        Raises: DeckError if the deck is empty.
+        """
+        if self.is_empty():
+            raise DeckError('Deck is empty')
+        self._finish_shuffle()
+        dealt_card = self._pop_bottom()
+        self._touched = None
+        if self._journal is not None:
+            self._journal.append((_UNDO_DEAL_FROM_BOTTOM, dealt_card))
+        for listener in self._listeners:
+            listener.cards_removed(self, [dealt_card])
+        if face is not None:
+            dealt_card = dealt_card.with_face(face)
+        return dealt_card
 
     def add(self, card, to_bottom=False):
         """Adds a card to the deck.
@@ -116,10 +351,167 @@ class Deck(object):
             bottom of the deck.  By default, we add to the top of the
             deck.
         """
+        self._touched = None
         if to_bottom:
-            self.cards.insert(0, card)
+            self._finish_shuffle()
+            self._push_bottom(card)
+            if self._journal is not None:
+                self._journal.append((_UNDO_ADD_TO_BOTTOM, card))
         else:
             self.cards.append(card)
+            if self._journal is not None:
+                self._journal.append((_UNDO_ADD, card))
+        for listener in self._listeners:
+            listener.cards_added(self, [card])
+
+    def snapshot(self):
+        """Returns a token that can be used to roll the deck back to its current state.
+
+        Taking a snapshot is cheap enough to do on every move. Once a
+        deck has had a snapshot taken, it keeps a log of the changes
+        made to it, so that restore() only has to undo the changes
+        made since the snapshot. Most changes cost very little to log,
+        but shuffle() and reset() log a copy of the deck's cards.
+
+        Call discard_snapshots() when you no longer need to roll back,
+        to stop logging changes.
+
+        Returns: an opaque token to pass to restore().
+        """
+        if self._journal is None:
+            self._journal = []
+        journal = self._journal
+        # Remember the last entry along with the length of the log, so
+        # that we can tell if the log has been rewound past this point
+        # and rewritten since.
+        last_entry = journal[-1] if journal else None
+        return (self._journal_generation, len(journal), last_entry)
+
+    def restore(self, token):
+        """Rolls the deck back to the state it was in when a snapshot was taken.
+
+        The same snapshot may be restored any number of times. Snapshots
+        taken after the one being restored become invalid once the deck
+        is changed again.
+
+        Arguments:
+          token: A token returned by snapshot().
+        Raises: DeckError if the snapshot is no longer valid.
+        """
+        generation, position, last_entry = token
+        journal = self._journal
+        if (journal is None
+            or generation != self._journal_generation
+            or position > len(journal)
+            or (position > 0 and journal[position - 1] is not last_entry)):
+            raise DeckError('Snapshot is no longer valid')
+        while len(journal) > position:
+            kind, payload = journal.pop()
+            self._undo(kind, payload)
+        self._touched = None
+        for listener in self._listeners:
+            listener.cards_restored(self)
+
+    def discard_snapshots(self):
+        """Stops logging changes for snapshots, invalidating all existing snapshots."""
+        self._journal = None
+        self._journal_generation += 1
+
+    def _undo(self, kind, payload):
+        """Undoes one change recorded in the journal."""
+        if kind == _UNDO_DEAL:
+            self.cards.append(payload)
+        elif kind == _UNDO_ADD:
+            self.cards.pop()
+        elif kind == _UNDO_ADD_TO_BOTTOM:
+            self._pop_bottom()
+        elif kind == _UNDO_DEAL_FROM_BOTTOM:
+            self._push_bottom(payload)
+        elif kind == _UNDO_CUT:
+            self._rotate(-payload)
+        elif kind == _UNDO_DEAL_SEVERAL:
+            self.cards.extend(reversed(payload))
+        elif kind == _UNDO_LAZY_SHUFFLE:
+            self._unshuffled = payload
+        elif kind == _UNDO_LAZY_STEP:
+            chosen, settled = payload
+            cards = self.cards
+            cards[chosen], cards[settled] = cards[settled], cards[chosen]
+            self._unshuffled = settled + 1
+        elif kind == _UNDO_REPLACE:
+            cards, self._unshuffled = payload
+            self._replace_cards(cards)
+        else:
+            raise DeckError('Unknown journal entry: %r' % (kind,))
+
+    def _log_replace(self):
+        """Logs the deck's entire state, ahead of a change that rearranges it."""
+        if self._journal is not None:
+            self._journal.append((_UNDO_REPLACE, (list(self.cards), self._unshuffled)))
+
+    def _settle(self, count):
+        """Makes sure the top count cards of a lazily shuffled deck have been chosen."""
+        cards = self.cards
+        unshuffled = self._unshuffled
+        stop = len(cards) - count
+        randrange = self.rng.randrange
+        touched = self._touched
+        journal = self._journal
+        while unshuffled > stop:
+            chosen = randrange(unshuffled)
+            unshuffled -= 1
+            cards[chosen], cards[unshuffled] = cards[unshuffled], cards[chosen]
+            if touched is not None:
+                touched.append(chosen)
+                touched.append(unshuffled)
+            if journal is not None:
+                journal.append((_UNDO_LAZY_STEP, (chosen, unshuffled)))
+        self._unshuffled = unshuffled
+        if touched is not None and len(touched) > 2 * len(self.initial_cards):
+            # Repeatedly peeking at lazily shuffled decks could make
+            # this grow without bound. Stop keeping track.
+            self._touched = None
+
+    def _finish_shuffle(self):
+        """Puts the whole of a lazily shuffled deck in its random order."""
+        unshuffled = self._unshuffled
+        if unshuffled:
+            self._log_replace()
+            unshuffled_cards = self.cards[:unshuffled]
+            self.rng.shuffle(unshuffled_cards)
+            self.cards[:unshuffled] = unshuffled_cards
+            self._unshuffled = 0
+            self._touched = None
+
+    # Subclasses that store self.cards in something other than a
+    # list override the methods below.
+
+    def _replace_cards(self, cards):
+        """Replaces the deck's cards with the given sequence, bottom card first."""
+        self.cards[:] = cards
+
+    def _pop_top_several(self, count):
+        """Removes the top count cards, returning them in the order they would be dealt."""
+        dealt_cards = self.cards[-count:]
+        del self.cards[-count:]
+        dealt_cards.reverse()
+        return dealt_cards
+
+    def _pop_bottom(self):
+        """Removes and returns the bottom card."""
+        return self.cards.pop(0)
+
+    def _push_bottom(self, card):
+        """Puts a card on the bottom of the deck."""
+        self.cards.insert(0, card)
+
+    def _rotate(self, count):
+        """Moves count cards from the top to the bottom.
+
+        If count is negative, moves cards from the bottom to the top.
+        """
+        if count:
+            self.cards[:] = self.cards[-count:] + self.cards[:-count]
 
     def is_empty(self):
         """Returns True iff the deck has no cards left."""
@@ -139,11 +531,71 @@ class Deck(object):
         """Draws the deck into the given surface at the given location.
 
         Currently, only the top of the deck is drawn, or an empty
-        frame if the deck is empty.
+        frame if the deck is empty. The surface may also be a
+        sprite.SpriteBatch.
         """
         if self.is_empty():
+            # pygame is only imported when needed; see card.py.
+            import pygame
+            from cardkit import sprite
             rect = card.default_card_drawing_rect().move(location)
-            pygame.draw.rect(surface, (50, 50, 120), rect, 1)
+            pygame.draw.rect(sprite.surface_for_drawing(surface), (50, 50, 120), rect, 1)
         else:
             top_card = self.peek()
             top_card.draw(surface, location)
+
+
+class DequeDeck(Deck):
+    """A Deck that is fast to change at both the top and the bottom.
+
+    A DequeDeck works just like a Deck, except that its cards are
+    stored in a collections.deque. Adding cards to and dealing cards
+    from either end of the deck take constant time, and cutting the
+    deck takes time proportional to the size of the cut, no matter
+    how large the deck gets. This makes it a good fit for piles that
+    cards are continually cycled under, like the decks in War or a
+    discard pile that gets recycled into play.
+
+    On the other hand, looking at cards in the middle of a deque is
+    slow, so shuffling copies the cards out into a list and back, and
+    DequeDecks are never shuffled lazily.
+
+    Attributes:
+      cards (collections.deque): The current sequence of cards in the
+        deck. As with a Deck, the topmost card is the _last_ element.
+    """
+    def __init__(self, initial_cards=None, rng=None):
+        """Creates a DequeDeck. See Deck for the arguments."""
+        super(DequeDeck, self).__init__(initial_cards, rng)
+        self.cards = collections.deque(self.initial_cards)
+
+    def shuffle(self, lazy=False):
+        """Shuffles the current contents of the deck.
+
+        Note that this does _not_ affect the initial sequence of cards.
+
+        Arguments:
+          lazy (bool): Ignored; DequeDecks are always shuffled right away.
+        """
+        self._log_replace()
+        self._touched = None
+        shuffled_cards = list(self.cards)
+        self.rng.shuffle(shuffled_cards)
+        self._replace_cards(shuffled_cards)
+
+    def _replace_cards(self, cards):
+        self.cards.clear()
+        self.cards.extend(cards)
+
+    def _pop_top_several(self, count):
+        pop = self.cards.pop
+        return [pop() for i in range(count)]
+
+    def _pop_bottom(self):
+        return self.cards.popleft()
+
+    def _push_bottom(self, card):
+        self.cards.appendleft(card)
+
+    def _rotate(self, count):
+        self.cards.rotate(count)
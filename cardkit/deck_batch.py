@@ -0,0 +1,150 @@
+"""Shuffling and dealing many decks at once, for simulations.
+
+Shuffling and dealing a Deck one Card at a time is fine for a game,
+but far too slow when a simulation needs millions of deals. A
+DeckBatch holds many decks as rows of a NumPy array of card ids (see
+card_constants.CARD_IDS) and shuffles and deals all of them at once.
+
+This module requires NumPy, which the rest of cardkit does not need.
+"""
+import numpy
+
+from cardkit import card
+from cardkit import deck
+
+
+def make_np_rng(rng=None):
+    """Returns a NumPy random Generator.
+
+    This is the NumPy counterpart of rng.make_rng(), which returns a
+    random.Random for use with a Deck.
+
+    Arguments:
+      rng (numpy.random.Generator, int, or None): An existing
+        generator (returned as-is), a seed for a new one, or None to
+        seed a new generator from the operating system.
+    """
+    if isinstance(rng, numpy.random.Generator):
+        return rng
+    return numpy.random.default_rng(rng)
+
+
+def cards_for_ids(card_ids, face=None):
+    """Converts a sequence (or 1-D array) of card ids to a list of Cards.
+
+    Arguments:
+      card_ids (iterable): The card ids to convert.
+      face (string or None): Whether the cards should be face 'up' or
+        'down'. By default, they will be face down, as in a Deck.
+    """
+    if face is None:
+        face = deck.DEFAULT_CARD_SET[0].face
+    return [card.card_for_id(int(card_id), face) for card_id in card_ids]
+
+
+class DeckBatch(object):
+    """A batch of decks that are shuffled and dealt together.
+
+    Each deck is a row of card ids. Unlike a Deck, the topmost card
+    comes _first_ in each row, so that dealing can hand back a
+    contiguous slice of the rows. Each operation applies to every deck
+    in the batch: shuffle() shuffles each deck independently, and
+    deal_several() deals the same number of cards from every deck.
+
+    len(batch) is the number of cards left in each deck, just as
+    len(deck) is for a single Deck.
+
+    Attributes:
+      size (int): The number of decks in the batch.
+      initial_ids (numpy.ndarray): The card ids each deck starts out
+        with, topmost card first, as a 1-D uint8 array.
+      cards (numpy.ndarray): A (size x len(initial_ids)) uint8 array.
+        Row i holds the cards of deck i, topmost card first. The first
+        `dealt` columns hold cards that have already been dealt.
+      dealt (int): How many cards have been dealt from each deck.
+      rng (numpy.random.Generator): The random number generator used
+        for shuffling.
+    """
+    def __init__(self, size, initial_cards=None, rng=None):
+        """Creates a DeckBatch.
+
+        Arguments:
+          size (int): The number of decks in the batch.
+          initial_cards (list or None): The initial sequence of cards
+            for each deck, topmost card first, given as Cards or card
+            ids. If None, the standard deck of 52 cards used by Deck
+            will be used.
+          rng (numpy.random.Generator, int, or None): The random
+            number generator to shuffle with, or a seed for one.
+        """
+        if initial_cards is None:
+            initial_cards = deck.DEFAULT_CARD_SET
+        self.size = size
+        self.initial_ids = numpy.array(
+            [c.card_id if isinstance(c, card.Card) else c for c in initial_cards],
+            dtype=numpy.uint8)
+        self.cards = numpy.empty((size, len(self.initial_ids)), dtype=numpy.uint8)
+        self.rng = make_np_rng(rng)
+        self.reset()
+
+    def __len__(self):
+        return self.cards.shape[1] - self.dealt
+
+    def is_empty(self):
+        """Returns True iff the decks have no cards left."""
+        return len(self) == 0
+
+    def reset(self):
+        """Resets every deck to its initial sequence of cards.
+
+        This reuses the existing array, so any views previously
+        returned by deal() or deal_several() will change.
+        """
+        self.cards[:] = self.initial_ids
+        self.dealt = 0
+
+    def shuffle(self):
+        """Shuffles the cards remaining in each deck, independently."""
+        remaining = self.cards[:, self.dealt:]
+        self.rng.permuted(remaining, axis=1, out=remaining)
+
+    def deal(self):
+        """Deals the top card from every deck.
+
+        Returns (numpy.ndarray): a view of the dealt card ids, one per
+          deck.
+        Raises: DeckError if the decks are empty.
+        """
+        if self.is_empty():
+            raise deck.DeckError('Deck is empty')
+        dealt_ids = self.cards[:, self.dealt]
+        self.dealt += 1
+        return dealt_ids
+
+    def deal_several(self, count):
+        """Deals several cards in a row from the top of every deck.
+
+        Arguments:
+          count (integer): The number of cards to deal from each deck.
+        Returns (numpy.ndarray): a (size x count) view of the dealt
+          card ids. Row i holds the cards dealt from deck i, in the
+          order they were dealt.
+        Raises: DeckError if the decks don't have enough cards left, or
+          ValueError if count is negative.
+        """
+        if count < 0:
+            raise ValueError('Cannot deal a negative number of cards: %d' % count)
+        if count > len(self):
+            raise deck.DeckError(
+                'Cannot deal %d cards; only %d left' % (count, len(self)))
+        dealt_ids = self.cards[:, self.dealt:self.dealt + count]
+        self.dealt += count
+        return dealt_ids
+
+    def to_deck(self, index):
+        """Returns a new Deck holding the remaining cards of one deck.
+
+        Arguments:
+          index (int): Which deck in the batch to copy.
+        """
+        return deck.Deck(cards_for_ids(self.cards[index, self.dealt:]))
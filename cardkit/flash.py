@@ -1,9 +1,14 @@
 import pygame
 
+from cardkit import fonts
+
 
 BLACK = (0,0,0)
 TRANSPARENT = (0, 0, 0, 0)
 
+# The default number of levels of fading a FlashMessage shows.
+FADE_LEVELS = 32
+
 
 class FlashMessage(object):
     """A text message that displays and then fades after a certain duration.
@@ -18,8 +23,14 @@ class FlashMessage(object):
         the text.
       font (pygame.Font or None): The font to use for the message. If
         None, a default font will be used.
+      clock (callable): A function returning the current game time in
+        milliseconds. See cardkit.clock.
+      fade_levels (integer): The number of different levels of
+        fading to show. Each level that gets shown is kept as an image
+        of the whole message, so fading only ever takes one blit.
     """
-    def __init__(self, message, duration, fade_duration=2000, color=BLACK, font=None):
+    def __init__(self, message, duration, fade_duration=2000, color=BLACK, font=None, clock=None,
+                 fade_levels=FADE_LEVELS):
         self.color = color
 
         # Pygame's fonts can't render newlines; we have to actually
@@ -27,6 +38,9 @@ class FlashMessage(object):
         # a list of text lines we want to display.
         self.messages = message.split('\n')
         self.rendered_messages = None # The images of the rendered lines
+        self.fade_levels = fade_levels
+        self._fade_images = None # The whole message at each fade level, once needed
+        self._rendered_key = None # What the images above were rendered from
         self.duration = duration
         self.fade_duration = fade_duration
         self.should_show = False # Are we showing this message now?
@@ -34,9 +48,10 @@ class FlashMessage(object):
         self.show_fade_time = None # The game time we should start to fade
         self.show_end_time = None # The game time we should stop showing
         if font is None:
-            self.font = pygame.font.SysFont("Arial", 20, False, False)
+            self.font = fonts.get_font("Arial", 20, False, False)
         else:
             self.font = font
+        self.clock = pygame.time.get_ticks if clock is None else clock
 
     def show(self):
         """Mark the flash message to be displayed in the next frame."""
@@ -45,22 +60,75 @@ class FlashMessage(object):
         # main loop yet and won't for a while.
         self.should_show = True
 
-        # At this point, it should be safe to pre-calculate these images.
-        self.rendered_messages = [self.font.render(message, True, self.color) for message in self.messages]
+        # At this point, it should be safe to pre-calculate these
+        # images. We only need to do that once, unless the message
+        # has been changed since.
+        key = (tuple(self.messages), self.color, self.font, self.fade_levels)
+        if key == self._rendered_key:
+            return
+        self.rendered_messages = [
+            fonts.render_text(self.font, message, self.color) for message in self.messages]
+
+        # Put all the lines together in one image, so the whole
+        # message can be drawn with one blit.
+        size = self.drawing_rect().size
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        image.fill(TRANSPARENT)
+        y = 0
+        for message in self.rendered_messages:
+            image.blit(message, (0, y))
+            y += self.font.get_linesize()
+        self._fade_images = [image] + [None] * (self.fade_levels - 1)
+        self._rendered_key = key
+
+    def next_frame_delay(self):
+        """Returns how long until the message will look different.
 
-    def _draw_message(self, message, surface, location, fade_amount):
-        """Draws one line of text at a location on the surface."""
-        if fade_amount == 0:
-            # No fade required; we can save some work!
-            surface.blit(message, location)
-        else:
+        Returns (int or None): the time in milliseconds until the
+          message next needs to be drawn (0 if it's fading, or is yet
+          to be drawn for the first time), or None if it isn't showing.
+        """
+        if not self.should_show:
+            return None
+        if self.show_start_time is None:
+            return 0
+        return max(0, self.show_fade_time - self.clock())
+
+    def drawing_rect(self):
+        """Returns the size of the message when drawn, as a pygame.Rect.
+
+        The top-left corner of the rect will be (0, 0). The message
+        must have been shown first.
+        """
+        if self.rendered_messages is None:
+            raise RuntimeError('The message must be shown before it has a size')
+        width = max(message.get_width() for message in self.rendered_messages)
+        height = (self.font.get_linesize() * (len(self.rendered_messages) - 1)
+                  + self.rendered_messages[-1].get_height())
+        return pygame.Rect(0, 0, width, height)
+
+    def _image_for(self, fade_amount):
+        """Returns the image of the whole message, faded by some amount.
+
+        Faded images are only made the first time each fade level is
+        needed, and then kept, so that drawing a fading message
+        doesn't allocate anything.
+
+        Arguments:
+          fade_amount (float): A number between 0 and 1 representing
+            how much to fade the message. 0 shows the text at full
+            strength; 1 makes the text completely invisible.
+        """
+        level = min(int(fade_amount * self.fade_levels), self.fade_levels - 1)
+        image = self._fade_images[level]
+        if image is None:
             # Here we show a technique for doing basic math on pixel
             # values without having to write a relatively expensive
             # Python loop.
             #
-            # Start with an RGBA value which will be subtracted from
-            # each pixel in the fading message (red from red, blue
-            # from blue, and so forth).
+            # We fill a copy of the message with an RGBA value, in a
+            # special drawing mode that subtracts that value from
+            # each pixel (red from red, blue from blue, and so forth).
             #
             # Note that the alpha channel (the fourth channel)
             # controls transparency: 0 is totally transparent, 255 is
@@ -69,48 +137,11 @@ class FlashMessage(object):
             # Therefore, subtracting 255 alpha (we will automatically
             # clip at 0) will turn any pixel transparent, and
             # subtracting 0 won't affect transparency at all.
-            fade_rgba = (0, 0, 0, int(fade_amount * 255))
-
-            # Create a surface that has this special RGBA value on
-            # every pixel. We'll call it an overlay since we will
-            # draw it on top of the text.
-            fade_overlay = pygame.Surface(message.get_size(), pygame.SRCALPHA)
-            fade_overlay.fill(fade_rgba)
-
-            # This is the image that will be drawn to the surface.
-            fading_message = pygame.Surface(message.get_size(), pygame.SRCALPHA)
-
-            # Now, we draw the fading text in three layers:
-            # 1. Start with a transparent background.
-            fading_message.fill(TRANSPARENT)
-
-            # 2. Draw the (possibly antialiased) text.
-            fading_message.blit(message, (0, 0))
-
-            # 3. Draw the fade overlay on top, but in a special
-            # drawing mode that subtracts the overlay's values
-            # (including its alpha values!) from the pixels
-            # underneath.
-            fading_message.blit(
-                fade_overlay, (0, 0),
-                special_flags=pygame.BLEND_RGBA_SUB)
-
-            # Finally, draw the faded text.
-            surface.blit(fading_message, location)
-
-    def _draw_messages(self, surface, location, fade_amount=0):
-        """Draws the entire flash message at a location on the surface.
-
-        Arguments:
-          surface (pygame.Surface): See draw().
-          location (tuple): See draw().
-          fade_amount (float): A number between 0 and 1 representing
-            how much to fade the line of text. 0 shows the text at
-            full strength; 1 makes the text completely invisible.
-        """
-        for message in self.rendered_messages:
-            self._draw_message(message, surface, location, fade_amount)
-            location = (location[0], location[1] + self.font.get_linesize())
+            fade_rgba = (0, 0, 0, int(255 * level / self.fade_levels))
+            image = self._fade_images[0].copy()
+            image.fill(fade_rgba, special_flags=pygame.BLEND_RGBA_SUB)
+            self._fade_images[level] = image
+        return image
 
     def draw(self, surface, location):
         """Draws the flash message at a location on the surface.
@@ -124,8 +155,8 @@ class FlashMessage(object):
         if not self.should_show:
             return
 
-        now = pygame.time.get_ticks()
-        if not self.show_start_time:
+        now = self.clock()
+        if self.show_start_time is None:
             # We start keeping track of time on the first frame that
             # we start showing the text.
             self.show_start_time = now
@@ -133,14 +164,14 @@ class FlashMessage(object):
             self.show_end_time = self.show_fade_time + self.fade_duration
 
         if now < self.show_fade_time:
-            self._draw_messages(surface, location)
+            surface.blit(self._fade_images[0], location)
         elif now < self.show_end_time:
             # Fade amount should be a ratio of how much we want to
             # fade.  0 should be no fading; 1.0 should be totally
             # faded away.  We will gradually and linearly ramp up
             # from 0 to 1 over the fade duration.
             fade_amount = float(now - self.show_fade_time) / (self.show_end_time - self.show_fade_time)
-            self._draw_messages(surface, location, fade_amount)
+            surface.blit(self._image_for(fade_amount), location)
         else:
             self.should_show = False
             self.show_start_time = None
@@ -0,0 +1,159 @@
+"""Shared fonts, and a cache of rendered text.
+
+Loading a system font with pygame.font.SysFont() is slow (the first
+call has to scan all the fonts installed on the system), and so is
+rendering text. This module keeps one copy of each font that is asked
+for, and keeps recently rendered text around, so that games can ask
+for fonts and text whenever they need them without worrying about
+the cost.
+
+Note that rendered text is shared: don't draw on a surface returned
+by render_text(), or everyone else asking for the same text will get
+your changes too.
+
+Fonts and rendered text can't be used once pygame has been shut down,
+so both are forgotten when pygame.quit() is called, and loaded afresh
+if pygame is started up again.
+"""
+import collections
+
+import pygame
+
+
+# Fonts loaded so far, keyed by (name, size, bold, italic).
+_FONTS = {}
+
+# Whether _forget_everything() will be called when pygame quits.
+# pygame forgets its quit functions once it has called them, so this
+# has to be done again each time pygame is started up.
+_quit_hook_registered = False
+
+# The default limit on the memory used by a TextCache, in bytes.
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+
+def get_font(name, size, bold=False, italic=False):
+    """Returns a system font, loading it if it hasn't been already.
+
+    The arguments are the same as for pygame.font.SysFont(). pygame's
+    font module must have been initialized.
+    """
+    key = (name, size, bool(bold), bool(italic))
+    font = _FONTS.get(key)
+    if font is None:
+        _register_quit_hook()
+        font = _FONTS[key] = pygame.font.SysFont(name, size, bold, italic)
+    return font
+
+
+def clear_fonts():
+    """Forgets all the fonts loaded so far.
+
+    This happens automatically when pygame quits.
+    """
+    _FONTS.clear()
+
+
+def _register_quit_hook():
+    """Makes sure the fonts and text are forgotten when pygame quits."""
+    global _quit_hook_registered
+    if not _quit_hook_registered:
+        pygame.register_quit(_forget_everything)
+        _quit_hook_registered = True
+
+
+def _forget_everything():
+    """Drops the fonts and text that are no good once pygame has quit."""
+    global _quit_hook_registered
+    _quit_hook_registered = False
+    clear_fonts()
+    TEXT_CACHE.clear()
+
+
+def _surface_bytes(surface):
+    """Returns roughly how much memory a surface's pixels take up."""
+    return surface.get_pitch() * surface.get_height()
+
+
+class TextCache(object):
+    """A least-recently-used cache of rendered text.
+
+    Attributes:
+      max_bytes (int): The most memory the cached surfaces may take
+        up. When adding a surface would go over this, the least
+        recently used surfaces are dropped. Surfaces bigger than this
+        are never cached at all.
+      size_bytes (int): The memory the cached surfaces take up now.
+      hits (int): The number of renders answered from the cache.
+      misses (int): The number of renders that had to be done.
+    """
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Maps (font, text, color, antialias, background) to rendered
+        # surfaces, least recently used first.
+        self._surfaces = collections.OrderedDict()
+
+    def __len__(self):
+        """Returns the number of surfaces in the cache."""
+        return len(self._surfaces)
+
+    def render(self, font, text, color, antialias=True, background=None):
+        """Renders text, or returns it from the cache if it was rendered recently.
+
+        The arguments are the same as for pygame.font.Font.render().
+
+        Returns (pygame.Surface): the rendered text. Don't change it!
+        """
+        if background is not None:
+            background = tuple(background)
+        key = (font, text, tuple(color), bool(antialias), background)
+        surface = self._surfaces.pop(key, None)
+        if surface is not None:
+            # Put it back at the most recently used end.
+            self._surfaces[key] = surface
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if background is None:
+            surface = font.render(text, antialias, color)
+        else:
+            surface = font.render(text, antialias, color, background)
+        size = _surface_bytes(surface)
+        if size <= self.max_bytes:
+            while self.size_bytes + size > self.max_bytes:
+                old_key, old_surface = self._surfaces.popitem(last=False)
+                self.size_bytes -= _surface_bytes(old_surface)
+            self._surfaces[key] = surface
+            self.size_bytes += size
+        return surface
+
+    def clear(self):
+        """Empties the cache. The hit and miss counts are kept."""
+        self._surfaces.clear()
+        self.size_bytes = 0
+
+    def stats(self):
+        """Returns a dict describing how well the cache is doing."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._surfaces),
+            'size_bytes': self.size_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+        }
+
+
+# The cache used by render_text().
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, color, antialias=True, background=None):
+    """Renders text using the shared cache. See TextCache.render()."""
+    _register_quit_hook()
+    return TEXT_CACHE.render(font, text, color, antialias, background)
@@ -0,0 +1,209 @@
+"""Per-frame timing statistics, for finding out why a game stutters.
+
+A FrameStats object records how long each phase of the main loop took
+for each of the most recent frames: waiting for the next frame to be
+due, handling events, updating the game's logic, drawing, and
+presenting the finished frame on the screen. From those, it can report
+rolling percentiles, count the frames that went over budget, draw a
+small overlay on the screen, and write a trace file that can be loaded
+into a trace viewer such as chrome://tracing or Perfetto.
+
+See SimpleGame.enable_frame_stats() for the easiest way to use it.
+"""
+import json
+import timeit
+
+import pygame
+
+
+# The phases of a frame, in the order they happen.
+WAIT = 'wait'
+EVENTS = 'events'
+UPDATE = 'update'
+DRAW = 'draw'
+PRESENT = 'present'
+PHASES = (WAIT, EVENTS, UPDATE, DRAW, PRESENT)
+
+# Pseudo-phases, for asking about whole frames. A frame's time is the
+# time from its start to the start of the next frame; its work is
+# that, minus the time spent waiting.
+FRAME = 'frame'
+WORK = 'work'
+
+OVERLAY_COLOR = (255, 255, 0)
+OVERLAY_BACKGROUND = (0, 0, 0)
+
+
+class FrameStats(object):
+    """Records timings for the most recent frames of a game.
+
+    Timings are kept in a ring buffer holding the last `capacity`
+    frames, so memory use stays constant however long the game runs.
+    All times are in milliseconds.
+
+    To record a frame, call begin_frame(), then end_phase() at the end
+    of each phase, then end_frame().
+
+    Attributes:
+      capacity (int): The number of frames to keep timings for.
+      budget (float or None): The most time, in milliseconds, that a
+        frame's work may take. Frames whose work takes longer count
+        as dropped.
+      frame_count (int): The total number of frames recorded.
+      dropped_frames (int): The total number of frames over budget.
+    """
+    def __init__(self, capacity=600, budget=None, timer=timeit.default_timer):
+        """Creates a FrameStats.
+
+        Arguments:
+          capacity (int): The number of frames to keep timings for.
+          budget (float or None): See the budget attribute.
+          timer (callable): A function returning the current time in
+            seconds. The default is the most precise timer available.
+        """
+        self.capacity = capacity
+        self.budget = budget
+        self.frame_count = 0
+        self.dropped_frames = 0
+        self._timer = timer
+        # Ring buffers: when each frame started (in seconds), and how
+        # long each of its phases took (in milliseconds).
+        self._frame_starts = [0.0] * capacity
+        self._phase_times = dict((phase, [0.0] * capacity) for phase in PHASES)
+        self._current_frame = 0
+        self._phase_start = None
+        # The overlay text is only re-rendered every so often.
+        self._overlay = None
+        self._overlay_frame = None
+        self._overlay_font = None
+
+    def begin_frame(self):
+        """Marks the start of a new frame."""
+        now = self._timer()
+        index = self._current_frame = self.frame_count % self.capacity
+        self._frame_starts[index] = now
+        for times in self._phase_times.values():
+            times[index] = 0.0
+        self._phase_start = now
+
+    def end_phase(self, phase):
+        """Marks the end of a phase of the current frame.
+
+        The phase is taken to have started when the previous phase
+        ended, or when the frame began.
+        """
+        now = self._timer()
+        self._phase_times[phase][self._current_frame] += (now - self._phase_start) * 1000.0
+        self._phase_start = now
+
+    def end_frame(self):
+        """Marks the end of the current frame."""
+        index = self._current_frame
+        self.frame_count += 1
+        if self.budget is not None:
+            work = sum(self._phase_times[phase][index] for phase in PHASES if phase != WAIT)
+            if work > self.budget:
+                self.dropped_frames += 1
+
+    def __len__(self):
+        """Returns the number of frames currently held."""
+        return min(self.frame_count, self.capacity)
+
+    def _recent_indices(self):
+        """Returns the ring buffer indices of the frames held, oldest first."""
+        count = len(self)
+        first = self.frame_count - count
+        return [(first + i) % self.capacity for i in range(count)]
+
+    def times(self, phase=FRAME):
+        """Returns the times of the frames held, oldest first.
+
+        Arguments:
+          phase (string): One of PHASES, or FRAME for the whole frame,
+            or WORK for the whole frame apart from waiting.
+        """
+        indices = self._recent_indices()
+        if phase in (FRAME, WORK):
+            phases = [p for p in PHASES if phase == FRAME or p != WAIT]
+            return [sum(self._phase_times[p][i] for p in phases) for i in indices]
+        times = self._phase_times[phase]
+        return [times[i] for i in indices]
+
+    def percentiles(self, phase=FRAME, percents=(50, 95, 99)):
+        """Returns percentiles of the times of the frames held.
+
+        Arguments:
+          phase (string): See times().
+          percents (sequence): The percentiles to compute, from 0 to 100.
+        Returns (list): the percentiles, in milliseconds, in the same
+          order as percents. If no frames are held, they are all 0.
+        """
+        times = sorted(self.times(phase))
+        if not times:
+            return [0.0 for percent in percents]
+        last = len(times) - 1
+        return [times[min(last, int(round(percent / 100.0 * last)))] for percent in percents]
+
+    def recent_dropped_frames(self):
+        """Returns the number of frames held that went over budget."""
+        if self.budget is None:
+            return 0
+        return sum(1 for work in self.times(WORK) if work > self.budget)
+
+    def summary(self):
+        """Returns a short description of recent frame times."""
+        p50, p95, p99 = self.percentiles()
+        return 'frame p50 %.1f  p95 %.1f  p99 %.1f ms  dropped %d/%d' % (
+            p50, p95, p99, self.recent_dropped_frames(), len(self))
+
+    def draw_overlay(self, surface, location=(5, 5), font=None, refresh_interval=15):
+        """Draws a summary of recent frame times on a surface.
+
+        Arguments:
+          surface (pygame.Surface): The surface to draw on.
+          location (tuple): Where to draw the top-left of the overlay.
+          font (pygame.font.Font or None): The font to use. If None, a
+            small default font will be used.
+          refresh_interval (int): How many frames to wait between
+            updates of the overlay's text, since rendering text isn't
+            free either.
+        Returns (pygame.Rect): the region of the surface drawn on.
+        """
+        if (self._overlay is None
+            or self.frame_count - self._overlay_frame >= refresh_interval):
+            if font is None:
+                if self._overlay_font is None:
+                    self._overlay_font = pygame.font.Font(None, 18)
+                font = self._overlay_font
+            self._overlay = font.render(
+                self.summary(), True, OVERLAY_COLOR, OVERLAY_BACKGROUND)
+            self._overlay_frame = self.frame_count
+        return surface.blit(self._overlay, location)
+
+    def trace_events(self):
+        """Returns the frames held as a list of trace events.
+
+        The events are in the Trace Event Format used by
+        chrome://tracing and Perfetto, with times in microseconds.
+        """
+        events = []
+        for index in self._recent_indices():
+            start = self._frame_starts[index] * 1e6
+            for phase in PHASES:
+                duration = self._phase_times[phase][index] * 1000.0
+                events.append({
+                    'name': phase,
+                    'cat': 'frame',
+                    'ph': 'X',
+                    'ts': start,
+                    'dur': duration,
+                    'pid': 1,
+                    'tid': 1,
+                })
+                start += duration
+        return events
+
+    def dump_trace(self, path):
+        """Writes the frames held to a trace file. See trace_events()."""
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,336 @@
+"""Fast poker hand evaluation using lookup tables.
+
+evaluate() ranks a poker hand of 5, 6, or 7 cards (the best five-card
+hand that can be made from them, as in Texas hold 'em), returning its
+strength: a number from 1 (the worst possible hand, 7-5-4-3-2 of
+mixed suits) to 7462 (a royal flush). Hands with equal strength are
+tied. category() tells you what kind of hand a strength is.
+
+Rather than sorting and counting cards, each hand is looked up in two
+tables:
+
+- Whether a hand is a flush depends only on which ranks of the flush
+  suit it holds, which fits in a 13-bit mask; a table of 8192 entries
+  gives the best flush (or straight flush) for every mask.
+- Every other hand depends only on how many cards of each rank it
+  holds. Giving each card a key of 5 ** rank and adding them up gives
+  a unique number for each such combination of ranks, which is looked
+  up in a second table.
+
+The hand's strength is the better of the two. That makes evaluating a
+hand a handful of additions and lookups, and lets evaluate_batch()
+rank whole arrays of hands at once with NumPy.
+
+Building the tables takes about half a second, so they are built the
+first time they are needed and then saved in a cache directory:
+$CARDKIT_CACHE_DIR if that is set, or otherwise cardkit's directory
+in the user's cache directory (usually ~/.cache/cardkit).
+"""
+import itertools
+import json
+import os
+
+from cardkit import card_constants as ck
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Kinds of hands, from worst to best. category() returns one of these.
+HIGH_CARD = 'high card'
+ONE_PAIR = 'one pair'
+TWO_PAIR = 'two pair'
+THREE_OF_A_KIND = 'three of a kind'
+STRAIGHT = 'straight'
+FLUSH = 'flush'
+FULL_HOUSE = 'full house'
+FOUR_OF_A_KIND = 'four of a kind'
+STRAIGHT_FLUSH = 'straight flush'
+CATEGORIES = (
+    HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH,
+    FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH)
+
+# The number of different strengths a hand can have.
+HAND_COUNT = 7462
+
+# Bump this when the tables change, so that old caches are ignored.
+_TABLE_VERSION = 1
+_CACHE_FILENAME = 'hand_eval_v%d.json' % _TABLE_VERSION
+
+_RANK_COUNT = len(ck.RANKS)
+_STANDARD_CARD_COUNT = len(ck.DECK_OF_52)
+
+# For each standard card id: its poker rank (0 for a two up to 12 for
+# an ace), its key for the rank table, and its bit in a rank mask. See
+# card_constants.CARD_IDS for how card ids work.
+_POKER_RANKS = [(card_id // 4 - 1) % _RANK_COUNT for card_id in range(_STANDARD_CARD_COUNT)]
+_RANK_KEYS = [5 ** rank for rank in _POKER_RANKS]
+_RANK_BITS = [1 << rank for rank in _POKER_RANKS]
+
+# The tables, once they're loaded; see _get_tables().
+_tables = None
+
+
+class _Tables(object):
+    """The lookup tables.
+
+    Attributes:
+      rank_values (dict): Maps rank keys of hands to their strength,
+        ignoring flushes.
+      flush_values (list): The strength of the best flush that can be
+        made from each 13-bit rank mask, or 0 if there is none.
+      category_starts (list): The lowest strength of each category.
+    """
+    def __init__(self, rank_keys, rank_values, flush_values, category_starts):
+        self.rank_values = dict(zip(rank_keys, rank_values))
+        self.flush_values = flush_values
+        self.category_starts = category_starts
+        # NumPy versions of the tables, for evaluate_batch().
+        self.sorted_keys = None
+        self.sorted_values = None
+        self.flush_array = None
+
+
+def cache_dir():
+    """Returns the directory the lookup tables are cached in."""
+    path = os.environ.get('CARDKIT_CACHE_DIR')
+    if path:
+        return path
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'cardkit')
+
+
+def evaluate(cards):
+    """Returns the strength of a poker hand.
+
+    Arguments:
+      cards (sequence): 5, 6, or 7 distinct Cards. Jokers aren't allowed.
+    Returns (int): the strength of the best five-card hand that can be
+      made from the cards, from 1 to HAND_COUNT; higher is better.
+    Raises: ValueError if the cards can't make a poker hand.
+    """
+    return evaluate_ids([c.card_id for c in cards])
+
+
+def evaluate_ids(card_ids):
+    """Like evaluate(), but takes card ids instead of Cards."""
+    if not 5 <= len(card_ids) <= 7:
+        raise ValueError('A hand must have 5 to 7 cards, not %d' % len(card_ids))
+    tables = _get_tables()
+    key = 0
+    masks = [0, 0, 0, 0]
+    seen = 0
+    try:
+        for card_id in card_ids:
+            if card_id < 0:
+                raise IndexError
+            key += _RANK_KEYS[card_id]
+            masks[card_id & 3] |= _RANK_BITS[card_id]
+            # int(), since card_id may be a small NumPy integer (from a
+            # DeckBatch, say), which would overflow.
+            seen |= 1 << int(card_id)
+    except IndexError:
+        raise ValueError('Not a standard card id: %r' % (card_id,))
+    if bin(seen).count('1') != len(card_ids):
+        raise ValueError('Duplicate cards in hand: %r' % (list(card_ids),))
+    value = tables.rank_values[key]
+    flush_values = tables.flush_values
+    for mask in masks:
+        flush_value = flush_values[mask]
+        if flush_value > value:
+            value = flush_value
+    return value
+
+
+def evaluate_batch(card_ids):
+    """Returns the strengths of many poker hands at once. Requires NumPy.
+
+    Arguments:
+      card_ids (array-like): An array of card ids with one row per
+        hand; every hand must have the same number of cards (5 to 7).
+    Returns (numpy.ndarray): the strength of each hand.
+    Raises: ValueError if the cards can't make poker hands.
+    """
+    if numpy is None:
+        raise RuntimeError('evaluate_batch() requires NumPy')
+    ids = numpy.asarray(card_ids, dtype=numpy.intp)
+    if ids.ndim != 2 or not 5 <= ids.shape[1] <= 7:
+        raise ValueError('Expected an array of hands of 5 to 7 cards, not %r' % (ids.shape,))
+    if ids.size and (ids.min() < 0 or ids.max() >= _STANDARD_CARD_COUNT):
+        raise ValueError('Hands may only hold standard card ids')
+    ordered = numpy.sort(ids, axis=1)
+    if (ordered[:, 1:] == ordered[:, :-1]).any():
+        raise ValueError('Hands may not hold duplicate cards')
+    tables = _get_tables()
+    if tables.sorted_keys is None:
+        keys = sorted(tables.rank_values)
+        tables.sorted_keys = numpy.array(keys, dtype=numpy.int64)
+        tables.sorted_values = numpy.array(
+            [tables.rank_values[key] for key in keys], dtype=numpy.int32)
+        tables.flush_array = numpy.array(tables.flush_values, dtype=numpy.int32)
+
+    rank_keys = numpy.array(_RANK_KEYS, dtype=numpy.int64)
+    rank_bits = numpy.array(_RANK_BITS, dtype=numpy.int64)
+    keys = rank_keys[ids].sum(axis=1)
+    values = tables.sorted_values[numpy.searchsorted(tables.sorted_keys, keys)]
+    bits = rank_bits[ids]
+    suits = ids & 3
+    for suit in range(4):
+        masks = numpy.bitwise_or.reduce(numpy.where(suits == suit, bits, 0), axis=1)
+        numpy.maximum(values, tables.flush_array[masks], out=values)
+    return values
+
+
+def category(strength):
+    """Returns the kind of hand (one of CATEGORIES) a strength is."""
+    if not 1 <= strength <= HAND_COUNT:
+        raise ValueError('Not a hand strength: %r' % (strength,))
+    starts = _get_tables().category_starts
+    index = len(starts) - 1
+    while strength < starts[index]:
+        index -= 1
+    return CATEGORIES[index]
+
+
+def _get_tables():
+    """Returns the lookup tables, loading or building them if need be."""
+    global _tables
+    if _tables is None:
+        data = _load_cached_tables()
+        if data is None:
+            data = _build_tables()
+            _save_cached_tables(data)
+        _tables = _Tables(data['rank_keys'], data['rank_values'],
+                          data['flush_values'], data['category_starts'])
+    return _tables
+
+
+def _load_cached_tables():
+    """Returns the tables saved in the cache, or None if there aren't any."""
+    path = os.path.join(cache_dir(), _CACHE_FILENAME)
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if data.get('version') != _TABLE_VERSION:
+        return None
+    return data
+
+
+def _save_cached_tables(data):
+    """Saves the tables to the cache, if we can."""
+    directory = cache_dir()
+    path = os.path.join(directory, _CACHE_FILENAME)
+    temp_path = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(temp_path, 'w') as f:
+            json.dump(data, f)
+        # Renaming is atomic, so other processes never see a
+        # half-written cache.
+        os.rename(temp_path, path)
+    except (IOError, OSError):
+        # Not being able to cache the tables just makes the next
+        # program to use them slower.
+        try:
+            os.remove(temp_path)
+        except (IOError, OSError):
+            pass
+
+
+def _five_card_order(ranks, flush):
+    """Returns a tuple that sorts five-card hands from worst to best.
+
+    Arguments:
+      ranks (sequence): The poker ranks of the five cards.
+      flush (bool): Whether the cards are all the same suit.
+    """
+    counts = {}
+    for rank in ranks:
+        counts[rank] = counts.get(rank, 0) + 1
+    # Ranks by how many of them there are, then by how high they are.
+    groups = sorted(((count, rank) for rank, count in counts.items()), reverse=True)
+    shape = tuple(count for count, rank in groups)
+    ordered = tuple(rank for count, rank in groups)
+
+    straight_high = None
+    if len(counts) == 5:
+        if ordered[0] - ordered[4] == 4:
+            straight_high = ordered[0]
+        elif ordered == (12, 3, 2, 1, 0):
+            # A five-high straight, with the ace playing low.
+            straight_high = 3
+
+    if straight_high is not None:
+        return (CATEGORIES.index(STRAIGHT_FLUSH if flush else STRAIGHT), straight_high)
+    if flush:
+        return (CATEGORIES.index(FLUSH),) + ordered
+    kind = {
+        (4, 1): FOUR_OF_A_KIND,
+        (3, 2): FULL_HOUSE,
+        (3, 1, 1): THREE_OF_A_KIND,
+        (2, 2, 1): TWO_PAIR,
+        (2, 1, 1, 1): ONE_PAIR,
+    }.get(shape, HIGH_CARD)
+    return (CATEGORIES.index(kind),) + ordered
+
+
+def _rank_multisets(size):
+    """Yields each way of choosing size ranks with at most four of each."""
+    for ranks in itertools.combinations_with_replacement(range(_RANK_COUNT), size):
+        if all(ranks[i] != ranks[i + 4] for i in range(size - 4)):
+            yield ranks
+
+
+def _build_tables():
+    """Builds the lookup tables from scratch."""
+    # Put every distinct five-card hand in order, to find the strength
+    # of each.
+    hands = []
+    for ranks in _rank_multisets(5):
+        hands.append((_five_card_order(ranks, False), ranks, False))
+    for ranks in itertools.combinations(range(_RANK_COUNT), 5):
+        hands.append((_five_card_order(ranks, True), ranks, True))
+    hands.sort()
+
+    rank_values = {}
+    flush_values = [0] * (1 << _RANK_COUNT)
+    category_starts = [None] * len(CATEGORIES)
+    strength = 0
+    previous_order = None
+    for order, ranks, flush in hands:
+        if order != previous_order:
+            strength += 1
+            previous_order = order
+        if category_starts[order[0]] is None:
+            category_starts[order[0]] = strength
+        if flush:
+            flush_values[sum(1 << rank for rank in ranks)] = strength
+        else:
+            rank_values[sum(5 ** rank for rank in ranks)] = strength
+    assert strength == HAND_COUNT
+
+    # The best hand from six or seven cards is the best hand from the
+    # cards left after taking one of them away.
+    for size in (6, 7):
+        for ranks in _rank_multisets(size):
+            key = sum(5 ** rank for rank in ranks)
+            rank_values[key] = max(rank_values[key - 5 ** rank] for rank in set(ranks))
+    for mask in range(len(flush_values)):
+        if 6 <= bin(mask).count('1') <= 7:
+            flush_values[mask] = max(
+                flush_values[mask & ~(1 << rank)]
+                for rank in range(_RANK_COUNT) if mask & (1 << rank))
+
+    keys = sorted(rank_values)
+    return {
+        'version': _TABLE_VERSION,
+        'rank_keys': keys,
+        'rank_values': [rank_values[key] for key in keys],
+        'flush_values': flush_values,
+        'category_starts': category_starts,
+    }
@@ -0,0 +1,27 @@
+"""Helpers for spreading work across a multiprocessing pool."""
+import collections
+
+
+def imap_bounded(pool, func, tasks, limit):
+    """Like pool.imap(), but only reads up to limit tasks ahead.
+
+    Pool.imap() reads and queues up every task as soon as it's called,
+    which takes memory for each one and keeps the workers busy with
+    them even if the caller stops reading results early. This hands
+    out tasks only as results are read.
+
+    Arguments:
+      pool (multiprocessing.Pool): The pool to run the tasks in.
+      func (callable): The function to call on each task. It must be
+        picklable.
+      tasks (iterable): The tasks. It is read lazily.
+      limit (int): The most tasks to have handed out at once.
+    Yields: func(task) for each task, in the same order as the tasks.
+    """
+    pending = collections.deque()
+    for task in tasks:
+        pending.append(pool.apply_async(func, (task,)))
+        if len(pending) >= limit:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
@@ -0,0 +1,203 @@
+"""Piles and hands: collections of cards that can be looked up by card.
+
+A Deck is good at dealing from the top, but finding or removing a
+particular card means going through the whole list, and removing one
+from the middle shifts every card above it. Hands and piles in play,
+like a player's hand or a tableau column, are used the other way
+round: "is the queen of hearts in this hand?", "play the seven of
+clubs". A Pile answers those in constant time, while keeping its cards
+in the order they were added, so that it always draws the same way.
+"""
+from cardkit import card
+from cardkit import deck
+
+
+# Marks a slot whose card has been removed.
+_EMPTY = object()
+
+# Compact a pile once it has at least this many empty slots, and more
+# empty slots than cards.
+_MIN_EMPTY_TO_COMPACT = 16
+
+# The default offset between cards in a Hand, in pixels.
+HAND_FAN_OFFSET = (20, 0)
+
+
+class Pile(object):
+    """An ordered collection of Cards with fast lookup and removal.
+
+    Cards are added to the top of the pile, and iterating over the pile
+    goes from the bottom card to the top one. Removing a card leaves
+    the others in the same order. len(pile) is the number of cards in
+    it, and `card in pile` is a constant-time check. As with a list,
+    cards are compared including their face, and a pile may hold more
+    than one copy of a card.
+
+    Attributes:
+      fan_offset (tuple): The (x, y) offset, in pixels, between each
+        card and the one below it when the pile is drawn. If (0, 0),
+        only the top card is drawn, as for a Deck.
+    """
+    def __init__(self, initial_cards=(), fan_offset=(0, 0)):
+        """Creates a Pile.
+
+        Arguments:
+          initial_cards (sequence): The cards to start with, bottom first.
+          fan_offset (tuple): See the fan_offset attribute.
+        """
+        self.fan_offset = tuple(fan_offset)
+        self.clear()
+        for c in initial_cards:
+            self.add(c)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, c):
+        return c in self._positions
+
+    def __iter__(self):
+        for c in self._slots:
+            if c is not _EMPTY:
+                yield c
+
+    def clear(self):
+        """Removes all the cards from the pile."""
+        # The cards, bottom first, with _EMPTY in the slots of cards
+        # that have been removed. The top slot is never empty.
+        self._slots = []
+        # Maps each card to the slots holding it, in increasing order.
+        self._positions = {}
+        self._size = 0
+
+    def is_empty(self):
+        """Returns True iff the pile has no cards."""
+        return self._size == 0
+
+    def count(self, c):
+        """Returns the number of copies of a card in the pile."""
+        return len(self._positions.get(c, ()))
+
+    def add(self, c):
+        """Adds a card to the top of the pile."""
+        slots = self._slots
+        self._positions.setdefault(c, []).append(len(slots))
+        slots.append(c)
+        self._size += 1
+
+    def peek(self):
+        """Returns the top card, without removing it.
+
+        Raises: DeckError if the pile is empty.
+        """
+        if not self._size:
+            raise deck.DeckError('Pile is empty')
+        return self._slots[-1]
+
+    def deal(self, face=None):
+        """Removes the top card, and returns it.
+
+        Arguments:
+          face (string or None): See Deck.deal().
+        Raises: DeckError if the pile is empty.
+        """
+        top_card = self.peek()
+        self.remove(top_card)
+        if face is not None:
+            top_card = top_card.with_face(face)
+        return top_card
+
+    def remove(self, c):
+        """Removes a card from the pile.
+
+        If the pile holds more than one copy of the card, the topmost
+        one is removed. This takes constant time, on average.
+
+        Raises: DeckError if the card isn't in the pile.
+        """
+        positions = self._positions.get(c)
+        if positions is None:
+            raise deck.DeckError('%s is not in the pile' % c)
+        slot = positions.pop()
+        if not positions:
+            del self._positions[c]
+        slots = self._slots
+        slots[slot] = _EMPTY
+        self._size -= 1
+        # Keep the top slot filled, so that peek() stays quick.
+        while slots and slots[-1] is _EMPTY:
+            slots.pop()
+        empty_count = len(slots) - self._size
+        if empty_count >= _MIN_EMPTY_TO_COMPACT and empty_count > self._size:
+            self._compact()
+
+    def index(self, c):
+        """Returns the position of a card in the pile, counting from 0 at the bottom.
+
+        If the pile holds more than one copy of the card, returns the
+        position of the bottom one. This takes time proportional to
+        the size of the pile if cards have been removed from below
+        the top since it was last called.
+
+        Raises: DeckError if the card isn't in the pile.
+        """
+        if c not in self._positions:
+            raise deck.DeckError('%s is not in the pile' % c)
+        if len(self._slots) != self._size:
+            self._compact()
+        return self._positions[c][0]
+
+    def _compact(self):
+        """Gets rid of empty slots."""
+        slots = [c for c in self._slots if c is not _EMPTY]
+        positions = {}
+        for index, c in enumerate(slots):
+            positions.setdefault(c, []).append(index)
+        self._slots = slots
+        self._positions = positions
+
+    def drawing_rect(self):
+        """Returns the size of the pile when drawn, as a pygame.Rect.
+
+        The top-left corner of the rect will be (0, 0), which is where
+        the bottom card is drawn, unless the fan offset is negative.
+        """
+        if self.is_empty():
+            return card.default_card_drawing_rect()
+        rect = self.peek().drawing_rect()
+        if self.fan_offset == (0, 0):
+            return rect
+        dx, dy = self.fan_offset
+        spread = self._size - 1
+        return rect.union(rect.move(dx * spread, dy * spread))
+
+    def draw(self, surface, location):
+        """Draws the pile into the given surface at the given location.
+
+        Each card is drawn fan_offset from the one below it, or just
+        the top card is drawn if the pile isn't fanned. An empty pile
+        is drawn as an empty frame, like an empty Deck. The surface
+        may also be a sprite.SpriteBatch.
+        """
+        if self.is_empty():
+            # pygame is only imported when needed; see card.py.
+            import pygame
+            from cardkit import sprite
+            rect = card.default_card_drawing_rect().move(location)
+            pygame.draw.rect(sprite.surface_for_drawing(surface), (50, 50, 120), rect, 1)
+        elif self.fan_offset == (0, 0):
+            self.peek().draw(surface, location)
+        else:
+            x, y = location
+            dx, dy = self.fan_offset
+            for c in self:
+                c.draw(surface, (x, y))
+                x += dx
+                y += dy
+
+
+class Hand(Pile):
+    """A player's hand: a Pile that is fanned out sideways when drawn."""
+    def __init__(self, initial_cards=(), fan_offset=HAND_FAN_OFFSET):
+        """Creates a Hand. See Pile for the arguments."""
+        super(Hand, self).__init__(initial_cards, fan_offset)
@@ -0,0 +1,65 @@
+"""Random number generators for shuffling.
+
+Everything in cardkit that shuffles cards takes an optional `rng`
+argument: any object with the same methods as random.Random (shuffle,
+random, randrange, and getrandbits). If you don't pass one, the global
+generator in the random module is used, which is convenient but
+shared by everything in the process and hard to reproduce.
+
+Giving each deck (or table, or worker process) its own generator
+avoids that. To split a simulation across several processes while
+keeping it reproducible, derive one independent stream per worker
+from a single seed with spawn() or spawn_seeds(). This works much like
+NumPy's SeedSequence.spawn(): each child seed is a hash of the parent
+seed and the child's index, so the streams don't overlap in practice
+and the same parent seed always produces the same children.
+"""
+import hashlib
+import numbers
+import random
+
+
+def make_rng(seed=None):
+    """Returns a new, independent random number generator.
+
+    Arguments:
+      seed (int, string, or None): The seed for the generator. If
+        None, the generator is seeded from the operating system.
+    """
+    return random.Random(seed)
+
+
+def child_seed(seed, index):
+    """Returns the seed for one child stream of a parent seed.
+
+    Arguments:
+      seed (int or string): The parent seed.
+      index (int): Which child stream to return the seed for.
+    Returns (int): the child seed. Child seeds can themselves be used
+      as parent seeds, to build a tree of streams.
+    Raises: TypeError if the seed isn't an int or a string.
+    """
+    # The seed's type is part of what's hashed, so that 1 and '1'
+    # give different streams.
+    if isinstance(seed, numbers.Integral) and not isinstance(seed, bool):
+        key = 'int:%d/%d' % (seed, index)
+    elif isinstance(seed, (str, type(u''))):
+        key = 'str:%s/%d' % (seed, index)
+    else:
+        raise TypeError('Seeds must be ints or strings, not %r' % (seed,))
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return int(digest, 16)
+
+
+def spawn_seeds(seed, count):
+    """Returns a list of count child seeds derived from a parent seed.
+
+    Seeds are plain integers, so unlike generators they are cheap to
+    send to worker processes.
+    """
+    return [child_seed(seed, index) for index in range(count)]
+
+
+def spawn(seed, count):
+    """Returns a list of count independent generators derived from a parent seed."""
+    return [make_rng(child) for child in spawn_seeds(seed, count)]
@@ -0,0 +1,108 @@
+"""The rules of the demo card game, without any drawing.
+
+The rules of a game decide what state the game is in, which actions
+are allowed in that state, and what happens when an action is taken.
+Keeping them apart from the code that draws the game and handles
+input means they can be played by bots, tested, and simulated in bulk
+without a window, as fast as the cards can be dealt:
+
+    game = rules.DrawAndDiscard(rng=random.Random(42))
+    while not game.is_finished():
+        game.apply(rules.DRAW)
+
+card_game.CardGame draws the game and turns clicks and key presses
+into actions; everything else happens here.
+"""
+from cardkit import card_constants as ck
+from cardkit import deck
+
+
+# The actions a player can take.
+DRAW = 'draw'  # Deal a card from the deck onto the discard pile.
+RESET = 'reset'  # Put all the cards back, and shuffle.
+ACTIONS = (DRAW, RESET)
+
+
+class RulesError(Exception):
+    """Raised when an action is taken that the rules don't allow."""
+    pass
+
+
+class DrawAndDiscard(object):
+    """The state and rules of the draw-and-discard demo game.
+
+    The player draws cards from a shuffled deck, one at a time, onto a
+    discard pile, face up. Once the deck runs out, there's nothing
+    left to do but start again, although the player may start again
+    at any time.
+
+    Attributes:
+      deck (Deck): The cards left to draw.
+      discard_pile (DequeDeck): The cards drawn so far, most recent on top.
+    """
+    def __init__(self, rng=None):
+        """Starts a new game.
+
+        Arguments:
+          rng (random.Random or None): The random number generator to
+            shuffle with. See cardkit.rng.
+        """
+        self.deck = deck.Deck(rng=rng)
+        self.discard_pile = deck.DequeDeck(initial_cards=[])
+        self.deck.shuffle()
+
+    def is_finished(self):
+        """Returns True iff there are no cards left to draw."""
+        return self.deck.is_empty()
+
+    def legal_actions(self):
+        """Returns the actions allowed in the current state, as a list."""
+        if self.deck.is_empty():
+            return [RESET]
+        return [DRAW, RESET]
+
+    def is_legal(self, action):
+        """Returns True iff an action is allowed in the current state."""
+        if action == DRAW:
+            return not self.deck.is_empty()
+        return action == RESET
+
+    def apply(self, action):
+        """Takes an action, changing the state of the game.
+
+        Arguments:
+          action (string): One of ACTIONS.
+        Returns (Card or None): the card drawn, for DRAW; otherwise None.
+        Raises: RulesError if the action isn't allowed right now.
+        """
+        if action == DRAW:
+            # This is the hot path when simulating games, so check
+            # legality inline rather than through is_legal().
+            if self.deck.is_empty():
+                raise RulesError('Cannot %s now' % action)
+            c = self.deck.deal(face=ck.FACE_UP)
+            self.discard_pile.add(c)
+            return c
+        if action != RESET:
+            raise RulesError('Cannot %s now' % action)
+        self.deck.reset()
+        self.discard_pile.reset()
+        self.deck.shuffle()
+        return None
+
+    def snapshot(self):
+        """Returns a token that can be used to roll the game back to its current state.
+
+        This is cheap, so bots can use it to try out moves. See
+        Deck.snapshot().
+        """
+        return (self.deck.snapshot(), self.discard_pile.snapshot())
+
+    def restore(self, token):
+        """Rolls the game back to the state it was in when a snapshot was taken.
+
+        Raises: DeckError if the snapshot is no longer valid.
+        """
+        deck_token, discard_pile_token = token
+        self.deck.restore(deck_token)
+        self.discard_pile.restore(discard_pile_token)
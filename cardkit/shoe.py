@@ -0,0 +1,202 @@
+"""A multi-deck shoe, like those used for blackjack and baccarat.
+
+Casino games deal from a shoe holding several decks shuffled
+together. Building a Deck of hundreds of Card objects and shuffling
+it is wasteful, since all we really need to know is how many copies
+of each card are left. A Shoe keeps just those counts, and deals by
+picking one of the remaining cards at random.
+"""
+import random
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import deck
+
+
+class Shoe(object):
+    """A shoe of several standard 52-card decks, shuffled together.
+
+    A shoe is always shuffled: each card dealt is chosen at random from
+    the cards that remain, so dealing from a shoe gives exactly the
+    same odds as dealing from a shuffled Deck of the same cards. Apart
+    from that, a Shoe can be dealt from just like a Deck, and
+    len(shoe) is the number of cards left in it.
+
+    Like a real shoe, a Shoe has a cut card, placed a certain fraction
+    of the way into the shoe (its "penetration"). Once the cut card
+    has been reached, needs_shuffle() returns True, and the game
+    should reshuffle the shoe at the end of the current round.
+
+    Attributes:
+      deck_count (int): The number of decks in the shoe.
+      penetration (float): How far into the shoe the cut card is, as
+        a fraction of the total number of cards.
+      counts (list): The number of copies of each card left in the
+        shoe, indexed by card id (see card_constants.CARD_IDS).
+      face (string): Whether cards are dealt face 'up' or 'down' by
+        default.
+      rng (random.Random or module): The random number generator used
+        to choose cards. See cardkit.rng.
+    """
+    def __init__(self, deck_count=6, penetration=0.75, face=ck.FACE_DOWN, rng=None):
+        """Creates a Shoe.
+
+        Arguments:
+          deck_count (int): The number of decks in the shoe.
+          penetration (float): How far into the shoe to place the cut
+            card, as a fraction between 0 and 1.
+          face (string): Whether cards should be dealt face 'up' or
+            'down' by default. Like a Deck, a shoe deals cards face
+            down unless told otherwise.
+          rng (random.Random or None): The random number generator to
+            choose cards with. If None, the global generator in the
+            random module will be used.
+        """
+        if deck_count < 1:
+            raise ValueError('A shoe needs at least one deck')
+        if not 0 <= penetration <= 1:
+            raise ValueError('Penetration must be between 0 and 1: %s' % penetration)
+        self.deck_count = deck_count
+        self.penetration = penetration
+        self.face = card.Card.validate_face(face)
+        self.rng = random if rng is None else rng
+        self._size = len(ck.DECK_OF_52)
+        # The largest power of two no bigger than the number of
+        # different cards; used when searching the tree below.
+        self._top_bit = 1 << (self._size.bit_length() - 1)
+        # The DeckListeners to tell about changes.
+        self._listeners = []
+        self.reset()
+
+    def __len__(self):
+        return self._remaining
+
+    def reset(self):
+        """Puts all the cards back in the shoe."""
+        size = self._size
+        self.counts = [self.deck_count] * size
+        self._remaining = self.deck_count * size
+        self._cut_card_position = int(self._remaining * self.penetration)
+        # A binary indexed (Fenwick) tree over self.counts, which lets
+        # us find the card at a given position among the remaining
+        # cards, and update counts, in O(log n) time. It is indexed
+        # from 1; entry i holds the sum of the counts of cards
+        # (i - (i & -i)) through (i - 1).
+        self._tree = [0] * (size + 1)
+        for index in range(1, size + 1):
+            self._tree[index] += self.deck_count
+            parent = index + (index & -index)
+            if parent <= size:
+                self._tree[parent] += self._tree[index]
+        # The id of the card chosen by peek(), if it hasn't been dealt yet.
+        self._next_card_id = None
+        for listener in self._listeners:
+            listener.cards_reset(self)
+
+    def add_listener(self, listener):
+        """Starts telling a DeckListener about cards dealt from the shoe.
+
+        See deck.DeckListener. A shoe only ever deals cards and resets.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stops telling a DeckListener about changes to the shoe."""
+        self._listeners.remove(listener)
+
+    def shuffle(self):
+        """Reshuffles the shoe. This is the same as reset()."""
+        self.reset()
+
+    def needs_shuffle(self):
+        """Returns True iff the cut card has been reached."""
+        return self.dealt_count() >= self._cut_card_position
+
+    def dealt_count(self):
+        """Returns the number of cards dealt since the shoe was last shuffled."""
+        return self.deck_count * self._size - self._remaining
+
+    def is_empty(self):
+        """Returns True iff the shoe has no cards left."""
+        return self._remaining == 0
+
+    def peek(self):
+        """Returns the next card to be dealt, without removing it from the shoe."""
+        if self.is_empty():
+            raise deck.DeckError('Shoe is empty')
+        if self._next_card_id is None:
+            self._next_card_id = self._choose()
+        return card.card_for_id(self._next_card_id, self.face)
+
+    def deal(self, face=None):
+        """Deals a card from the shoe, removing it.
+
+        Arguments:
+          face (string or None): if specified, will force the returned
+            Card to be face 'up' or 'down'.  By default, the shoe's
+            face will be used.
+        Returns (Card): the dealt card.
+        Raises: DeckError if the shoe is empty.
+        """
+        if self.is_empty():
+            raise deck.DeckError('Shoe is empty')
+        card_id = self._next_card_id
+        if card_id is None:
+            card_id = self._choose()
+        dealt_card = card.card_for_id(card_id, self.face if face is None else face)
+        self._next_card_id = None
+        self._remove(card_id)
+        for listener in self._listeners:
+            listener.cards_removed(self, [dealt_card])
+        return dealt_card
+
+    def deal_several(self, count, face=None):
+        """Deals several cards in a row from the shoe.
+
+        Arguments:
+          count (integer): The number of cards to deal.
+          face (string or None): if non-None, forces cards to be dealt
+            face 'up' or 'down'.
+        Returns (list): the sequence of Cards dealt, in the order they
+          were dealt.
+        Raises: DeckError if the shoe doesn't have enough cards. In
+          that case, no cards are dealt.
+        """
+        if count > self._remaining:
+            raise deck.DeckError(
+                'Cannot deal %d cards; only %d left' % (count, self._remaining))
+        if face is not None:
+            face = card.Card.validate_face(face)
+        return [self.deal(face) for i in range(count)]
+
+    def deal_hands(self, hand_count, cards_per_hand, face=None):
+        """Deals several hands of cards. See Deck.deal_hands()."""
+        dealt_cards = self.deal_several(hand_count * cards_per_hand, face)
+        return [dealt_cards[i::hand_count] for i in range(hand_count)]
+
+    def _choose(self):
+        """Picks the id of one of the remaining cards at random."""
+        position = self.rng.randrange(self._remaining)
+        # Walk down the tree to find the card at that position.
+        tree = self._tree
+        size = self._size
+        index = 0
+        bit = self._top_bit
+        while bit:
+            next_index = index + bit
+            if next_index <= size and tree[next_index] <= position:
+                index = next_index
+                position -= tree[next_index]
+            bit >>= 1
+        return index
+
+    def _remove(self, card_id):
+        """Takes one copy of a card out of the shoe."""
+        self.counts[card_id] -= 1
+        self._remaining -= 1
+        tree = self._tree
+        size = self._size
+        index = card_id + 1
+        while index <= size:
+            tree[index] -= 1
+            index += index & -index
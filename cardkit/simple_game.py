@@ -4,6 +4,9 @@ import traceback
 
 import pygame
 
+from cardkit import fonts
+from cardkit import frame_stats
+
 
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -14,14 +17,16 @@ DEFAULT_WINDOW_SIZE = (700, 500)
 class DefaultText(object):
     """Displays some centered demo text."""
     def __init__(self):
-        self.font = pygame.font.SysFont("Arial", 36, True, False)
+        self.font = fonts.get_font("Arial", 36, True, False)
         self.text = "Make a game!"
 
     def draw(self, surface):
         """Draws the DefaultText in the center of a surface."""
 
-        # Render the text to a surface (i.e. a bitmap).
-        rendered_text = self.font.render(self.text, True, BLACK)
+        # Render the text to a surface (i.e. a bitmap). The text is
+        # the same every frame, so it's only really rendered once;
+        # after that, it comes from the cache.
+        rendered_text = fonts.render_text(self.font, self.text, BLACK)
 
         # Center the text on the surface:
 
@@ -59,13 +64,57 @@ class SimpleGame(object):
       screen (pygame.Surface): The surface for the main window.
         It is created for you.
       fps (integer): The desired frames per second. Default is 30.
+      frame_stats (FrameStats or None): Timings for recent frames, if
+        enabled with enable_frame_stats().
+      clock (callable): A function returning the real time in
+        milliseconds, which the main loop uses to decide how many
+        logic updates to run. See cardkit.clock.
+      update_rate (integer): The number of logic updates per second
+        of game time. Default is 60.
+      max_frame_time (integer): The most real time, in milliseconds,
+        that a single frame will catch up on. If the game falls
+        further behind than this (say, because the window was being
+        dragged), game time runs slow rather than running a flood of
+        updates.
+      interpolation (float): How far real time has got between the
+        last logic update and the next one, from 0 up to (but not
+        including) 1. draw() can use this to smooth out movement
+        between updates.
+
+    Game logic should go in update(), which runs update_rate times
+    per second of game time no matter how fast frames are drawn, so
+    that it behaves the same on every machine. simulate() runs it
+    without drawing anything, faster than real time.
+
+    By default, the whole screen is redrawn and shown every frame. For
+    games that mostly sit still, enable_dirty_rects() switches to
+    redrawing and showing only the parts of the screen that changed,
+    and enable_idle_mode() switches to only drawing frames at all when
+    something has changed.
     """
-    def __init__(self):
+    def __init__(self, clock=None):
         self.window_title = "Card Game"
         self.dt = None
         self.screen = None
         self._default_text = None
         self.fps = 30
+        self.frame_stats = None
+        self._show_frame_stats = False
+        self._frame_trace_path = None
+        # Dirty-rect mode; see enable_dirty_rects().
+        self._dirty_rects = None
+        self._background = None
+        self._redraw_all = False
+        # Idle mode; see enable_idle_mode().
+        self._idle_mode = False
+        self._needs_redraw = True
+        # Fixed-timestep updates.
+        self.clock = pygame.time.get_ticks if clock is None else clock
+        self.update_rate = 60
+        self.max_frame_time = 250
+        self.interpolation = 0.0
+        self._update_count = 0
+        self._accumulator = 0.0
 
     def make_window(self):
         """Creates the main game window.
@@ -75,6 +124,92 @@ class SimpleGame(object):
         self.screen = pygame.display.set_mode(DEFAULT_WINDOW_SIZE)
         pygame.display.set_caption(self.window_title)
 
+    def enable_frame_stats(self, capacity=600, overlay=False, trace_path=None):
+        """Starts recording how long each part of each frame takes.
+
+        The timings are kept in self.frame_stats. A frame counts as
+        dropped if its work takes longer than the time available for
+        each frame at self.fps.
+
+        Arguments:
+          capacity (int): The number of recent frames to keep timings for.
+          overlay (bool): Whether to draw a summary of frame times on
+            top of each frame.
+          trace_path (string or None): If given, a trace of the most
+            recent frames is written to this file when the main loop
+            ends. See FrameStats.dump_trace().
+        """
+        self.frame_stats = frame_stats.FrameStats(capacity, budget=1000.0 / self.fps)
+        self._show_frame_stats = overlay
+        self._frame_trace_path = trace_path
+
+    def enable_dirty_rects(self):
+        """Switches to redrawing only the parts of the screen that change.
+
+        In this mode, the game's draw() should report the regions of
+        the screen that have changed with mark_dirty(), and then call
+        repaint_dirty() to repaint just those regions. Then present()
+        copies just those regions to the display, which is much
+        cheaper than flipping the whole screen when little has
+        changed. The background is drawn once, by draw_background(),
+        and kept to repaint from.
+        """
+        self._dirty_rects = []
+        self._background = None
+        self._redraw_all = True
+
+    def uses_dirty_rects(self):
+        """Returns True iff enable_dirty_rects() has been called."""
+        return self._dirty_rects is not None
+
+    def mark_dirty(self, rect):
+        """Marks a region of the screen as needing to be redrawn.
+
+        This does nothing unless dirty rects are enabled.
+
+        Arguments:
+          rect (pygame.Rect or tuple): The region that changed.
+        """
+        if self._dirty_rects is not None and not self._redraw_all:
+            self._dirty_rects.append(pygame.Rect(rect))
+
+    def mark_all_dirty(self):
+        """Marks the whole screen as needing to be redrawn."""
+        self._redraw_all = True
+
+    def enable_idle_mode(self):
+        """Switches to only drawing frames when something has changed.
+
+        Normally, the main loop draws self.fps frames a second, no
+        matter what. In idle mode, it sleeps until an event arrives or
+        an animation needs another frame, and then only draws a frame
+        if the game asks for one, so a game that nobody is playing
+        uses next to no CPU.
+
+        In this mode, the game should call request_redraw() whenever
+        its state changes (usually from handle_event()), and override
+        next_frame_delay() if it has animations. Game time keeps up
+        with real time across long idle gaps; see advance().
+        """
+        self._idle_mode = True
+        self._needs_redraw = True
+
+    def request_redraw(self):
+        """Asks for a new frame to be drawn, in idle mode."""
+        self._needs_redraw = True
+
+    def next_frame_delay(self):
+        """Returns how long until the game next needs a frame drawn.
+
+        Override this if your game has animations. It is only used in
+        idle mode.
+
+        Returns (int or None): the time in milliseconds until the next
+          frame is needed (0 if one is needed now), or None if no frame
+          is needed until the game's state changes.
+        """
+        return None
+
     def ready_to_run(self):
         """Initialization that happens after pygame is initialized.
 
@@ -101,17 +236,151 @@ class SimpleGame(object):
         """
         pass
 
+    def update(self, dt):
+        """Updates your game's logic. Runs update_rate times per second.
+
+        Override this if your game has things that change over time,
+        rather than only in response to events.
+
+        Arguments:
+          dt (float): The game time in milliseconds that the update
+            covers. This is always the same; see time_step().
+        """
+        pass
+
+    def time_step(self):
+        """Returns the game time covered by each update, in milliseconds."""
+        return 1000.0 / self.update_rate
+
+    def game_time(self):
+        """Returns the game time, in milliseconds.
+
+        Game time starts at 0 and moves forward one time step with
+        each update, so it is a clock that game objects can use to
+        behave the same way whatever the frame rate.
+        """
+        return self._update_count * self.time_step()
+
+    def advance(self, elapsed):
+        """Runs as many updates as are due after some real time has passed.
+
+        This is called by the main loop once per frame, after events
+        have been handled. Time left over, too short for an update, is
+        carried over to the next frame.
+
+        At most max_frame_time worth of updates are run. Normally game
+        time just falls behind by the rest. In idle mode, long gaps
+        between frames are expected, so game time jumps forward by the
+        rest instead, without running update() for it: an idle game
+        shouldn't have anything for it to do.
+
+        Arguments:
+          elapsed (int or float): The real time in milliseconds since
+            the last call.
+        Returns (int): the number of updates run.
+        """
+        if elapsed > self.max_frame_time:
+            if self._idle_mode:
+                skipped = int((elapsed - self.max_frame_time) // self.time_step())
+                self._update_count += skipped
+                elapsed -= skipped * self.time_step()
+            else:
+                elapsed = self.max_frame_time
+        return self._run_updates(elapsed)
+
+    def simulate(self, duration):
+        """Runs the game's logic for some game time, without drawing.
+
+        Updates are run back to back, as fast as possible, so this is
+        useful for tests and for running games headless.
+
+        Arguments:
+          duration (int or float): The game time to simulate, in milliseconds.
+        Returns (int): the number of updates run.
+        """
+        return self._run_updates(duration)
+
+    def _run_updates(self, elapsed):
+        step = self.time_step()
+        self._accumulator += elapsed
+        count = 0
+        while self._accumulator >= step:
+            self.update(step)
+            self._update_count += 1
+            self._accumulator -= step
+            count += 1
+        self.interpolation = self._accumulator / step
+        return count
+
     def draw(self):
         """Draws your game. Runs once per frame.
 
         You want to override this; this is where your game's rendering
         should take place.
 
-        This is called after handle_event in the main event loop.
+        This is called after handle_event in the main event loop. You
+        don't need to call pygame.display.flip(); present() is called
+        for you after you're done drawing.
         """
-        self.screen.fill(WHITE)
-        self._default_text.draw(self.screen)
-        pygame.display.flip()
+        if self.uses_dirty_rects():
+            # Our text never changes, so there's nothing to do after
+            # the first frame.
+            self.repaint_dirty(self._default_text.draw)
+        else:
+            self.draw_background(self.screen)
+            self._default_text.draw(self.screen)
+
+    def draw_background(self, surface):
+        """Draws the background of the game on a surface.
+
+        Override this if your game has a different background. In
+        dirty-rect mode, it is only called once, and should draw the
+        same thing every time.
+        """
+        surface.fill(WHITE)
+
+    def repaint_dirty(self, draw_scene):
+        """Repaints the regions of the screen marked dirty.
+
+        Each region is cleared to the background, then redrawn by
+        draw_scene with drawing clipped to the region. Only for use in
+        dirty-rect mode.
+
+        Arguments:
+          draw_scene (callable): A function that draws everything in
+            front of the background, taking the surface to draw on as
+            its one argument.
+        """
+        screen = self.screen
+        if self._background is None:
+            self._background = screen.copy()
+            self.draw_background(self._background)
+        if self._redraw_all:
+            screen.blit(self._background, (0, 0))
+            draw_scene(screen)
+            return
+        self._dirty_rects = _merge_rects(self._dirty_rects)
+        for rect in self._dirty_rects:
+            screen.set_clip(rect)
+            screen.blit(self._background, rect, rect)
+            draw_scene(screen)
+        screen.set_clip(None)
+
+    def present(self):
+        """Shows the frame that was just drawn on the screen.
+
+        This is called after draw in the main event loop. In dirty-rect
+        mode, only the regions marked dirty are shown.
+        """
+        if self._dirty_rects is None:
+            pygame.display.flip()
+        elif self._redraw_all:
+            pygame.display.flip()
+            self._redraw_all = False
+            del self._dirty_rects[:]
+        elif self._dirty_rects:
+            pygame.display.update(self._dirty_rects)
+            del self._dirty_rects[:]
 
     def main_loop(self):
         """Executes the game's main loop.
@@ -120,21 +389,84 @@ class SimpleGame(object):
         restructure the game loop altogether.
         """
         clock = pygame.time.Clock()
+        stats = self.frame_stats
+        last_time = self.clock()
         done = False
         while not done:
+            if stats is not None:
+                stats.begin_frame()
+
             # This delays the program as necessary so we run at a smooth 60fps (if possible),
             # and returns the time elapsed in milliseconds since the last frame.
             self.dt = clock.tick(self.fps)
+            if self._idle_mode:
+                events = self._wait_for_events()
+            else:
+                events = pygame.event.get()
+            if stats is not None:
+                stats.end_phase(frame_stats.WAIT)
 
             # Process all pending events.
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     done = True
                 else:
+                    if event.type in _EXPOSE_EVENTS:
+                        # The window needs repainting.
+                        self.mark_all_dirty()
+                        self.request_redraw()
                     self.handle_event(event)
+            if stats is not None:
+                stats.end_phase(frame_stats.EVENTS)
+
+            now = self.clock()
+            self.advance(now - last_time)
+            last_time = now
+            if stats is not None:
+                stats.end_phase(frame_stats.UPDATE)
+
+            if self._idle_mode:
+                delay = self.next_frame_delay()
+                if not (self._needs_redraw or (delay is not None and delay <= 0)):
+                    # Nothing to draw this time around. (Any frame
+                    # stats for this wakeup are simply overwritten by
+                    # the next frame's.)
+                    continue
+                self._needs_redraw = False
 
             # Go draw something!
             self.draw()
+            if stats is not None:
+                if self._show_frame_stats:
+                    self.mark_dirty(stats.draw_overlay(self.screen))
+                stats.end_phase(frame_stats.DRAW)
+
+            self.present()
+            if stats is not None:
+                stats.end_phase(frame_stats.PRESENT)
+                stats.end_frame()
+
+        if stats is not None and self._frame_trace_path:
+            stats.dump_trace(self._frame_trace_path)
+
+    def _wait_for_events(self):
+        """Waits until there are events to handle or a frame is due, in idle mode.
+
+        Returns (list): the events, which may be none.
+        """
+        if self._needs_redraw:
+            return pygame.event.get()
+        delay = self.next_frame_delay()
+        if delay is None:
+            event = pygame.event.wait()
+        elif delay > 0 and _CAN_WAIT_WITH_TIMEOUT:
+            # Note that a timeout of 0 would mean "wait forever".
+            event = pygame.event.wait(int(delay))
+        else:
+            return pygame.event.get()
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        return events
 
     def run(self):
         """Runs the game.
@@ -146,6 +478,33 @@ class SimpleGame(object):
         self.ready_to_run()
         self.main_loop()
         pygame.quit()
+        # pygame.quit() should have done this already, but make sure
+        # nothing from this run outlives it.
+        fonts.clear_fonts()
+        fonts.TEXT_CACHE.clear()
+
+
+# Events telling us that the window's contents need repainting.
+_EXPOSE_EVENTS = tuple(
+    getattr(pygame, name) for name in ('VIDEOEXPOSE', 'WINDOWEXPOSED')
+    if hasattr(pygame, name))
+
+# pygame.event.wait() only takes a timeout in pygame 2 and later. With
+# older versions, idle mode polls for events while animations run.
+_CAN_WAIT_WITH_TIMEOUT = pygame.version.vernum[0] >= 2
+
+
+def _merge_rects(rects):
+    """Returns a list of rects covering the given ones, with overlapping
+    rects combined, so that no region is redrawn twice."""
+    merged = []
+    for rect in rects:
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
 
 
 def main(game_maker):
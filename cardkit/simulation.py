@@ -0,0 +1,233 @@
+"""Monte Carlo estimates of the odds of a card game's outcomes.
+
+To estimate how likely each outcome of a situation is, we play it out
+many times over from a freshly shuffled deck and count how often each
+outcome comes up. You supply the situation as a trial function:
+
+    def trial(deck, known_cards):
+        # Deal whatever is still to come from the (shuffled) deck,
+        # and return a label for how things turned out.
+        board = deck.deal_several(5)
+        ...
+        return 'win'
+
+    result = simulation.estimate(trial, deck=my_deck, known_cards=my_hand)
+    result.probability('win')
+
+Trials are run in batches, spread across a pool of worker processes.
+Each batch shuffles with its own random number generator, derived
+from one seed (see cardkit.rng), so the same seed gives the same
+answer however many processes are used. The simulation stops as soon
+as every outcome's probability is known to the requested precision.
+
+Since trial functions are sent to the worker processes, they must be
+picklable: define them at the top level of a module (or wrap one with
+functools.partial), not as lambdas or nested functions.
+"""
+import collections
+import math
+import multiprocessing
+import random
+
+from cardkit import deck as deck_module
+from cardkit import parallel
+from cardkit import rng as rng_module
+
+
+class SimulationResult(object):
+    """The outcomes of a simulation so far.
+
+    Attributes:
+      counts (dict): Maps each outcome to the number of trials that
+        had that outcome.
+      trials (int): The total number of trials run.
+      confidence (float): The confidence level for intervals, e.g. 0.95.
+      finished (bool): Whether the simulation has finished.
+    """
+    def __init__(self, confidence=0.95):
+        self.counts = {}
+        self.trials = 0
+        self.confidence = confidence
+        self.finished = False
+        self._z = _z_score(confidence)
+
+    def add_counts(self, counts):
+        """Adds the outcome counts of another batch of trials."""
+        for outcome, count in counts.items():
+            self.counts[outcome] = self.counts.get(outcome, 0) + count
+            self.trials += count
+
+    def outcomes(self):
+        """Returns the outcomes seen so far, most common first."""
+        return sorted(self.counts, key=self.counts.get, reverse=True)
+
+    def probability(self, outcome):
+        """Returns the estimated probability of an outcome."""
+        if not self.trials:
+            return 0.0
+        return float(self.counts.get(outcome, 0)) / self.trials
+
+    def confidence_interval(self, outcome):
+        """Returns a confidence interval for the probability of an outcome.
+
+        This is the Wilson score interval, which behaves well even for
+        outcomes that are very rare or very common.
+
+        Returns (tuple): the (low, high) ends of the interval.
+        """
+        n = self.trials
+        if not n:
+            return (0.0, 1.0)
+        p = self.probability(outcome)
+        z2 = self._z * self._z
+        center = (p + z2 / (2 * n)) / (1 + z2 / n)
+        margin = self._z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+        return (max(0.0, center - margin), min(1.0, center + margin))
+
+    def margin(self, outcome):
+        """Returns half the width of an outcome's confidence interval."""
+        low, high = self.confidence_interval(outcome)
+        return (high - low) / 2
+
+    def max_margin(self):
+        """Returns the largest margin of any outcome seen so far."""
+        if not self.counts:
+            return 0.5
+        return max(self.margin(outcome) for outcome in self.counts)
+
+    def __repr__(self):
+        return 'SimulationResult(%s, trials=%d)' % (
+            ', '.join('%r: %.4f' % (outcome, self.probability(outcome))
+                      for outcome in self.outcomes()),
+            self.trials)
+
+
+def estimate(trial, deck=None, known_cards=(), precision=0.005, confidence=0.95,
+             max_trials=1000000, min_trials=1000, batch_size=1000, processes=None,
+             seed=None, progress=None, pool=None):
+    """Estimates the probabilities of the outcomes of a trial.
+
+    Arguments:
+      trial (callable): A function taking a shuffled Deck holding the
+        unknown cards and the known cards, and returning a hashable
+        label for the outcome of one trial. It may deal from the deck
+        as it likes. (The deck is shuffled lazily, so it should deal
+        or peek, rather than looking at deck.cards.)
+      deck (Deck or None): The cards not yet dealt. If None, a full
+        52-card deck is used. The deck isn't changed.
+      known_cards (sequence): Cards that are already known, such as
+        the player's hand. They are taken out of the deck (if they're
+        in it), and passed on to the trial function.
+      precision (float or None): Stop once the margin of error of
+        every outcome's probability is at most this. If None, always
+        run max_trials trials.
+      confidence (float): The confidence level for the margin of error.
+      max_trials (int): The most trials to run.
+      min_trials (int): The fewest trials to run before stopping early.
+      batch_size (int): The number of trials in each batch of work.
+      processes (int or None): The number of worker processes to use.
+        If None, one per CPU is used. If 1, trials run in this process.
+        If a pool is given, this only decides how many batches are
+        handed to it at once (twice this many).
+      seed (int or None): The seed for the random number generators.
+        If None, a random seed is used.
+      progress (callable or None): A function called with the
+        SimulationResult so far after each batch. If it returns True,
+        the simulation stops.
+      pool (multiprocessing.Pool or None): A pool of worker processes
+        to use, instead of starting one up for this call. Starting a
+        pool takes a while, so pass one in if you run many
+        simulations. The pool is left running.
+    Returns (SimulationResult): the outcome counts and probabilities.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(128)
+    cards = _unknown_cards(deck, known_cards)
+    known_cards = list(known_cards)
+    batch_count = (max_trials + batch_size - 1) // batch_size
+    tasks = (
+        (trial, cards, known_cards, rng_module.child_seed(seed, index),
+         min(batch_size, max_trials - index * batch_size))
+        for index in range(batch_count))
+
+    result = SimulationResult(confidence)
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if pool is not None:
+        _collect(result, parallel.imap_bounded(pool, _run_batch, tasks, 2 * processes),
+                 precision, min_trials, progress)
+    elif processes == 1:
+        _collect(result, (_run_batch(task) for task in tasks),
+                 precision, min_trials, progress)
+    else:
+        pool = multiprocessing.Pool(processes)
+        try:
+            # Batches come back in order, so whether (and when) we stop
+            # early doesn't depend on which process finishes first.
+            _collect(result, parallel.imap_bounded(pool, _run_batch, tasks, 2 * processes),
+                     precision, min_trials, progress)
+        finally:
+            pool.terminate()
+            pool.join()
+    result.finished = True
+    return result
+
+
+def _collect(result, batch_counts, precision, min_trials, progress):
+    """Adds up batch results until there are enough of them."""
+    for counts in batch_counts:
+        result.add_counts(counts)
+        if progress is not None and progress(result):
+            return
+        if (precision is not None
+            and result.trials >= min_trials
+            and result.max_margin() <= precision):
+            return
+
+
+def _unknown_cards(deck, known_cards):
+    """Returns the cards of a deck, minus the known cards, topmost first."""
+    if deck is None:
+        cards = list(deck_module.DEFAULT_CARD_SET)
+    else:
+        cards = list(reversed(deck.cards))
+    # Take out one copy of each known card, so that a known card only
+    # removes one of the copies in a multi-deck pack (or one joker).
+    known = collections.Counter((c.rank, c.suit) for c in known_cards)
+    unknown = []
+    for c in cards:
+        key = (c.rank, c.suit)
+        if known[key]:
+            known[key] -= 1
+        else:
+            unknown.append(c)
+    return unknown
+
+
+def _run_batch(task):
+    """Runs a batch of trials, returning a dict of outcome counts."""
+    trial, cards, known_cards, seed, count = task
+    d = deck_module.Deck(initial_cards=cards, rng=rng_module.make_rng(seed))
+    counts = {}
+    for i in range(count):
+        d.reset()
+        d.shuffle(lazy=True)
+        outcome = trial(d, known_cards)
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return counts
+
+
+def _z_score(confidence):
+    """Returns the number of standard deviations either side of the
+    mean of a normal distribution that cover a given fraction of it."""
+    if not 0 < confidence < 1:
+        raise ValueError('Confidence must be between 0 and 1: %s' % confidence)
+    # Find z such that erf(z / sqrt(2)) == confidence, by bisection.
+    low, high = 0.0, 10.0
+    for i in range(100):
+        middle = (low + high) / 2
+        if math.erf(middle / math.sqrt(2)) < confidence:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
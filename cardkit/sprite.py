@@ -81,12 +81,18 @@ class Sprite(object):
             size[0],
             size[1])
         self.origin = origin
+        # If the sprite is the whole of its source, blitting doesn't
+        # need to clip to the source rect.
+        if self.source_rect == source.get_rect():
+            self._blit_area = None
+        else:
+            self._blit_area = self.source_rect
 
     def draw(self, surface, location):
         """Draws the sprite on the given surface at the given location.
 
         Note that the sprite's origin point is what will get drawn at
-        the location.
+        the location. The surface may also be a SpriteBatch.
         """
         # We want the sprite's origin to be drawn at the given
         # location.  However, the blit's destination needs to be where
@@ -96,4 +102,67 @@ class Sprite(object):
         blit_location = (
             location[0] - self.origin[0],
             location[1] - self.origin[1])
-        surface.blit(self.source, blit_location, self.source_rect)
+        surface.blit(self.source, blit_location, self._blit_area)
+
+
+class SpriteBatch(object):
+    """Collects blits to a surface so they can be done all at once.
+
+    Every call to Surface.blit() has a fixed cost on top of the actual
+    copying of pixels. For sprites the size of a card, the copying
+    dominates and batching makes little difference, but for scenes of
+    hundreds of small sprites (chips, pips, particles) the fixed cost
+    adds up, and batching them saves about a quarter of the drawing
+    time (see the sprite.draw_small_500 benchmarks).
+
+    A SpriteBatch has a blit() method just like a Surface, so it
+    can be passed to anything that draws sprites (Sprite.draw(),
+    Card.draw(), Deck.draw(), and so on) in place of the surface. It
+    just remembers each blit, and flush() then does them all with a
+    single call to Surface.blits().
+
+    Blits are done in the order they were queued, so sprites overlap
+    exactly as they would if drawn directly. Anything that draws to the
+    surface some other way should call surface_for_drawing() first, so
+    that the sprites queued so far end up underneath it.
+
+    Attributes:
+      surface (pygame.Surface): The surface the blits are done on.
+    """
+    def __init__(self, surface):
+        self.surface = surface
+        self._blits = []
+
+    def __len__(self):
+        """Returns the number of blits waiting to be done."""
+        return len(self._blits)
+
+    def blit(self, source, dest, area=None):
+        """Queues a blit. The arguments are the same as for Surface.blit()."""
+        self._blits.append((source, dest, area))
+
+    def flush(self):
+        """Does all the blits queued so far."""
+        if not self._blits:
+            return
+        if hasattr(self.surface, 'blits'):
+            self.surface.blits(self._blits, doreturn=False)
+        else:
+            # Surface.blits() is new in pygame 1.9.4.
+            for source, dest, area in self._blits:
+                self.surface.blit(source, dest, area)
+        del self._blits[:]
+
+
+def surface_for_drawing(target):
+    """Returns the actual surface behind a drawing target.
+
+    Arguments:
+      target (pygame.Surface or SpriteBatch): Where something is to be
+        drawn. If it's a SpriteBatch, it will be flushed first.
+    Returns (pygame.Surface): the surface to draw on.
+    """
+    if isinstance(target, SpriteBatch):
+        target.flush()
+        return target.surface
+    return target
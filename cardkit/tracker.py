@@ -0,0 +1,161 @@
+"""Running counts of the cards left in a deck or shoe.
+
+Games often want to know what's left to be dealt: the chance that the
+next card is a heart, say, or a blackjack card counter's true count.
+Working that out by going through the deck's cards every time is
+slow, especially for a six-deck shoe queried every frame. A
+CardTracker listens to a Deck or Shoe instead (see deck.DeckListener),
+and keeps its counts up to date as cards are dealt and added, so that
+every question it answers takes constant time:
+
+    t = tracker.CardTracker(my_shoe)
+    my_shoe.deal()
+    t.probability(suit=ck.HEARTS)
+    t.true_count()
+"""
+from cardkit import card_constants as ck
+from cardkit import deck
+from cardkit import shoe
+
+
+# The Hi-Lo card counting system: the value of each rank.
+HI_LO = {
+    ck.TWO: 1, ck.THREE: 1, ck.FOUR: 1, ck.FIVE: 1, ck.SIX: 1,
+    ck.SEVEN: 0, ck.EIGHT: 0, ck.NINE: 0,
+    ck.TEN: -1, ck.JACK: -1, ck.QUEEN: -1, ck.KING: -1, ck.ACE: -1,
+}
+
+_CARDS_PER_DECK = len(ck.DECK_OF_52)
+
+# The rank and suit of each card, indexed by card id.
+_RANK_OF_ID = [rank for rank, suit in ck.DECK_OF_54]
+_SUIT_OF_ID = [suit for rank, suit in ck.DECK_OF_54]
+
+
+class CardTracker(deck.DeckListener):
+    """Keeps count of the cards left in a Deck or Shoe.
+
+    Attributes:
+      source (Deck or Shoe): The cards being tracked.
+      counting_system (dict): The value of each rank for card
+        counting, such as HI_LO. Ranks it leaves out count as 0.
+      remaining (int): The number of cards left in the source.
+      running_count (int): The total value of the cards dealt since
+        the source was last reset (or since tracking started), less
+        the value of any cards added back.
+    """
+    def __init__(self, source, counting_system=HI_LO):
+        """Starts tracking a Deck or Shoe.
+
+        The tracker listens to the source until detach() is called.
+        """
+        self.source = source
+        self.counting_system = counting_system
+        self._values = [counting_system.get(rank, 0) for rank in _RANK_OF_ID]
+        self._recount()
+        self._reset_running_count()
+        source.add_listener(self)
+
+    def detach(self):
+        """Stops tracking the source."""
+        self.source.remove_listener(self)
+
+    def count(self, rank=None, suit=None):
+        """Returns the number of cards left with a given rank and/or suit.
+
+        With neither, returns the number of cards left. Jokers have
+        the rank card_constants.JOKER and no suit.
+        """
+        if rank is None:
+            if suit is None:
+                return self.remaining
+            return self._suit_counts.get(suit, 0)
+        if suit is None:
+            return self._rank_counts.get(rank, 0)
+        card_id = ck.CARD_IDS.get((rank, suit))
+        return 0 if card_id is None else self._id_counts[card_id]
+
+    def probability(self, rank=None, suit=None):
+        """Returns the probability that the next card dealt has a given rank and/or suit.
+
+        This assumes the source is shuffled. Returns 0.0 if it's empty.
+        """
+        if not self.remaining:
+            return 0.0
+        return float(self.count(rank, suit)) / self.remaining
+
+    def decks_remaining(self):
+        """Returns the number of 52-card decks' worth of cards left."""
+        return float(self.remaining) / _CARDS_PER_DECK
+
+    def true_count(self):
+        """Returns the running count divided by the number of decks left.
+
+        Returns 0.0 if there are no cards left.
+        """
+        if not self.remaining:
+            return 0.0
+        return self.running_count / self.decks_remaining()
+
+    def cards_removed(self, source, cards):
+        id_counts = self._id_counts
+        rank_counts = self._rank_counts
+        suit_counts = self._suit_counts
+        values = self._values
+        for c in cards:
+            card_id = c.card_id
+            id_counts[card_id] -= 1
+            rank_counts[_RANK_OF_ID[card_id]] -= 1
+            suit_counts[_SUIT_OF_ID[card_id]] -= 1
+            self._remaining_value -= values[card_id]
+        self.remaining -= len(cards)
+        self.running_count = self._initial_value - self._remaining_value
+
+    def cards_added(self, source, cards):
+        id_counts = self._id_counts
+        rank_counts = self._rank_counts
+        suit_counts = self._suit_counts
+        values = self._values
+        for c in cards:
+            card_id = c.card_id
+            id_counts[card_id] += 1
+            rank_counts[_RANK_OF_ID[card_id]] += 1
+            suit_counts[_SUIT_OF_ID[card_id]] += 1
+            self._remaining_value += values[card_id]
+        self.remaining += len(cards)
+        self.running_count = self._initial_value - self._remaining_value
+
+    def cards_reset(self, source):
+        self._recount()
+        self._reset_running_count()
+
+    def cards_restored(self, source):
+        # The running count goes back to what it was at the snapshot,
+        # as long as the source hasn't been reset since.
+        self._recount()
+        self.running_count = self._initial_value - self._remaining_value
+
+    def _reset_running_count(self):
+        """Starts counting again from the cards in the source now."""
+        self._initial_value = self._remaining_value
+        self.running_count = 0
+
+    def _recount(self):
+        """Counts the cards in the source from scratch."""
+        if isinstance(self.source, shoe.Shoe):
+            id_counts = list(self.source.counts)
+            id_counts.extend([0] * (len(ck.DECK_OF_54) - len(id_counts)))
+        else:
+            id_counts = [0] * len(ck.DECK_OF_54)
+            for c in self.source.cards:
+                id_counts[c.card_id] += 1
+        self._id_counts = id_counts
+        self._rank_counts = dict((rank, 0) for rank in ck.RANKS + (ck.JOKER,))
+        self._suit_counts = dict((suit, 0) for suit in ck.SUITS + (None,))
+        self._remaining_value = 0
+        for card_id, count in enumerate(id_counts):
+            if count:
+                self._rank_counts[_RANK_OF_ID[card_id]] += count
+                self._suit_counts[_SUIT_OF_ID[card_id]] += count
+                self._remaining_value += count * self._values[card_id]
+        self.remaining = sum(id_counts)
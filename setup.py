@@ -15,6 +15,9 @@ setuptools.setup(
     url='https://github.com/ods94065/card-kit',
     packages=setuptools.find_packages(),
     package_data={'cardkit': ['img/*.png']},
+    extras_require={
+        'numpy': ['numpy>=1.20'],
+    },
     data_files=[
         ('share/doc/cardkit', ['LICENSE', 'README.md']),
     ],
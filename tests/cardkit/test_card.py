@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 
 from cardkit import card
@@ -144,3 +146,45 @@ class CardTest(unittest.TestCase):
         self.assertEqual('ace of spades (face down)', str(c))
         c = card.Card(ck.JOKER, None)
         self.assertEqual('joker (face up)', str(c))
+
+    def testEqualCardsAreTheSameObject(self):
+        c1 = card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP)
+        c2 = card.Card('Queen', 'HEARTS', 'up')
+        self.assertIs(c1, c2)
+
+    def testConstructorCacheOnlyHoldsNormalizedArguments(self):
+        card.Card(ck.ACE, ck.SPADES)
+        size = len(card._CONSTRUCTOR_CACHE)
+        for rank in ('Ace', 'ACE', 'aCe', '1'):
+            for suit in ('Spades', 'SPADES'):
+                self.assertIs(card.Card(ck.ACE, ck.SPADES), card.Card(rank, suit, 'UP'))
+        self.assertEqual(size, len(card._CONSTRUCTOR_CACHE))
+
+    def testWithFaceReturnsInternedCard(self):
+        c1 = card.Card(6, 'clubs', 'up')
+        self.assertIs(card.Card(6, 'clubs', 'down'), c1.with_face('down'))
+        self.assertIs(c1, c1.with_face('down').with_face('UP'))
+
+    def testWithInvalidFaceThrowsException(self):
+        c = card.Card(6, 'clubs', 'up')
+        with self.assertRaises(ValueError):
+            c.with_face('sideways')
+
+    def testCardsAreImmutable(self):
+        c = card.Card(ck.TEN, ck.SPADES)
+        with self.assertRaises(AttributeError):
+            c.face = ck.FACE_DOWN
+        with self.assertRaises(AttributeError):
+            del c.rank
+        self.assertEqual(ck.FACE_UP, card.Card(ck.TEN, ck.SPADES).face)
+
+    def testCopiedCardsAreTheSameObject(self):
+        c = card.Card(ck.JOKER, None, ck.FACE_DOWN)
+        self.assertIs(c, copy.copy(c))
+        self.assertIs(c, copy.deepcopy(c))
+        self.assertIs(c, pickle.loads(pickle.dumps(c)))
+
+    def testCardIsNotEqualToOtherTypes(self):
+        c = card.Card(ck.ACE, ck.SPADES)
+        self.assertNotEqual(c, (ck.FACE_UP, ck.ACE, ck.SPADES))
+        self.assertFalse(c == None)
@@ -0,0 +1,111 @@
+import unittest
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import card_set
+from cardkit import deck
+
+
+class CardIdTest(unittest.TestCase):
+    def testCardIdsMatchDeckOf54(self):
+        for card_id, (rank, suit) in enumerate(ck.DECK_OF_52):
+            self.assertEqual(card_id, card.Card(rank, suit).card_id)
+
+    def testCardIdIgnoresFace(self):
+        c = card.Card(ck.KING, ck.HEARTS)
+        self.assertEqual(c.card_id, c.with_face(ck.FACE_DOWN).card_id)
+
+    def testJokerHasFirstJokerId(self):
+        self.assertEqual(52, card.Card(ck.JOKER, None).card_id)
+
+    def testCardForIdRoundTrips(self):
+        for card_id in range(52):
+            self.assertEqual(card_id, card.card_for_id(card_id).card_id)
+        self.assertTrue(card.card_for_id(53).is_joker())
+        self.assertEqual(ck.FACE_DOWN, card.card_for_id(0, ck.FACE_DOWN).face)
+
+    def testCardForIdRejectsBadIds(self):
+        with self.assertRaises(IndexError):
+            card.card_for_id(54)
+        with self.assertRaises(IndexError):
+            card.card_for_id(-1)
+
+
+class CardSetTest(unittest.TestCase):
+    def testEmptySet(self):
+        s = card_set.CardSet()
+        self.assertEqual(0, len(s))
+        self.assertFalse(s)
+        self.assertEqual([], list(s))
+
+    def testMembershipIgnoresFace(self):
+        s = card_set.CardSet([card.Card(ck.ACE, ck.SPADES, ck.FACE_DOWN)])
+        self.assertIn(card.Card(ck.ACE, ck.SPADES, ck.FACE_UP), s)
+        self.assertIn(card.Card(ck.ACE, ck.SPADES).card_id, s)
+        self.assertNotIn(card.Card(ck.ACE, ck.HEARTS), s)
+
+    def testAddAndRemove(self):
+        s = card_set.CardSet()
+        c = card.Card(ck.TEN, ck.CLUBS)
+        s.add(c)
+        s.add(c)
+        self.assertEqual(1, len(s))
+        s.remove(c)
+        self.assertNotIn(c, s)
+        with self.assertRaises(KeyError):
+            s.remove(c)
+        s.discard(c)
+
+    def testSetHoldsTwoJokers(self):
+        joker = card.Card(ck.JOKER, None)
+        s = card_set.CardSet([joker, joker])
+        self.assertEqual(2, len(s))
+        self.assertEqual(2, s.joker_count())
+        s.remove(joker)
+        self.assertIn(joker, s)
+        s.remove(joker)
+        self.assertNotIn(joker, s)
+
+    def testSetOperations(self):
+        a = card_set.CardSet([0, 1, 2])
+        b = card_set.CardSet([2, 3])
+        self.assertEqual([0, 1, 2, 3], list((a | b).ids()))
+        self.assertEqual([2], list((a & b).ids()))
+        self.assertEqual([0, 1], list((a - b).ids()))
+        self.assertEqual([0, 1, 3], list((a ^ b).ids()))
+        self.assertFalse(a.isdisjoint(b))
+        self.assertTrue(card_set.CardSet([2]).issubset(a))
+
+    def testIterationYieldsCardsInIdOrder(self):
+        cards = [card.Card(ck.KING, ck.SPADES), card.Card(2, ck.HEARTS), card.Card(ck.ACE, ck.CLUBS)]
+        s = card_set.CardSet(cards)
+        self.assertEqual(sorted(cards, key=lambda c: c.card_id), list(s))
+
+    def testSuitAndRankQueries(self):
+        s = card_set.CardSet([
+            card.Card(ck.ACE, ck.HEARTS),
+            card.Card(ck.KING, ck.HEARTS),
+            card.Card(ck.KING, ck.CLUBS)])
+        self.assertEqual((ck.CLUBS, ck.HEARTS), s.suits())
+        self.assertEqual((ck.ACE, ck.KING), s.ranks())
+        self.assertEqual(2, s.count_suit(ck.HEARTS))
+        self.assertEqual(2, s.count_rank(ck.KING))
+        self.assertEqual(0, s.count_suit(ck.SPADES))
+
+    def testFullSet(self):
+        self.assertEqual(52, len(card_set.CardSet.full()))
+        self.assertEqual(54, len(card_set.CardSet.full(jokers=True)))
+
+    def testFromMaskRejectsBadBits(self):
+        with self.assertRaises(ValueError):
+            card_set.CardSet.from_mask(1 << 54)
+
+    def testConvertToAndFromDeck(self):
+        d = deck.Deck()
+        d.deal()
+        s = card_set.CardSet.from_deck(d)
+        self.assertEqual(51, len(s))
+        self.assertNotIn(card.Card(ck.ACE, ck.CLUBS), s)
+        new_deck = s.to_deck()
+        self.assertEqual(51, len(new_deck))
+        self.assertEqual(card.Card(ck.ACE, ck.DIAMONDS, ck.FACE_DOWN), new_deck.peek())
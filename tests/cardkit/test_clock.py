@@ -0,0 +1,24 @@
+import unittest
+
+from cardkit import clock
+
+
+class ManualClockTest(unittest.TestCase):
+    def testStartsWhereToldTo(self):
+        self.assertEqual(0, clock.ManualClock()())
+        self.assertEqual(500, clock.ManualClock(500)())
+
+    def testAdvance(self):
+        c = clock.ManualClock()
+        c.advance(16)
+        c.advance(17)
+        self.assertEqual(33, c())
+
+    def testCannotGoBackwards(self):
+        c = clock.ManualClock(10)
+        self.assertRaises(ValueError, c.advance, -1)
+        self.assertEqual(10, c())
+
+
+if __name__ == '__main__':
+    unittest.main()
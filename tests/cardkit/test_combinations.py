@@ -0,0 +1,117 @@
+import itertools
+import multiprocessing
+import unittest
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import combinations
+from cardkit import deck
+
+
+def same_rank(dealt, known_cards):
+    return dealt[0].rank == dealt[1].rank
+
+
+def has_pair(dealt, known_cards):
+    ranks = [c.rank for c in list(dealt) + list(known_cards)]
+    return len(set(ranks)) < len(ranks)
+
+
+def flush_draw(dealt, known_cards):
+    suits = [c.suit for c in list(dealt) + list(known_cards)]
+    return max(suits.count(suit) for suit in ck.SUITS)
+
+
+def cards(*ids):
+    return [card.card_for_id(card_id) for card_id in ids]
+
+
+class CombinationTest(unittest.TestCase):
+    def testCombinationCount(self):
+        self.assertEqual(1326, combinations.combination_count(52, 2))
+        self.assertEqual(2598960, combinations.combination_count(52, 5))
+        self.assertEqual(1, combinations.combination_count(5, 0))
+        self.assertEqual(0, combinations.combination_count(3, 4))
+
+    def testUnrankMatchesLexicographicOrder(self):
+        expected = list(itertools.combinations(range(9), 4))
+        self.assertEqual(expected, [combinations.unrank(i, 9, 4) for i in range(len(expected))])
+        self.assertRaises(IndexError, combinations.unrank, len(expected), 9, 4)
+
+    def testIterCombinationsRanges(self):
+        pool = 'abcdefghij'
+        expected = list(itertools.combinations(pool, 3))
+        pieces = []
+        for start in range(0, len(expected), 7):
+            pieces.extend(combinations.iter_combinations(pool, 3, start, start + 7))
+        self.assertEqual(expected, pieces)
+        self.assertEqual(expected[100:], list(combinations.iter_combinations(pool, 3, 100, 1000)))
+
+    def testPoolIds(self):
+        d = deck.Deck()
+        d.deal_several(3)
+        known = cards(51)
+        pool = combinations.pool_ids(d, known)
+        self.assertEqual(48, len(pool))
+        self.assertEqual(sorted(pool), pool)
+        self.assertNotIn(51, pool)
+        with_joker = deck.Deck(initial_cards=cards(0, ck.JOKER_IDS[0]))
+        self.assertRaises(ValueError, combinations.pool_ids, with_joker)
+
+    def testCanonicalStartingHands(self):
+        hands = list(combinations.iter_canonical(range(52), 2))
+        self.assertEqual(169, len(hands))
+        self.assertEqual(1326, sum(weight for ids, weight in hands))
+        # Pairs stand for 6 combinations, suited hands 4, and offsuit hands 12.
+        weights = sorted(set(weight for ids, weight in hands))
+        self.assertEqual([4, 6, 12], weights)
+
+    def testCanonicalWeightsCoverEveryCombination(self):
+        for known_ids in [(), (0, 4), (0, 5), (3, 7, 11)]:
+            known = cards(*known_ids)
+            pool = combinations.pool_ids(None, known)
+            for k in (1, 2, 3):
+                canonical = list(combinations.iter_canonical(pool, k, known))
+                self.assertEqual(combinations.combination_count(len(pool), k),
+                                 sum(weight for ids, weight in canonical))
+                self.assertEqual(len(canonical), len(set(ids for ids, weight in canonical)))
+                self.assertTrue(all(list(ids) == sorted(ids) for ids, weight in canonical))
+
+    def testCountOutcomesIsExact(self):
+        counts = combinations.count_outcomes(same_rank, 2, processes=1)
+        self.assertEqual({True: 78, False: 1248}, counts)
+
+    def testSuitSymmetryGivesSameCounts(self):
+        for outcome, known in [(has_pair, cards(0, 5)), (flush_draw, cards(2, 6, 13))]:
+            with_symmetry = combinations.count_outcomes(
+                outcome, 3, known_cards=known, processes=1)
+            without_symmetry = combinations.count_outcomes(
+                outcome, 3, known_cards=known, use_suit_symmetry=False, processes=1)
+            self.assertEqual(without_symmetry, with_symmetry)
+
+    def testCountOutcomesFromPartlyDealtDeck(self):
+        d = deck.Deck(initial_cards=cards(0, 1, 2, 4, 5, 9))
+        counts = combinations.count_outcomes(same_rank, 2, deck=d, processes=1)
+        self.assertEqual({True: 4, False: 11}, counts)
+
+    def testSameResultWithMoreProcesses(self):
+        known = cards(0, 5)
+        inline = combinations.count_outcomes(
+            has_pair, 2, known_cards=known, use_suit_symmetry=False, processes=1)
+        for use_suit_symmetry in (True, False):
+            parallel = combinations.count_outcomes(
+                has_pair, 2, known_cards=known, use_suit_symmetry=use_suit_symmetry,
+                processes=2, chunk_size=100)
+            self.assertEqual(inline, parallel)
+        pool = multiprocessing.Pool(2)
+        try:
+            pooled = combinations.count_outcomes(
+                has_pair, 2, known_cards=known, processes=2, chunk_size=100, pool=pool)
+        finally:
+            pool.terminate()
+            pool.join()
+        self.assertEqual(inline, pooled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -136,4 +136,334 @@ class DeckTest(unittest.TestCase):
         dealt_cards = d.deal_several(4)
         self.assertEqual(cards, dealt_cards)
 
+    def testResetRestoresOriginalFaces(self):
+        cards = [card.Card(ck.ACE, suit, ck.FACE_DOWN) for suit in ck.SUITS]
+        d = deck.Deck(cards)
+        d.add(d.deal(face=ck.FACE_UP))
+        d.reset()
+        self.assertEqual(ck.FACE_DOWN, d.peek().face)
+
+    def testResetDoesNotAffectDealtCards(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        d = deck.Deck(cards)
+        dealt_cards = d.deal_several(2)
+        d.reset()
+        self.assertEqual(cards[:2], dealt_cards)
+        self.assertEqual(4, len(d))
+
+    def testRestoreUndoesChanges(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        d = deck.Deck(cards)
+        token = d.snapshot()
+        d.deal()
+        d.add(card.Card(ck.TWO, ck.CLUBS))
+        d.add(card.Card(ck.THREE, ck.CLUBS), to_bottom=True)
+        d.shuffle()
+        d.deal()
+        d.reset()
+        d.deal()
+        d.restore(token)
+        self.assertEqual(cards, d.deal_several(4))
+        self.assertTrue(d.is_empty())
+
+    def testRestoreCanBeRepeated(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        d = deck.Deck(cards)
+        d.deal()
+        token = d.snapshot()
+        for i in range(3):
+            d.deal_several(2)
+            d.restore(token)
+            self.assertEqual(3, len(d))
+            self.assertEqual(cards[1], d.peek())
+
+    def testNestedSnapshots(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        d = deck.Deck(cards)
+        outer = d.snapshot()
+        d.deal()
+        inner = d.snapshot()
+        d.deal()
+        d.restore(inner)
+        self.assertEqual(3, len(d))
+        d.restore(outer)
+        self.assertEqual(4, len(d))
+
+    def testRestoringEarlierSnapshotInvalidatesLaterOnes(self):
+        d = deck.Deck()
+        outer = d.snapshot()
+        d.deal()
+        inner = d.snapshot()
+        d.restore(outer)
+        d.deal()
+        with self.assertRaises(deck.DeckError):
+            d.restore(inner)
+
+    def testDiscardSnapshotsInvalidatesSnapshots(self):
+        d = deck.Deck()
+        token = d.snapshot()
+        d.discard_snapshots()
+        d.deal()
+        with self.assertRaises(deck.DeckError):
+            d.restore(token)
+
+    def testDealFromBottomDealsBottomCard(self):
+        cards = [card.Card(ck.ACE, suit, ck.FACE_DOWN) for suit in ck.SUITS]
+        for d in (deck.Deck(cards), deck.DequeDeck(cards)):
+            c = d.deal_from_bottom(face=ck.FACE_UP)
+            self.assertEqual(cards[-1].with_face(ck.FACE_UP), c)
+            self.assertEqual(3, len(d))
+            self.assertEqual(cards[0], d.peek())
+
+    def testDealFromBottomFailsIfDeckIsEmpty(self):
+        for d in (deck.Deck([]), deck.DequeDeck([])):
+            with self.assertRaises(deck.DeckError):
+                d.deal_from_bottom()
+
+    def testCutMovesTopCardsToBottom(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        for d in (deck.Deck(cards), deck.DequeDeck(cards)):
+            d.cut(1)
+            self.assertEqual(cards[1:] + cards[:1], d.deal_several(4))
+
+    def testCutFailsIfDeckIsTooSmall(self):
+        for d in (deck.Deck(), deck.DequeDeck()):
+            with self.assertRaises(deck.DeckError):
+                d.cut(53)
+            with self.assertRaises(deck.DeckError):
+                d.cut(-1)
+
+    def testRiffleKeepsCardsAndPreservesEachHalfsOrder(self):
+        random.seed(12)
+        cards = [card.Card(rank, ck.SPADES) for rank in ck.RANKS]
+        for d in (deck.Deck(cards), deck.DequeDeck(cards)):
+            d.riffle()
+            riffled = d.deal_several(len(cards))
+            self.assertEqual(sorted(cards, key=str), sorted(riffled, key=str))
+            # A single riffle leaves at most two rising sequences.
+            positions = [riffled.index(c) for c in cards]
+            breaks = sum(1 for a, b in zip(positions, positions[1:]) if b < a)
+            self.assertLessEqual(breaks, 1)
+
+    def testRestoreUndoesCutRiffleAndDealFromBottom(self):
+        cards = [card.Card(rank, ck.HEARTS) for rank in ck.RANKS]
+        for d in (deck.Deck(cards), deck.DequeDeck(cards)):
+            token = d.snapshot()
+            d.cut(5)
+            d.deal_from_bottom()
+            d.riffle()
+            d.add(card.Card(ck.TWO, ck.CLUBS), to_bottom=True)
+            d.restore(token)
+            self.assertEqual(cards, d.deal_several(len(cards)))
+
+
+class RecordingListener(deck.DeckListener):
+    def __init__(self):
+        self.events = []
+
+    def cards_removed(self, source, cards):
+        self.events.append(('removed', list(cards)))
+
+    def cards_added(self, source, cards):
+        self.events.append(('added', list(cards)))
+
+    def cards_reset(self, source):
+        self.events.append(('reset',))
+
+    def cards_restored(self, source):
+        self.events.append(('restored',))
+
+
+class DeckListenerTest(unittest.TestCase):
+    def testListenerHearsAboutChanges(self):
+        d = deck.Deck()
+        listener = RecordingListener()
+        d.add_listener(listener)
+        token = d.snapshot()
+        first = d.deal()
+        several = d.deal_several(2)
+        bottom = d.deal_from_bottom()
+        d.add(first)
+        d.shuffle()
+        d.cut(5)
+        d.restore(token)
+        d.reset()
+        self.assertEqual([
+            ('removed', [first]),
+            ('removed', several),
+            ('removed', [bottom]),
+            ('added', [first]),
+            ('restored',),
+            ('reset',),
+        ], listener.events)
+
+    def testRemovedListenerHearsNothing(self):
+        d = deck.DequeDeck()
+        listener = RecordingListener()
+        d.add_listener(listener)
+        d.remove_listener(listener)
+        d.deal()
+        self.assertEqual([], listener.events)
+
+class DequeDeckTest(unittest.TestCase):
+    def testDequeDeckDealsInOrder(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        d = deck.DequeDeck(cards)
+        self.assertEqual(cards, d.deal_several(4))
+        self.assertTrue(d.is_empty())
+
+    def testAddToBottomAddsCardToBottomOfDeck(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        d = deck.DequeDeck(cards)
+        new_card = card.Card(ck.TWO, ck.CLUBS)
+        d.add(new_card, to_bottom=True)
+        self.assertEqual(new_card, d.deal_from_bottom())
+
+    def testShuffleAndReset(self):
+        d = deck.DequeDeck()
+        d.deal_several(3)
+        d.shuffle()
+        self.assertEqual(49, len(d))
+        d.reset()
+        self.assertEqual(deck.Deck().deal_several(52), d.deal_several(52))
+
+    def testDealSeveralFailsWithoutDealingIfDeckIsTooSmall(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        for d in (deck.Deck(cards), deck.DequeDeck(cards)):
+            with self.assertRaises(deck.DeckError):
+                d.deal_several(5)
+            self.assertEqual(4, len(d))
+
+    def testDealSeveralWithNoCards(self):
+        d = deck.Deck()
+        self.assertEqual([], d.deal_several(0))
+        self.assertEqual(52, len(d))
+
+    def testDealSeveralWithInvalidFaceThrowsException(self):
+        d = deck.Deck()
+        with self.assertRaises(ValueError):
+            d.deal_several(2, 'sideways')
+
+    def testDealHandsDealsRoundRobin(self):
+        cards = [card.Card(rank, ck.CLUBS) for rank in ck.RANKS]
+        for d in (deck.Deck(cards), deck.DequeDeck(cards)):
+            hands = d.deal_hands(3, 4, ck.FACE_DOWN)
+            self.assertEqual(3, len(hands))
+            self.assertEqual(
+                [c.with_face(ck.FACE_DOWN) for c in cards[0:12:3]], hands[0])
+            self.assertEqual(
+                [c.with_face(ck.FACE_DOWN) for c in cards[2:12:3]], hands[2])
+            self.assertEqual(1, len(d))
+
+    def testRestoreUndoesDealSeveral(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        for d in (deck.Deck(cards), deck.DequeDeck(cards)):
+            token = d.snapshot()
+            d.deal_several(3, ck.FACE_DOWN)
+            d.restore(token)
+            self.assertEqual(cards, d.deal_several(4))
+
+
+class LazyShuffleTest(unittest.TestCase):
+    def setUp(self):
+        self.cards = [card.Card(rank, ck.SPADES) for rank in ck.RANKS]
+
+    def testLazyShuffleDealsEveryCardOnce(self):
+        d = deck.Deck(self.cards, rng=random.Random(1))
+        d.shuffle(lazy=True)
+        dealt_cards = d.deal_several(5) + [d.deal() for i in range(8)]
+        self.assertTrue(d.is_empty())
+        self.assertEqual(sorted(self.cards, key=str), sorted(dealt_cards, key=str))
+        self.assertNotEqual(self.cards, dealt_cards)
+
+    def testLazyShuffleIsUniform(self):
+        cards = self.cards[:4]
+        d = deck.Deck(cards, rng=random.Random(2))
+        counts = dict((c, 0) for c in cards)
+        for i in range(4000):
+            d.reset()
+            d.shuffle(lazy=True)
+            d.deal()
+            counts[d.deal()] += 1
+        for count in counts.values():
+            self.assertTrue(850 < count < 1150, counts)
+
+    def testPeekMatchesNextDeal(self):
+        d = deck.Deck(self.cards, rng=random.Random(3))
+        d.shuffle(lazy=True)
+        for i in range(len(self.cards)):
+            c = d.peek()
+            self.assertEqual(c, d.peek())
+            self.assertEqual(c, d.deal())
+
+    def testAddToTopOfLazilyShuffledDeck(self):
+        d = deck.Deck(self.cards, rng=random.Random(4))
+        d.shuffle(lazy=True)
+        new_card = card.Card(ck.TWO, ck.CLUBS)
+        d.add(new_card)
+        self.assertEqual(new_card, d.deal())
+        self.assertEqual(len(self.cards), len(d))
+
+    def testAddToBottomOfLazilyShuffledDeck(self):
+        d = deck.Deck(self.cards, rng=random.Random(5))
+        d.shuffle(lazy=True)
+        new_card = card.Card(ck.TWO, ck.CLUBS)
+        d.add(new_card, to_bottom=True)
+        self.assertEqual(new_card, d.deal_from_bottom())
+        self.assertEqual(len(self.cards), len(set(d.deal_several(len(self.cards)))))
+
+    def testResetAfterLazyShuffle(self):
+        d = deck.Deck(self.cards, rng=random.Random(6))
+        d.shuffle(lazy=True)
+        d.deal_several(3)
+        d.peek()
+        d.reset()
+        self.assertEqual(self.cards, d.deal_several(len(self.cards)))
+
+    def testResetAfterSeveralLazyShuffles(self):
+        d = deck.Deck(rng=random.Random(7))
+        d.shuffle(lazy=True)
+        d.deal_several(5)
+        d.shuffle(lazy=True)
+        d.peek()
+        d.reset()
+        self.assertEqual(deck.Deck().deal_several(52), d.deal_several(52))
+
+    def testResetAfterEagerShuffleAndAdds(self):
+        d = deck.Deck(self.cards, rng=random.Random(8))
+        d.shuffle(lazy=True)
+        d.deal()
+        d.add(card.Card(ck.TWO, ck.CLUBS))
+        d.shuffle()
+        d.reset()
+        self.assertEqual(self.cards, d.deal_several(len(self.cards)))
+
+    def testResetAfterCardsAppendedDirectly(self):
+        d = deck.Deck(self.cards)
+        d.deal()
+        d.cards.extend([card.Card(ck.TWO, ck.CLUBS)] * 3)
+        d.reset()
+        self.assertEqual(self.cards, d.deal_several(len(self.cards)))
+        self.assertTrue(d.is_empty())
+
+    def testRestoreUndoesLazyDeals(self):
+        d = deck.Deck(self.cards, rng=random.Random(9))
+        token = d.snapshot()
+        d.shuffle(lazy=True)
+        first_deal = d.deal_several(4)
+        inner = d.snapshot()
+        d.deal_several(4)
+        d.restore(inner)
+        # Cards that hadn't been chosen yet are chosen afresh.
+        remaining = d.deal_several(len(self.cards) - 4)
+        self.assertEqual(
+            sorted(self.cards, key=str), sorted(first_deal + remaining, key=str))
+        d.restore(token)
+        self.assertEqual(self.cards, d.deal_several(len(self.cards)))
+        self.assertNotEqual(self.cards[:4], first_deal)
 
+    def testDequeDeckShufflesEagerly(self):
+        d = deck.DequeDeck(self.cards, rng=random.Random(10))
+        d.shuffle(lazy=True)
+        self.assertEqual(sorted(self.cards, key=str), sorted(d.cards, key=str))
+        self.assertNotEqual(self.cards[::-1], list(d.cards))
@@ -0,0 +1,85 @@
+import unittest
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import deck
+
+try:
+    import numpy
+    from cardkit import deck_batch
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class DeckBatchTest(unittest.TestCase):
+    def testDefaultBatchHoldsStandardDecks(self):
+        b = deck_batch.DeckBatch(3)
+        self.assertEqual((3, 52), b.cards.shape)
+        self.assertEqual(52, len(b))
+        self.assertEqual(list(range(52)), list(b.cards[2]))
+
+    def testCanCreateBatchWithCustomCardSet(self):
+        cards = [card.Card(ck.ACE, suit) for suit in ck.SUITS]
+        b = deck_batch.DeckBatch(2, cards)
+        self.assertEqual(4, len(b))
+        self.assertEqual(cards, deck_batch.cards_for_ids(b.deal_several(4)[0], ck.FACE_UP))
+
+    def testShufflePermutesEachDeckIndependently(self):
+        b = deck_batch.DeckBatch(50, rng=1234)
+        b.shuffle()
+        for row in b.cards:
+            self.assertEqual(list(range(52)), sorted(row))
+        self.assertGreater(len(set(tuple(row) for row in b.cards)), 1)
+
+    def testShuffleIsReproducibleWithSeed(self):
+        b1 = deck_batch.DeckBatch(4, rng=99)
+        b2 = deck_batch.DeckBatch(4, rng=99)
+        b1.shuffle()
+        b2.shuffle()
+        self.assertTrue((b1.cards == b2.cards).all())
+
+    def testShuffleDoesNotTouchDealtCards(self):
+        b = deck_batch.DeckBatch(5, rng=7)
+        dealt = b.deal_several(3).copy()
+        b.shuffle()
+        self.assertTrue((b.cards[:, :3] == dealt).all())
+
+    def testDealSeveralRejectsNegativeCount(self):
+        b = deck_batch.DeckBatch(2)
+        b.deal_several(3)
+        self.assertRaises(ValueError, b.deal_several, -1)
+        self.assertEqual(49, len(b))
+
+    def testDealSeveralDealsFromEveryDeck(self):
+        b = deck_batch.DeckBatch(6)
+        dealt = b.deal_several(5)
+        self.assertEqual((6, 5), dealt.shape)
+        self.assertEqual([0, 1, 2, 3, 4], list(dealt[0]))
+        self.assertEqual(47, len(b))
+        self.assertEqual([5] * 6, list(b.deal()))
+
+    def testDealFailsIfDecksRunOut(self):
+        b = deck_batch.DeckBatch(2, [card.Card(ck.ACE, ck.SPADES)])
+        with self.assertRaises(deck.DeckError):
+            b.deal_several(2)
+        b.deal()
+        self.assertTrue(b.is_empty())
+        with self.assertRaises(deck.DeckError):
+            b.deal()
+
+    def testResetRestoresInitialCards(self):
+        b = deck_batch.DeckBatch(3, rng=5)
+        b.deal_several(10)
+        b.shuffle()
+        b.reset()
+        self.assertEqual(52, len(b))
+        for row in b.cards:
+            self.assertEqual(list(range(52)), list(row))
+
+    def testToDeckCopiesRemainingCards(self):
+        b = deck_batch.DeckBatch(2)
+        b.deal()
+        d = b.to_deck(1)
+        self.assertEqual(51, len(d))
+        self.assertEqual(card.Card(ck.ACE, ck.DIAMONDS, ck.FACE_DOWN), d.deal())
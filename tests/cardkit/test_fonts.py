@@ -0,0 +1,96 @@
+import unittest
+
+import pygame
+
+from cardkit import fonts
+
+
+BLACK = (0, 0, 0)
+
+
+class TextCacheTest(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 20)
+        self.cache = fonts.TextCache()
+
+    def testHitsAndMisses(self):
+        first = self.cache.render(self.font, 'Hello', BLACK)
+        second = self.cache.render(self.font, 'Hello', BLACK)
+        self.assertIs(first, second)
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(1, self.cache.misses)
+        self.assertEqual(0.5, self.cache.stats()['hit_rate'])
+
+    def testKeyIncludesColorAndAntialiasing(self):
+        self.cache.render(self.font, 'Hello', BLACK)
+        self.cache.render(self.font, 'Hello', (255, 0, 0))
+        self.cache.render(self.font, 'Hello', BLACK, antialias=False)
+        self.cache.render(self.font, 'Hello', [0, 0, 0])
+        self.assertEqual(3, len(self.cache))
+        self.assertEqual(1, self.cache.hits)
+
+    def testEvictsLeastRecentlyUsed(self):
+        size = fonts._surface_bytes(self.font.render('aaaa', True, BLACK))
+        self.cache.max_bytes = size * 2
+        self.cache.render(self.font, 'aaaa', BLACK)
+        self.cache.render(self.font, 'bbbb', BLACK)
+        self.cache.render(self.font, 'aaaa', BLACK)
+        self.cache.render(self.font, 'cccc', BLACK)
+        self.assertEqual(2, len(self.cache))
+        self.assertTrue(self.cache.size_bytes <= self.cache.max_bytes)
+        hits = self.cache.hits
+        self.cache.render(self.font, 'aaaa', BLACK)
+        self.assertEqual(hits + 1, self.cache.hits)
+        self.cache.render(self.font, 'bbbb', BLACK)
+        self.assertEqual(hits + 1, self.cache.hits)
+
+    def testDoesNotCacheSurfacesOverTheLimit(self):
+        self.cache.max_bytes = 10
+        self.cache.render(self.font, 'Hello', BLACK)
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual(0, self.cache.size_bytes)
+
+    def testClear(self):
+        self.cache.render(self.font, 'Hello', BLACK)
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual(0, self.cache.size_bytes)
+
+
+class GetFontTest(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        fonts.clear_fonts()
+
+    def testReturnsSameFont(self):
+        self.assertIs(fonts.get_font(None, 20), fonts.get_font(None, 20, False, False))
+        self.assertIsNot(fonts.get_font(None, 20), fonts.get_font(None, 20, bold=True))
+
+
+class RestartTest(unittest.TestCase):
+    def tearDown(self):
+        # Leave pygame as the other tests expect: fonts only, so that
+        # tests which fork worker processes don't inherit SDL threads.
+        pygame.quit()
+        pygame.font.init()
+
+    def testFontsAreForgottenWhenPygameQuits(self):
+        pygame.font.init()
+        font = fonts.get_font(None, 20)
+        fonts.render_text(font, 'Hello', BLACK)
+        pygame.quit()
+        self.assertEqual(0, len(fonts.TEXT_CACHE))
+        pygame.font.init()
+        new_font = fonts.get_font(None, 20)
+        self.assertIsNot(font, new_font)
+        # Rendering with a font from before the restart would crash.
+        self.assertTrue(fonts.render_text(new_font, 'Goodbye', BLACK).get_width() > 0)
+        pygame.quit()
+        pygame.font.init()
+        fonts.render_text(fonts.get_font(None, 20), 'Hello again', BLACK)
+        self.assertEqual(1, len(fonts.TEXT_CACHE))
+
+
+if __name__ == '__main__':
+    unittest.main()
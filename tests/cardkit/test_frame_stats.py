@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from cardkit import frame_stats
+
+
+class FakeTimer(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, milliseconds):
+        self.now += milliseconds / 1000.0
+
+
+class FrameStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.stats = frame_stats.FrameStats(capacity=4, budget=10, timer=self.timer)
+
+    def recordFrame(self, wait, events, draw, present, update=0):
+        durations = {
+            frame_stats.WAIT: wait,
+            frame_stats.EVENTS: events,
+            frame_stats.UPDATE: update,
+            frame_stats.DRAW: draw,
+            frame_stats.PRESENT: present,
+        }
+        self.stats.begin_frame()
+        for phase in frame_stats.PHASES:
+            self.timer.advance(durations[phase])
+            self.stats.end_phase(phase)
+        self.stats.end_frame()
+
+    def testRecordsPhaseTimes(self):
+        self.recordFrame(5, 1, 3, 2)
+        self.assertEqual(1, len(self.stats))
+        self.assertAlmostEqual(3, self.stats.times(frame_stats.DRAW)[0])
+        self.assertAlmostEqual(11, self.stats.times(frame_stats.FRAME)[0])
+        self.assertAlmostEqual(6, self.stats.times(frame_stats.WORK)[0])
+
+    def testKeepsOnlyMostRecentFrames(self):
+        for draw_time in range(1, 7):
+            self.recordFrame(0, 0, draw_time, 0)
+        self.assertEqual(6, self.stats.frame_count)
+        self.assertEqual(4, len(self.stats))
+        times = [round(t) for t in self.stats.times(frame_stats.DRAW)]
+        self.assertEqual([3, 4, 5, 6], times)
+
+    def testPercentiles(self):
+        for draw_time in (1, 2, 3, 10):
+            self.recordFrame(0, 0, draw_time, 0)
+        p0, p50, p100 = self.stats.percentiles(frame_stats.DRAW, (0, 50, 100))
+        self.assertAlmostEqual(1, p0)
+        self.assertAlmostEqual(3, p50)
+        self.assertAlmostEqual(10, p100)
+
+    def testPercentilesWithNoFrames(self):
+        self.assertEqual([0.0, 0.0, 0.0], self.stats.percentiles())
+
+    def testCountsFramesOverBudget(self):
+        self.recordFrame(20, 1, 2, 3)
+        self.recordFrame(0, 1, 12, 3)
+        self.assertEqual(1, self.stats.dropped_frames)
+        self.assertEqual(1, self.stats.recent_dropped_frames())
+
+    def testDumpTrace(self):
+        self.recordFrame(5, 1, 3, 2)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'trace.json')
+            self.stats.dump_trace(path)
+            with open(path) as f:
+                events = json.load(f)['traceEvents']
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(list(frame_stats.PHASES), [e['name'] for e in events])
+        by_name = dict((e['name'], e) for e in events)
+        self.assertAlmostEqual(5000, by_name[frame_stats.EVENTS]['ts'])
+        self.assertAlmostEqual(3000, by_name[frame_stats.DRAW]['dur'])
@@ -0,0 +1,169 @@
+import itertools
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import hand_eval
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def hand(*cards):
+    """Makes a list of Cards from strings like 'AS', 'TD' and '2C'."""
+    ranks = dict(zip('A23456789TJQK', ck.RANKS))
+    suits = dict(zip('CDHS', ck.SUITS))
+    return [card.Card(ranks[c[0]], suits[c[1]]) for c in cards]
+
+
+def naive_order(card_ids):
+    """Ranks a hand the slow way, by trying every five cards."""
+    best = None
+    for ids in itertools.combinations(card_ids, 5):
+        ranks = [hand_eval._POKER_RANKS[card_id] for card_id in ids]
+        flush = len(set(card_id & 3 for card_id in ids)) == 1
+        order = hand_eval._five_card_order(ranks, flush)
+        if best is None or order > best:
+            best = order
+    return best
+
+
+class HandEvalTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.old_cache_dir = os.environ.get('CARDKIT_CACHE_DIR')
+        os.environ['CARDKIT_CACHE_DIR'] = cls.cache_dir
+        hand_eval._tables = None
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.old_cache_dir is None:
+            del os.environ['CARDKIT_CACHE_DIR']
+        else:
+            os.environ['CARDKIT_CACHE_DIR'] = cls.old_cache_dir
+        shutil.rmtree(cls.cache_dir)
+
+    def assertCategory(self, category, cards):
+        self.assertEqual(category, hand_eval.category(hand_eval.evaluate(hand(*cards))))
+
+    def testBestAndWorstHands(self):
+        self.assertEqual(hand_eval.HAND_COUNT, hand_eval.evaluate(hand('AS', 'KS', 'QS', 'JS', 'TS')))
+        self.assertEqual(1, hand_eval.evaluate(hand('7S', '5H', '4S', '3S', '2S')))
+
+    def testCategories(self):
+        self.assertCategory(hand_eval.HIGH_CARD, ['AS', 'KH', '9S', '5D', '3C'])
+        self.assertCategory(hand_eval.ONE_PAIR, ['AS', 'AH', '9S', '5D', '3C'])
+        self.assertCategory(hand_eval.TWO_PAIR, ['AS', 'AH', '9S', '9D', '3C'])
+        self.assertCategory(hand_eval.THREE_OF_A_KIND, ['AS', 'AH', 'AD', '9D', '3C'])
+        self.assertCategory(hand_eval.STRAIGHT, ['AS', '2H', '3D', '4D', '5C'])
+        self.assertCategory(hand_eval.FLUSH, ['AS', '2S', '3S', '4S', '6S'])
+        self.assertCategory(hand_eval.FULL_HOUSE, ['AS', 'AH', 'AD', '9D', '9C'])
+        self.assertCategory(hand_eval.FOUR_OF_A_KIND, ['AS', 'AH', 'AD', 'AC', '9C'])
+        self.assertCategory(hand_eval.STRAIGHT_FLUSH, ['5S', '2S', '3S', '4S', 'AS'])
+
+    def testCategoryCounts(self):
+        starts = [1, 1278, 4138, 4996, 5854, 5864, 7141, 7297, 7453]
+        for category, start in zip(hand_eval.CATEGORIES, starts):
+            self.assertEqual(category, hand_eval.category(start))
+            if start > 1:
+                self.assertNotEqual(category, hand_eval.category(start - 1))
+
+    def testWheelIsLowestStraight(self):
+        wheel = hand_eval.evaluate(hand('AS', '2H', '3D', '4D', '5C'))
+        six_high = hand_eval.evaluate(hand('6S', '2H', '3D', '4D', '5C'))
+        self.assertTrue(wheel < six_high)
+
+    def testKickers(self):
+        self.assertTrue(hand_eval.evaluate(hand('AS', 'AH', 'KS', '5D', '3C'))
+                        > hand_eval.evaluate(hand('AS', 'AH', 'QS', 'JD', '9C')))
+
+    def testSuitsAndFacesDoNotMatter(self):
+        first = hand('AS', 'AH', '9S', '5D', '3C')
+        second = [c.with_face(ck.FACE_DOWN) for c in hand('AC', 'AD', '9H', '5S', '3D')]
+        self.assertEqual(hand_eval.evaluate(first), hand_eval.evaluate(second))
+
+    def testSevenCardsUseBestFive(self):
+        # A flush and two pair: the flush wins.
+        self.assertCategory(hand_eval.FLUSH, ['AS', 'KS', '9S', '5S', '3S', 'AH', '3H'])
+        # A flush and a full house: the full house wins.
+        self.assertCategory(hand_eval.FULL_HOUSE, ['AS', 'KS', 'AH', '5S', '3S', 'AD', '3C'])
+        # A straight flush and three of a kind.
+        self.assertCategory(hand_eval.STRAIGHT_FLUSH, ['9H', '8H', '7H', '6H', '5H', '9D', '9C'])
+
+    def testAgreesWithBruteForce(self):
+        rng = random.Random(1)
+        results = []
+        for size in (5, 6, 7):
+            for i in range(500):
+                ids = rng.sample(range(52), size)
+                results.append((naive_order(ids), hand_eval.evaluate_ids(ids)))
+        results.sort()
+        for (order, strength), (next_order, next_strength) in zip(results, results[1:]):
+            self.assertTrue(strength <= next_strength)
+            self.assertEqual(order == next_order, strength == next_strength)
+
+    def testRejectsBadHands(self):
+        self.assertRaises(ValueError, hand_eval.evaluate, hand('AS', 'KS', 'QS', 'JS'))
+        self.assertRaises(ValueError, hand_eval.evaluate,
+                          hand('AS', 'KS', 'QS', 'JS', 'TS', '9S', '8S', '7S'))
+        self.assertRaises(ValueError, hand_eval.evaluate,
+                          hand('AS', 'KS', 'QS', 'JS') + [card.Card(ck.JOKER, None)])
+        self.assertRaises(ValueError, hand_eval.evaluate_ids, [-1, 0, 1, 2, 3])
+        # The same card twice would look like a pair, five times like
+        # a rank key that doesn't exist at all.
+        self.assertRaises(ValueError, hand_eval.evaluate_ids, [0, 0, 4, 8, 12])
+        self.assertRaises(ValueError, hand_eval.evaluate_ids, [7] * 5)
+        self.assertRaises(ValueError, hand_eval.category, 0)
+
+    def testTablesAreCached(self):
+        hand_eval.evaluate_ids([0, 1, 2, 3, 4])
+        path = os.path.join(self.cache_dir, hand_eval._CACHE_FILENAME)
+        self.assertTrue(os.path.exists(path))
+        hand_eval._tables = None
+        self.assertIsNotNone(hand_eval._load_cached_tables())
+        self.assertEqual(hand_eval.HAND_COUNT, hand_eval.evaluate(hand('AS', 'KS', 'QS', 'JS', 'TS')))
+
+    def testCorruptCacheIsRebuilt(self):
+        hand_eval.evaluate_ids([0, 1, 2, 3, 4])
+        path = os.path.join(self.cache_dir, hand_eval._CACHE_FILENAME)
+        with open(path, 'w') as f:
+            f.write('{not json')
+        hand_eval._tables = None
+        self.assertEqual(hand_eval.HAND_COUNT, hand_eval.evaluate(hand('AS', 'KS', 'QS', 'JS', 'TS')))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def testBatchMatchesSingleEvaluation(self):
+        rng = random.Random(2)
+        for size in (5, 7):
+            hands = [rng.sample(range(52), size) for i in range(300)]
+            expected = [hand_eval.evaluate_ids(ids) for ids in hands]
+            self.assertEqual(expected, list(hand_eval.evaluate_batch(hands)))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def testEvaluatesNumPyIds(self):
+        from cardkit import deck_batch
+        batch = deck_batch.DeckBatch(3, rng=1)
+        batch.shuffle()
+        hands = batch.deal_several(7)
+        for ids in hands:
+            self.assertEqual(hand_eval.evaluate_ids([int(i) for i in ids]),
+                             hand_eval.evaluate_ids(ids))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def testBatchRejectsBadHands(self):
+        self.assertRaises(ValueError, hand_eval.evaluate_batch, [[0, 1, 2, 3]])
+        self.assertRaises(ValueError, hand_eval.evaluate_batch, [[0, 1, 2, 3, 52]])
+        self.assertRaises(ValueError, hand_eval.evaluate_batch,
+                          [[0, 4, 8, 12, 16], [0, 0, 4, 8, 12]])
+        self.assertRaises(ValueError, hand_eval.evaluate_batch, [[51] * 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Checks that the modules for dealing with cards don't need pygame.
+
+Each module is imported in a fresh interpreter, since by the time
+these tests run, other tests will probably have imported pygame.
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules that must be importable without importing pygame.
+LOGIC_MODULES = [
+    'cardkit.card',
+    'cardkit.card_constants',
+    'cardkit.card_set',
+    'cardkit.clock',
+    'cardkit.combinations',
+    'cardkit.deck',
+    'cardkit.deck_batch',
+    'cardkit.hand_eval',
+    'cardkit.parallel',
+    'cardkit.pile',
+    'cardkit.rng',
+    'cardkit.rules',
+    'cardkit.shoe',
+    'cardkit.simulation',
+    'cardkit.tracker',
+]
+
+CHECK_IMPORT = '''
+import importlib, sys
+importlib.import_module(sys.argv[1])
+loaded = sorted(name for name in sys.modules if name.split('.')[0] == 'pygame')
+if loaded:
+    sys.exit('%s imported pygame' % sys.argv[1])
+'''
+
+
+def module_available(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+class ImportTest(unittest.TestCase):
+    def testLogicModulesDoNotImportPygame(self):
+        for module in LOGIC_MODULES:
+            if module == 'cardkit.deck_batch' and not module_available('numpy'):
+                continue
+            process = subprocess.Popen(
+                [sys.executable, '-c', CHECK_IMPORT, module],
+                cwd=PROJECT_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            out, err = process.communicate()
+            self.assertEqual(0, process.returncode, '%s: %s' % (module, err.decode('utf-8', 'replace')))
+
+
+if __name__ == '__main__':
+    unittest.main()
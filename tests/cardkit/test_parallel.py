@@ -0,0 +1,39 @@
+import multiprocessing
+import unittest
+
+from cardkit import parallel
+
+
+def square(x):
+    return x * x
+
+
+class ImapBoundedTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = multiprocessing.Pool(2)
+
+    def tearDown(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    def testResultsComeBackInOrder(self):
+        self.assertEqual([x * x for x in range(50)],
+                         list(parallel.imap_bounded(self.pool, square, range(50), 4)))
+
+    def testReadsTasksLazily(self):
+        read = []
+
+        def tasks():
+            for x in range(100):
+                read.append(x)
+                yield x
+
+        results = parallel.imap_bounded(self.pool, square, tasks(), 3)
+        self.assertEqual(0, next(results))
+        self.assertEqual(3, len(read))
+        self.assertEqual(1, next(results))
+        self.assertEqual(4, len(read))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import deck
+from cardkit import pile
+
+
+def cards(*ids):
+    return [card.card_for_id(card_id) for card_id in ids]
+
+
+class PileTest(unittest.TestCase):
+    def testNewPileIsEmpty(self):
+        p = pile.Pile()
+        self.assertEqual(0, len(p))
+        self.assertTrue(p.is_empty())
+        self.assertEqual([], list(p))
+        self.assertRaises(deck.DeckError, p.peek)
+        self.assertRaises(deck.DeckError, p.deal)
+
+    def testAddKeepsOrder(self):
+        p = pile.Pile(cards(5, 1, 9))
+        p.add(cards(3)[0])
+        self.assertEqual(cards(5, 1, 9, 3), list(p))
+        self.assertEqual(cards(3)[0], p.peek())
+        self.assertEqual(4, len(p))
+
+    def testContainsComparesFaces(self):
+        queen = card.Card(ck.QUEEN, ck.HEARTS, ck.FACE_UP)
+        p = pile.Pile([queen])
+        self.assertIn(queen, p)
+        self.assertNotIn(queen.with_face(ck.FACE_DOWN), p)
+        self.assertNotIn(card.Card(ck.QUEEN, ck.SPADES), p)
+
+    def testRemoveKeepsOrderOfTheRest(self):
+        p = pile.Pile(cards(*range(10)))
+        p.remove(cards(4)[0])
+        p.remove(cards(0)[0])
+        p.remove(cards(9)[0])
+        self.assertEqual(cards(1, 2, 3, 5, 6, 7, 8), list(p))
+        self.assertEqual(cards(8)[0], p.peek())
+        self.assertNotIn(cards(4)[0], p)
+        self.assertEqual(2, p.index(cards(3)[0]))
+        self.assertRaises(deck.DeckError, p.remove, cards(4)[0])
+
+    def testDuplicates(self):
+        p = pile.Pile(cards(1, 2, 1))
+        self.assertEqual(2, p.count(cards(1)[0]))
+        self.assertEqual(0, p.index(cards(1)[0]))
+        p.remove(cards(1)[0])
+        self.assertEqual(cards(1, 2), list(p))
+        self.assertIn(cards(1)[0], p)
+
+    def testDealRemovesTopCard(self):
+        p = pile.Pile(cards(7, 8))
+        dealt = p.deal(face=ck.FACE_DOWN)
+        self.assertEqual(cards(8)[0].with_face(ck.FACE_DOWN), dealt)
+        self.assertEqual(cards(7), list(p))
+
+    def testMatchesListUnderRandomChanges(self):
+        rng = random.Random(1)
+        p = pile.Pile()
+        expected = []
+        for i in range(3000):
+            if expected and rng.random() < 0.5:
+                c = rng.choice(expected)
+                p.remove(c)
+                # Pile.remove() takes out the topmost copy.
+                del expected[len(expected) - 1 - expected[::-1].index(c)]
+            else:
+                c = card.card_for_id(rng.randrange(54))
+                p.add(c)
+                expected.append(c)
+            self.assertEqual(len(expected), len(p))
+            if i % 100 == 0:
+                self.assertEqual(expected, list(p))
+                for c in set(expected):
+                    self.assertEqual(expected.index(c), p.index(c))
+        self.assertEqual(expected, list(p))
+
+    def testClear(self):
+        p = pile.Pile(cards(1, 2, 3))
+        p.clear()
+        self.assertTrue(p.is_empty())
+        self.assertNotIn(cards(1)[0], p)
+
+    def testHandIsFanned(self):
+        self.assertEqual(pile.HAND_FAN_OFFSET, pile.Hand().fan_offset)
+        self.assertEqual((0, 0), pile.Pile().fan_offset)
+
+
+if __name__ == '__main__':
+    unittest.main()
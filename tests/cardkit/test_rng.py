@@ -0,0 +1,49 @@
+import random
+import unittest
+
+from cardkit import deck
+from cardkit import rng
+
+
+class RngTest(unittest.TestCase):
+    def testSameSeedGivesSameStream(self):
+        self.assertEqual(rng.make_rng(5).random(), rng.make_rng(5).random())
+
+    def testSpawnedSeedsAreReproducible(self):
+        self.assertEqual(rng.spawn_seeds('table', 4), rng.spawn_seeds('table', 4))
+
+    def testSpawnedSeedsAreDistinct(self):
+        seeds = rng.spawn_seeds(1, 100)
+        self.assertEqual(100, len(set(seeds)))
+        self.assertNotEqual(rng.spawn_seeds(1, 3), rng.spawn_seeds(2, 3))
+
+    def testSeedTypeMatters(self):
+        self.assertNotEqual(rng.child_seed(1, 0), rng.child_seed('1', 0))
+        self.assertRaises(TypeError, rng.child_seed, 1.0, 0)
+        self.assertRaises(TypeError, rng.child_seed, None, 0)
+
+    def testChildSeedsMatchSpawnedSeeds(self):
+        self.assertEqual(rng.spawn_seeds(7, 3)[2], rng.child_seed(7, 2))
+
+    def testSpawnedStreamsDiffer(self):
+        a, b = rng.spawn(42, 2)
+        self.assertNotEqual(
+            [a.random() for i in range(5)], [b.random() for i in range(5)])
+
+    def testDecksWithSameSeedShuffleTheSame(self):
+        d1 = deck.Deck(rng=rng.make_rng(3))
+        d2 = deck.DequeDeck(rng=rng.make_rng(3))
+        d1.shuffle()
+        d2.shuffle()
+        self.assertEqual(d1.deal_several(52), d2.deal_several(52))
+
+    def testDeckRngIsIndependentOfGlobalRandom(self):
+        d1 = deck.Deck(rng=rng.make_rng(3))
+        d1.shuffle()
+        d1.riffle()
+        d2 = deck.Deck(rng=rng.make_rng(3))
+        random.seed(1)
+        d2.shuffle()
+        random.seed(2)
+        d2.riffle()
+        self.assertEqual(d1.deal_several(52), d2.deal_several(52))
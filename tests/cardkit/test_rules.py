@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from cardkit import card_constants as ck
+from cardkit import rules
+
+
+class DrawAndDiscardTest(unittest.TestCase):
+    def setUp(self):
+        self.game = rules.DrawAndDiscard(rng=random.Random(7))
+
+    def testNewGame(self):
+        self.assertEqual(52, len(self.game.deck.cards))
+        self.assertTrue(self.game.discard_pile.is_empty())
+        self.assertFalse(self.game.is_finished())
+        self.assertEqual([rules.DRAW, rules.RESET], self.game.legal_actions())
+
+    def testDraw(self):
+        top = self.game.deck.peek()
+        drawn = self.game.apply(rules.DRAW)
+        self.assertEqual(top.with_face(ck.FACE_UP), drawn)
+        self.assertEqual(ck.FACE_UP, drawn.face)
+        self.assertEqual(drawn, self.game.discard_pile.peek())
+        self.assertEqual(51, len(self.game.deck.cards))
+
+    def testPlayToTheEnd(self):
+        while not self.game.is_finished():
+            self.game.apply(rules.DRAW)
+        self.assertEqual(52, len(self.game.discard_pile.cards))
+        self.assertEqual([rules.RESET], self.game.legal_actions())
+        self.assertFalse(self.game.is_legal(rules.DRAW))
+        self.assertRaises(rules.RulesError, self.game.apply, rules.DRAW)
+
+    def testReset(self):
+        for i in range(10):
+            self.game.apply(rules.DRAW)
+        self.assertIsNone(self.game.apply(rules.RESET))
+        self.assertEqual(52, len(self.game.deck.cards))
+        self.assertTrue(self.game.discard_pile.is_empty())
+
+    def testUnknownAction(self):
+        self.assertFalse(self.game.is_legal('fold'))
+        self.assertRaises(rules.RulesError, self.game.apply, 'fold')
+
+    def testSameSeedSameGame(self):
+        other = rules.DrawAndDiscard(rng=random.Random(7))
+        for i in range(52):
+            self.assertEqual(self.game.apply(rules.DRAW), other.apply(rules.DRAW))
+
+    def testSnapshotAndRestore(self):
+        self.game.apply(rules.DRAW)
+        token = self.game.snapshot()
+        drawn = [self.game.apply(rules.DRAW) for i in range(5)]
+        self.game.restore(token)
+        self.assertEqual(51, len(self.game.deck.cards))
+        self.assertEqual(1, len(self.game.discard_pile.cards))
+        self.assertEqual(drawn, [self.game.apply(rules.DRAW) for i in range(5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
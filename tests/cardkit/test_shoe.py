@@ -0,0 +1,111 @@
+import random
+import unittest
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import deck
+from cardkit import shoe
+
+
+class ShoeTest(unittest.TestCase):
+    def testShoeHoldsAllDecks(self):
+        s = shoe.Shoe(deck_count=6)
+        self.assertEqual(312, len(s))
+        self.assertFalse(s.is_empty())
+
+    def testShoeDealsEachCardDeckCountTimes(self):
+        s = shoe.Shoe(deck_count=2, rng=random.Random(1))
+        dealt_cards = s.deal_several(104)
+        self.assertTrue(s.is_empty())
+        for rank, suit in ck.DECK_OF_52:
+            self.assertEqual(2, dealt_cards.count(card.Card(rank, suit, ck.FACE_DOWN)))
+
+    def testDealUpdatesCounts(self):
+        s = shoe.Shoe(deck_count=1, rng=random.Random(2))
+        c = s.deal()
+        self.assertEqual(0, s.counts[c.card_id])
+        self.assertEqual(51, len(s))
+        self.assertEqual(1, s.dealt_count())
+
+    def testDealIsRoughlyUniform(self):
+        s = shoe.Shoe(deck_count=8, rng=random.Random(3))
+        suit_counts = dict((suit, 0) for suit in ck.SUITS)
+        for i in range(4000):
+            if s.is_empty():
+                s.shuffle()
+            suit_counts[s.deal().suit] += 1
+        for count in suit_counts.values():
+            self.assertTrue(850 < count < 1150, suit_counts)
+
+    def testDealWithFaceSetsFace(self):
+        s = shoe.Shoe(deck_count=1)
+        self.assertEqual(ck.FACE_DOWN, s.deal().face)
+        self.assertEqual(ck.FACE_UP, s.deal(face=ck.FACE_UP).face)
+        self.assertEqual(ck.FACE_UP, shoe.Shoe(face=ck.FACE_UP).deal().face)
+
+    def testPeekMatchesNextDeal(self):
+        s = shoe.Shoe(deck_count=1, rng=random.Random(4))
+        c = s.peek()
+        self.assertEqual(c, s.peek())
+        self.assertEqual(52, len(s))
+        self.assertEqual(c, s.deal())
+
+    def testDealFailsIfShoeIsEmpty(self):
+        s = shoe.Shoe(deck_count=1)
+        s.deal_several(52)
+        with self.assertRaises(deck.DeckError):
+            s.deal()
+        with self.assertRaises(deck.DeckError):
+            s.peek()
+
+    def testDealSeveralFailsWithoutDealingIfShoeIsTooSmall(self):
+        s = shoe.Shoe(deck_count=1)
+        with self.assertRaises(deck.DeckError):
+            s.deal_several(53)
+        self.assertEqual(52, len(s))
+
+    def testDealHands(self):
+        s = shoe.Shoe(deck_count=6)
+        hands = s.deal_hands(7, 2)
+        self.assertEqual(7, len(hands))
+        self.assertTrue(all(len(hand) == 2 for hand in hands))
+        self.assertEqual(298, len(s))
+
+    def testCutCardTriggersShuffle(self):
+        s = shoe.Shoe(deck_count=2, penetration=0.5)
+        s.deal_several(51)
+        self.assertFalse(s.needs_shuffle())
+        s.deal()
+        self.assertTrue(s.needs_shuffle())
+        s.shuffle()
+        self.assertFalse(s.needs_shuffle())
+        self.assertEqual(104, len(s))
+
+    def testShoeIsReproducibleWithSeed(self):
+        s1 = shoe.Shoe(rng=random.Random(5))
+        s2 = shoe.Shoe(rng=random.Random(5))
+        self.assertEqual(s1.deal_several(20), s2.deal_several(20))
+
+    def testInvalidArgumentsThrowException(self):
+        with self.assertRaises(ValueError):
+            shoe.Shoe(deck_count=0)
+        with self.assertRaises(ValueError):
+            shoe.Shoe(penetration=1.5)
+        with self.assertRaises(ValueError):
+            shoe.Shoe(face='sideways')
+
+    def testListenerHearsAboutDealsAndResets(self):
+        s = shoe.Shoe(deck_count=1, rng=random.Random(6))
+        events = []
+
+        class Listener(deck.DeckListener):
+            def cards_removed(self, source, cards):
+                events.append(('removed', list(cards)))
+
+            def cards_reset(self, source):
+                events.append(('reset',))
+
+        s.add_listener(Listener())
+        dealt = s.deal_several(2)
+        s.shuffle()
+        self.assertEqual([('removed', dealt[:1]), ('removed', dealt[1:]), ('reset',)], events)
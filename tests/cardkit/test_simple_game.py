@@ -0,0 +1,72 @@
+import unittest
+
+from cardkit import clock
+from cardkit import simple_game
+
+
+class CountingGame(simple_game.SimpleGame):
+    def __init__(self, clock=None):
+        simple_game.SimpleGame.__init__(self, clock)
+        self.update_times = []
+
+    def update(self, dt):
+        self.update_times.append(dt)
+
+
+class FixedTimestepTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = clock.ManualClock()
+        self.game = CountingGame(self.clock)
+        self.game.update_rate = 50
+
+    def testUsesInjectedClock(self):
+        self.clock.advance(123)
+        self.assertEqual(123, self.game.clock())
+
+    def testTimeStep(self):
+        self.assertEqual(20, self.game.time_step())
+
+    def testAdvanceRunsWholeStepsOnly(self):
+        self.assertEqual(2, self.game.advance(50))
+        self.assertEqual([20, 20], self.game.update_times)
+        self.assertEqual(40, self.game.game_time())
+        self.assertAlmostEqual(0.5, self.game.interpolation)
+
+    def testLeftoverTimeCarriesOver(self):
+        self.game.advance(30)
+        self.assertEqual(1, self.game.advance(10))
+        self.assertEqual(2, len(self.game.update_times))
+        self.assertAlmostEqual(0, self.game.interpolation)
+
+    def testSameUpdatesWhateverTheFrameRate(self):
+        other = CountingGame()
+        other.update_rate = 50
+        for i in range(100):
+            self.game.advance(10)
+        for i in range(25):
+            other.advance(40)
+        self.assertEqual(self.game.update_times, other.update_times)
+        self.assertEqual(self.game.game_time(), other.game_time())
+
+    def testAdvanceCatchesUpOnlySoFar(self):
+        self.game.max_frame_time = 100
+        self.assertEqual(5, self.game.advance(10000))
+
+    def testIdleModeSkipsAheadWithoutFloodingUpdates(self):
+        self.game.enable_idle_mode()
+        self.game.max_frame_time = 100
+        # Ten minutes idle: game time keeps up, but only 100ms worth of
+        # updates are run.
+        self.assertEqual(5, self.game.advance(600000))
+        self.assertEqual(600000, self.game.game_time())
+        self.assertEqual(5, len(self.game.update_times))
+        self.assertEqual(1, self.game.advance(25))
+        self.assertEqual(600020, self.game.game_time())
+
+    def testSimulate(self):
+        self.assertEqual(3000, self.game.simulate(60000))
+        self.assertEqual(60000, self.game.game_time())
+
+
+if __name__ == '__main__':
+    unittest.main()
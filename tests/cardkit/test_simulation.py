@@ -0,0 +1,128 @@
+import multiprocessing
+import unittest
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import deck
+from cardkit import simulation
+
+
+def next_card_suit(d, known_cards):
+    return d.deal().suit
+
+
+def first_card_is_known(d, known_cards):
+    top = d.deal()
+    return any((top.rank, top.suit) == (c.rank, c.suit) for c in known_cards)
+
+
+def pair_in_two(d, known_cards):
+    first, second = d.deal_several(2)
+    return 'pair' if first.rank == second.rank else 'no pair'
+
+
+class SimulationTest(unittest.TestCase):
+    def testEstimatesProbabilities(self):
+        result = simulation.estimate(
+            next_card_suit, max_trials=20000, precision=None, processes=1, seed=1)
+        self.assertEqual(20000, result.trials)
+        self.assertEqual(set(ck.SUITS), set(result.counts))
+        for suit in ck.SUITS:
+            p = result.probability(suit)
+            # The standard error is about 0.003, so this can't fail
+            # by chance whatever the random numbers.
+            self.assertTrue(abs(p - 0.25) < 0.02, (suit, p))
+            low, high = result.confidence_interval(suit)
+            self.assertTrue(low <= p <= high, (suit, low, p, high))
+
+    def testSameSeedSameResult(self):
+        first = simulation.estimate(pair_in_two, max_trials=5000, processes=1, seed=3)
+        second = simulation.estimate(pair_in_two, max_trials=5000, processes=1, seed=3)
+        self.assertEqual(first.counts, second.counts)
+
+    def testSameResultWithMoreProcesses(self):
+        inline = simulation.estimate(pair_in_two, max_trials=4000, batch_size=500,
+                                     precision=None, processes=1, seed=5)
+        pooled = simulation.estimate(pair_in_two, max_trials=4000, batch_size=500,
+                                     precision=None, processes=2, seed=5)
+        self.assertEqual(inline.counts, pooled.counts)
+
+    def testSameResultWithCallersPool(self):
+        inline = simulation.estimate(pair_in_two, max_trials=3000, batch_size=500,
+                                     precision=None, processes=1, seed=6)
+        pool = multiprocessing.Pool(2)
+        try:
+            for i in range(2):
+                pooled = simulation.estimate(pair_in_two, max_trials=3000, batch_size=500,
+                                             precision=None, processes=2, seed=6, pool=pool)
+                self.assertEqual(inline.counts, pooled.counts)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def testKnownCardsAreRemoved(self):
+        known = [card.Card(ck.ACE, ck.SPADES), card.Card(ck.KING, ck.HEARTS)]
+        result = simulation.estimate(first_card_is_known, known_cards=known,
+                                     max_trials=2000, precision=None, processes=1, seed=1)
+        self.assertEqual({False: 2000}, result.counts)
+
+    def testKnownCardRemovesOnlyOneCopy(self):
+        ace = card.Card(ck.ACE, ck.SPADES)
+        joker = card.Card(ck.JOKER, None)
+        d = deck.Deck([ace, ace, ace, joker, joker])
+        result = simulation.estimate(first_card_is_known, deck=d, known_cards=[ace, joker],
+                                     max_trials=2000, precision=None, processes=1, seed=2)
+        # Two aces and one joker are left.
+        self.assertEqual(set([True]), set(result.counts))
+        self.assertEqual(3, len(simulation._unknown_cards(d, [ace, joker])))
+
+    def testUsesRemainingCardsOfDeck(self):
+        d = deck.Deck([card.Card(rank, ck.HEARTS) for rank in ck.RANKS[:13]])
+        d.deal_several(3)
+        result = simulation.estimate(next_card_suit, deck=d, max_trials=1000,
+                                     precision=None, processes=1, seed=1)
+        self.assertEqual({ck.HEARTS: 1000}, result.counts)
+        self.assertEqual(10, len(d.cards))
+
+    def testStopsEarlyOncePreciseEnough(self):
+        result = simulation.estimate(pair_in_two, precision=0.02, max_trials=100000,
+                                     processes=1, seed=1)
+        self.assertTrue(result.trials < 100000)
+        self.assertTrue(result.max_margin() <= 0.02)
+        self.assertTrue(result.finished)
+
+    def testProgressCanStopSimulation(self):
+        seen = []
+        def progress(result):
+            seen.append(result.trials)
+            return result.trials >= 3000
+        result = simulation.estimate(pair_in_two, precision=None, max_trials=100000,
+                                     batch_size=1000, processes=1, seed=1, progress=progress)
+        self.assertEqual([1000, 2000, 3000], seen)
+        self.assertEqual(3000, result.trials)
+
+    def testLastBatchMayBeShort(self):
+        result = simulation.estimate(pair_in_two, precision=None, max_trials=2500,
+                                     batch_size=1000, processes=1, seed=1)
+        self.assertEqual(2500, result.trials)
+
+
+class SimulationResultTest(unittest.TestCase):
+    def testProbabilityAndInterval(self):
+        result = simulation.SimulationResult(0.95)
+        result.add_counts({'win': 30, 'loss': 70})
+        self.assertEqual(100, result.trials)
+        self.assertAlmostEqual(0.3, result.probability('win'))
+        self.assertEqual(0.0, result.probability('tie'))
+        low, high = result.confidence_interval('win')
+        self.assertAlmostEqual(0.219, low, places=3)
+        self.assertAlmostEqual(0.396, high, places=3)
+        self.assertEqual(['loss', 'win'], result.outcomes())
+
+    def testZScore(self):
+        self.assertAlmostEqual(1.96, simulation._z_score(0.95), places=2)
+        self.assertRaises(ValueError, simulation._z_score, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
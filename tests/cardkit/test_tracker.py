@@ -0,0 +1,111 @@
+import random
+import unittest
+
+from cardkit import card
+from cardkit import card_constants as ck
+from cardkit import deck
+from cardkit import shoe
+from cardkit import tracker
+
+
+def count_by_scanning(cards, rank=None, suit=None):
+    return sum(1 for c in cards
+               if (rank is None or c.rank == rank) and (suit is None or c.suit == suit))
+
+
+class CardTrackerTest(unittest.TestCase):
+    def assertMatchesDeck(self, t, d):
+        self.assertEqual(len(d), t.count())
+        for rank in ck.RANKS:
+            self.assertEqual(count_by_scanning(d.cards, rank=rank), t.count(rank=rank))
+        for suit in ck.SUITS:
+            self.assertEqual(count_by_scanning(d.cards, suit=suit), t.count(suit=suit))
+        for rank, suit in ck.DECK_OF_52:
+            self.assertEqual(count_by_scanning(d.cards, rank, suit), t.count(rank, suit))
+
+    def testFullDeck(self):
+        t = tracker.CardTracker(deck.Deck())
+        self.assertEqual(52, t.remaining)
+        self.assertEqual(13, t.count(suit=ck.HEARTS))
+        self.assertEqual(4, t.count(rank=ck.ACE))
+        self.assertEqual(1, t.count(ck.ACE, ck.SPADES))
+        self.assertEqual(0, t.count(rank=ck.JOKER))
+        self.assertEqual(0.25, t.probability(suit=ck.HEARTS))
+        self.assertEqual(0, t.running_count)
+        self.assertEqual(1.0, t.decks_remaining())
+
+    def testFollowsDealsAndAdds(self):
+        d = deck.Deck(rng=random.Random(1))
+        d.shuffle(lazy=True)
+        t = tracker.CardTracker(d)
+        dealt = d.deal_several(10) + [d.deal(), d.deal_from_bottom()]
+        self.assertMatchesDeck(t, d)
+        d.add(dealt[0])
+        d.add(dealt[1], to_bottom=True)
+        self.assertMatchesDeck(t, d)
+        d.reset()
+        self.assertMatchesDeck(t, d)
+        self.assertEqual(0, t.running_count)
+
+    def testRunningCount(self):
+        d = deck.Deck(initial_cards=[card.Card(rank, ck.HEARTS) for rank in ck.RANKS])
+        t = tracker.CardTracker(d)
+        dealt = d.deal_several(5)
+        expected = sum(tracker.HI_LO[c.rank] for c in dealt)
+        self.assertEqual(expected, t.running_count)
+        self.assertAlmostEqual(expected / (8 / 52.0), t.true_count())
+        d.add(dealt[-1])
+        self.assertEqual(expected - tracker.HI_LO[dealt[-1].rank], t.running_count)
+
+    def testRestoreRollsCountsBack(self):
+        d = deck.Deck(rng=random.Random(2))
+        d.shuffle()
+        t = tracker.CardTracker(d)
+        d.deal_several(3)
+        token = d.snapshot()
+        running_count = t.running_count
+        d.deal_several(20)
+        d.restore(token)
+        self.assertMatchesDeck(t, d)
+        self.assertEqual(running_count, t.running_count)
+
+    def testJokers(self):
+        d = deck.Deck(initial_cards=[card.Card(ck.JOKER, None), card.Card(ck.ACE, ck.CLUBS)])
+        t = tracker.CardTracker(d)
+        self.assertEqual(1, t.count(rank=ck.JOKER))
+        self.assertEqual(0.5, t.probability(rank=ck.JOKER))
+        d.deal()
+        self.assertEqual(0, t.count(rank=ck.JOKER))
+        self.assertEqual(1.0, t.probability(ck.ACE, ck.CLUBS))
+
+    def testEmptySource(self):
+        d = deck.Deck(initial_cards=[])
+        t = tracker.CardTracker(d)
+        self.assertEqual(0.0, t.probability(suit=ck.CLUBS))
+        self.assertEqual(0.0, t.true_count())
+
+    def testShoe(self):
+        s = shoe.Shoe(deck_count=6, rng=random.Random(3))
+        t = tracker.CardTracker(s)
+        self.assertEqual(312, t.remaining)
+        dealt = s.deal_several(100)
+        self.assertEqual(212, t.remaining)
+        for rank in ck.RANKS:
+            self.assertEqual(24 - count_by_scanning(dealt, rank=rank), t.count(rank=rank))
+        running_count = sum(tracker.HI_LO[c.rank] for c in dealt)
+        self.assertEqual(running_count, t.running_count)
+        self.assertAlmostEqual(running_count / (212 / 52.0), t.true_count())
+        s.shuffle()
+        self.assertEqual(312, t.remaining)
+        self.assertEqual(0, t.running_count)
+
+    def testDetach(self):
+        d = deck.Deck()
+        t = tracker.CardTracker(d)
+        t.detach()
+        d.deal()
+        self.assertEqual(52, t.remaining)
+
+
+if __name__ == '__main__':
+    unittest.main()